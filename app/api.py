@@ -1,10 +1,21 @@
 import logging
+import time
 from typing import Optional, Union
+
 import requests
-from app import models
+
+from app import metrics, models
+from app.breaker import BreakerState, breakers
+from app.sessions import device_key, session_pool
 
 logger = logging.getLogger("root")
 
+# Devices running an RTS Server without the batched status endpoint
+_batch_status_unsupported: set[str] = set()
+
+# Responses of RTS Servers that do not implement the batched status endpoint
+BATCH_STATUS_UNSUPPORTED = (400, 404, 405, 501)
+
 
 def request(
     device: models.DeviceCreate,
@@ -12,27 +23,108 @@ def request(
     path: str,
     json: Optional[dict] = None,
     timeout: float = 1.0,
+    stream: bool = False,
+    accepted_status: tuple[int, ...] = (200,),
+    headers: Optional[dict] = None,
 ) -> Union[requests.Response, None]:
+    breaker = breakers.get(device)
+    labels = {
+        "device": device_key(device),
+        "method": method,
+        "path": metrics.path_template(path),
+    }
+
+    if not breaker.allow_request():
+        metrics.api_requests_skipped.inc(**labels)
+        logger.debug(
+            "Skipping request to unreachable device with ip: %s and port: %s",
+            device.ip,
+            device.port,
+        )
+        return None
+
+    session = session_pool.acquire(device)
+    # Streamed responses keep the session in use until they are closed
+    keep_in_use = False
+
     try:
-        response = requests.request(
+        response = session.request(
             method,
             f"http://{device.ip}:{device.port}{path}",
             json=json,
             timeout=timeout,
+            stream=stream,
+            headers=headers,
         )
 
-        if response.status_code != 200:
-            logger.error(response.text)
+        breaker.record_success()
+        metrics.api_request_duration.observe(response.elapsed.total_seconds(), **labels)
+        metrics.api_responses.inc(status=response.status_code, **labels)
+
+        if response.status_code not in accepted_status:
+            if stream:
+                # Do not read a possibly large body just to log it
+                logger.error("Unexpected status %i for %s", response.status_code, path)
+                response.close()
+            else:
+                logger.error(response.text)
             return None
 
+        if stream:
+            _release_on_close(device, response)
+            keep_in_use = True
+
         return response
-    except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
+    except (
+        requests.exceptions.ConnectionError,
+        requests.exceptions.ReadTimeout,
+    ) as error:
+        if isinstance(error, requests.exceptions.Timeout):
+            metrics.api_timeouts.inc(**labels)
+        else:
+            metrics.api_connection_errors.inc(**labels)
+
+        breaker.record_failure()
         logger.error(
             "Failed to connect to device with ip: %s and port: %s",
             device.ip,
             device.port,
         )
         return None
+    finally:
+        if not keep_in_use:
+            session_pool.release(device)
+
+
+def _release_on_close(device: models.DeviceCreate, response: requests.Response) -> None:
+    close = response.close
+    released = False
+
+    def release_on_close() -> None:
+        nonlocal released
+
+        try:
+            close()
+        finally:
+            if not released:
+                released = True
+                session_pool.release(device)
+
+    response.close = release_on_close
+
+
+def close_session(device: models.DeviceCreate) -> None:
+    session_pool.close(device)
+    _batch_status_unsupported.discard(device_key(device))
+    breakers.remove(device)
+
+
+def get_breaker_state(device: models.DeviceCreate) -> BreakerState:
+    return breakers.get(device).state
+
+
+def get_connection_stats() -> dict[str, dict[str, int]]:
+    return session_pool.stats()
 
 
 def validate_device_connection(device: models.DeviceCreate) -> bool:
@@ -81,11 +173,11 @@ def delete_log(device: models.Device, log_id: int) -> bool:
     return True
 
 
-def get_rts(device: models.Device) -> list[models.RTS_API]:
+def get_rts(device: models.Device) -> Union[list[models.RTS_API], None]:
     response = request(device, "GET", "/rts/")
 
     if response is None:
-        return []
+        return None
 
     return [models.RTS_API(**rts) for rts in response.json()]
 
@@ -144,6 +236,87 @@ def get_connection_status(device: models.Device, rts_id: int) -> Union[dict, Non
     return response.json()
 
 
+def supports_batch_status(device: models.DeviceCreate) -> bool:
+    return device_key(device) not in _batch_status_unsupported
+
+
+def handle_batch_status(
+    device: models.DeviceCreate, status_code: int, response_json: object
+) -> dict[str, models.RTSStatus]:
+    """
+    This function converts the response of a batched status request into the
+    status of each RTS. If the device does not implement the batched status
+    endpoint, it is remembered, so that the status of each RTS is requested
+    separately from then on.
+
+    Args:
+        device (models.DeviceCreate): The device
+        status_code (int): The status code of the response
+        response_json (object): The body of the response, if its status code is 200
+
+    Returns:
+        dict[str, models.RTSStatus]: The status of each RTS in the response keyed by
+            RTS ID, empty if the request failed
+    """
+    key = device_key(device)
+
+    if status_code == 200:
+        return {
+            str(status["id"]): models.RTSStatus(
+                tracking=status.get("tracking"),
+                connection=status.get("connection"),
+                timestamp=time.time(),
+            )
+            for status in response_json
+        }
+
+    if status_code in BATCH_STATUS_UNSUPPORTED:
+        logger.info("Device %s does not support batched status requests", key)
+        _batch_status_unsupported.add(key)
+    else:
+        logger.warning(
+            "Batched status request to device %s failed with status %i",
+            key,
+            status_code,
+        )
+
+    return {}
+
+
+def get_rts_statuses(
+    device: models.Device, rts_ids: list[str]
+) -> dict[str, models.RTSStatus]:
+    statuses: dict[str, models.RTSStatus] = {}
+
+    if supports_batch_status(device):
+        response = request(
+            device, "GET", "/rts/status/", accepted_status=tuple(range(200, 600))
+        )
+
+        if response is None:
+            return {
+                str(rts_id): models.RTSStatus(timestamp=time.time())
+                for rts_id in rts_ids
+            }
+
+        statuses = handle_batch_status(
+            device,
+            response.status_code,
+            response.json() if response.status_code == 200 else None,
+        )
+
+    # RTS missing from the batched response, or all RTS if it failed
+    for rts_id in rts_ids:
+        if str(rts_id) not in statuses:
+            statuses[str(rts_id)] = models.RTSStatus(
+                tracking=get_tracking_status(device, rts_id),
+                connection=get_connection_status(device, rts_id),
+                timestamp=time.time(),
+            )
+
+    return statuses
+
+
 def ping_rts(device: models.Device, rts_id: int) -> bool:
     response = request(device, "GET", f"/rts/ping/{rts_id}")
 
@@ -180,6 +353,70 @@ def download_log(device: models.Device, log_id: int) -> Union[bytes, None]:
     return response.content
 
 
+def stream_log(
+    device: models.DeviceCreate, log_id: int, start: int = 0
+) -> Union[requests.Response, None]:
+    # The caller is responsible for closing the response
+    if not start:
+        return request(
+            device, "GET", f"/logs/download/{log_id}", timeout=10.0, stream=True
+        )
+
+    # The bytes from `start` to the end, devices without Range support return all
+    return request(
+        device,
+        "GET",
+        f"/logs/download/{log_id}",
+        timeout=10.0,
+        stream=True,
+        accepted_status=(200, 206, 416),
+        headers={"Range": f"bytes={start}-"},
+    )
+
+
+def get_log_range(
+    device: models.DeviceCreate,
+    log_id: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    last: Optional[int] = None,
+) -> Union[models.LogChunk, None]:
+    # Either the last `last` bytes or the bytes from `start` to `end` (inclusive)
+    byte_range = (
+        f"-{last}" if last is not None else f"{start or 0}-{'' if end is None else end}"
+    )
+    response = request(
+        device,
+        "GET",
+        f"/logs/download/{log_id}",
+        timeout=2.0,
+        stream=True,
+        accepted_status=(206, 416),
+        headers={"Range": f"bytes={byte_range}"},
+    )
+
+    if response is None:
+        return None
+
+    with response:
+        content_range = response.headers.get("Content-Range", "")
+        size = content_range.rpartition("/")[2]
+        total = int(size) if size.isdigit() else None
+
+        if response.status_code == 416:
+            return models.LogChunk(
+                content=b"", start=total or 0, end=total or 0, total=total
+            )
+
+        content = response.content
+        first = content_range.removeprefix("bytes ").partition("-")[0]
+        start = int(first) if first.isdigit() else 0
+
+    return models.LogChunk(
+        content=content, start=start, end=start + len(content), total=total
+    )
+
+
 def get_tracking_settings(device: models.Device, rts_id: int) -> Union[dict, None]:
     response = request(device, "GET", f"/tracking/settings/{rts_id}")
 
@@ -0,0 +1,91 @@
+// Applies the RTS status updates pushed by the server via Server-Sent Events.
+(function () {
+    const RETRY_INTERVAL = 1000;
+    const pending = new Map();
+
+    function stringifyId(id) {
+        const parts = Object.keys(id)
+            .sort()
+            .map((key) => JSON.stringify(key) + ":" + JSON.stringify(id[key]));
+        return "{" + parts.join(",") + "}";
+    }
+
+    const PENDING_TIMEOUT = 10000;
+
+    function setProps(id, props, since) {
+        const key = typeof id === "string" ? id : stringifyId(id);
+
+        if (!document.getElementById(key)) {
+            since = since || Date.now();
+
+            if (Date.now() - since > PENDING_TIMEOUT) {
+                // The component has been removed or is never rendered
+                pending.delete(key);
+                return;
+            }
+
+            // The component has not been rendered yet, try again later
+            pending.set(key, { id: id, props: props, since: since });
+            return;
+        }
+
+        pending.delete(key);
+        window.dash_clientside.set_props(id, props);
+    }
+
+    function applyRtsUpdate(update) {
+        const id = (type) => ({
+            type: type,
+            rts_id: update.rts_id,
+            device_id: update.device_id,
+        });
+
+        setProps(id("rts-serial-status-icon"), { src: update.serial });
+        setProps(id("rts-tracking-status-icon"), { src: update.tracking });
+        setProps(id("rts-position-count"), { children: update.count });
+        setProps(id("rts-position"), { children: update.position });
+        setProps(id("rts-command-status"), { children: update.command });
+    }
+
+    function applyEvent(event) {
+        const data = JSON.parse(event.data);
+
+        (data.rts || []).forEach(applyRtsUpdate);
+
+        if (data.target) {
+            // The header is rendered from the store by a callback
+            setProps("rts-position-storage", { data: data.target.data });
+        }
+    }
+
+    function retryPending() {
+        Array.from(pending.values()).forEach((entry) =>
+            setProps(entry.id, entry.props, entry.since)
+        );
+    }
+
+    function getPathnamePrefix() {
+        const config = document.getElementById("_dash-config");
+
+        if (!config) {
+            return "/";
+        }
+
+        return JSON.parse(config.textContent).requests_pathname_prefix || "/";
+    }
+
+    function connect() {
+        if (!window.dash_clientside || !window.dash_clientside.set_props) {
+            setTimeout(connect, RETRY_INTERVAL);
+            return;
+        }
+
+        const source = new EventSource(getPathnamePrefix() + "events/status");
+        source.onmessage = applyEvent;
+        setInterval(retryPending, RETRY_INTERVAL);
+    }
+
+    if (window.EventSource) {
+        connect();
+    }
+})();
@@ -0,0 +1,407 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Union
+
+import httpx
+
+from app import api, metrics, models
+from app.breaker import breakers
+from app.sessions import async_session_pool, device_key
+
+logger = logging.getLogger("root")
+
+
+async def request(
+    device: models.DeviceCreate,
+    method: str,
+    path: str,
+    json: Optional[dict] = None,
+    timeout: float = 1.0,
+    stream: bool = False,
+    accepted_status: tuple[int, ...] = (200,),
+    headers: Optional[dict] = None,
+) -> Union[httpx.Response, None]:
+    breaker = breakers.get(device)
+    labels = {
+        "device": device_key(device),
+        "method": method,
+        "path": metrics.path_template(path),
+    }
+
+    if not breaker.allow_request():
+        metrics.api_requests_skipped.inc(**labels)
+        logger.debug(
+            "Skipping request to unreachable device with ip: %s and port: %s",
+            device.ip,
+            device.port,
+        )
+        return None
+
+    client = async_session_pool.get()
+    limit = async_session_pool.limit(device)
+    await limit.acquire()
+    # Streamed responses hold the limit until they are closed
+    keep_limit = False
+
+    try:
+        start = time.perf_counter()
+        response = await client.send(
+            client.build_request(
+                method,
+                f"http://{device.ip}:{device.port}{path}",
+                json=json,
+                timeout=timeout,
+                headers=headers,
+            ),
+            stream=True,
+        )
+        duration = time.perf_counter() - start
+
+        if not stream:
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+
+        breaker.record_success()
+        metrics.api_request_duration.observe(duration, **labels)
+        metrics.api_responses.inc(status=response.status_code, **labels)
+
+        if response.status_code not in accepted_status:
+            if stream:
+                # Do not read a possibly large body just to log it
+                logger.error("Unexpected status %i for %s", response.status_code, path)
+                await response.aclose()
+            else:
+                logger.error(response.text)
+            return None
+
+        if stream:
+            _release_on_aclose(response, limit)
+            keep_limit = True
+
+        return response
+    except httpx.TransportError as error:
+        if isinstance(error, httpx.TimeoutException):
+            metrics.api_timeouts.inc(**labels)
+        else:
+            metrics.api_connection_errors.inc(**labels)
+
+        breaker.record_failure()
+        logger.error(
+            "Failed to connect to device with ip: %s and port: %s",
+            device.ip,
+            device.port,
+        )
+        return None
+    finally:
+        if not keep_limit:
+            limit.release()
+
+
+def _release_on_aclose(response: httpx.Response, limit: asyncio.Semaphore) -> None:
+    aclose = response.aclose
+    released = False
+
+    async def release_on_aclose() -> None:
+        nonlocal released
+
+        try:
+            await aclose()
+        finally:
+            if not released:
+                released = True
+                limit.release()
+
+    response.aclose = release_on_aclose
+
+
+async def close() -> None:
+    await async_session_pool.aclose()
+
+
+async def validate_device_connection(device: models.DeviceCreate) -> bool:
+    response = await request(device, "GET", "/", timeout=0.25)
+
+    if response is None:
+        return False
+
+    response_json = response.json()
+    if response_json is None or not isinstance(response_json, dict):
+        return False
+
+    return response_json.get("message", "") == "Server is running"
+
+
+async def add_rts(
+    device: models.Device, rts: models.RTS_APICreate
+) -> Union[models.RTS_API, None]:
+    response = await request(device, "POST", "/rts/", json=rts.model_dump())
+
+    if response is None:
+        logger.error("Failed to add rts %s", rts.name)
+        return None
+
+    logger.info("Added rts %s", rts.name)
+    return models.RTS_API(**response.json())
+
+
+async def delete_rts(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "DELETE", f"/rts/{rts_id}")
+
+    if response is None:
+        return False
+
+    logger.info("Deleted rts with id: %s", rts_id)
+    return True
+
+
+async def delete_log(device: models.Device, log_id: int) -> bool:
+    response = await request(device, "DELETE", f"/logs/{log_id}")
+
+    if response is None:
+        return False
+
+    logger.info("Deleted log with id: %s", log_id)
+    return True
+
+
+async def get_rts(device: models.Device) -> Union[list[models.RTS_API], None]:
+    response = await request(device, "GET", "/rts/")
+
+    if response is None:
+        return None
+
+    return [models.RTS_API(**rts) for rts in response.json()]
+
+
+async def validate_rts_connection(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "GET", f"/rts/test/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def start_tracking(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "POST", f"/tracking/start/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def start_dummy_tracking(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "POST", f"/tracking/start/dummy/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def stop_tracking(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "POST", f"/tracking/stop/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def get_tracking_status(device: models.Device, rts_id: int) -> Union[dict, None]:
+    response = await request(device, "GET", f"/tracking/status/{rts_id}")
+
+    if response is None:
+        return None
+
+    return response.json()
+
+
+async def get_connection_status(
+    device: models.Device, rts_id: int
+) -> Union[dict, None]:
+    response = await request(device, "GET", f"/rts/status/{rts_id}")
+
+    if response is None:
+        return None
+
+    return response.json()
+
+
+async def get_rts_status(device: models.Device, rts_id: str) -> models.RTSStatus:
+    tracking, connection = await asyncio.gather(
+        get_tracking_status(device, rts_id), get_connection_status(device, rts_id)
+    )
+    return models.RTSStatus(
+        tracking=tracking, connection=connection, timestamp=time.time()
+    )
+
+
+async def get_rts_statuses(
+    device: models.Device, rts_ids: list[str]
+) -> dict[str, models.RTSStatus]:
+    statuses: dict[str, models.RTSStatus] = {}
+
+    # Shared with the blocking API, so that each device is only probed once
+    if api.supports_batch_status(device):
+        response = await request(
+            device, "GET", "/rts/status/", accepted_status=tuple(range(200, 600))
+        )
+
+        if response is None:
+            return {
+                str(rts_id): models.RTSStatus(timestamp=time.time())
+                for rts_id in rts_ids
+            }
+
+        statuses = api.handle_batch_status(
+            device,
+            response.status_code,
+            response.json() if response.status_code == 200 else None,
+        )
+
+    # RTS missing from the batched response, or all RTS if it failed
+    missing = [str(rts_id) for rts_id in rts_ids if str(rts_id) not in statuses]
+    results = await asyncio.gather(
+        *(get_rts_status(device, rts_id) for rts_id in missing)
+    )
+    statuses.update(zip(missing, results))
+
+    return statuses
+
+
+async def ping_rts(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "GET", f"/rts/ping/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def change_face(device: models.Device, rts_id: int) -> bool:
+    response = await request(device, "POST", f"/tracking/change_face/{rts_id}")
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def get_logs(device: models.Device, rts_id: int) -> list[models.Log]:
+    response = await request(device, "GET", f"/logs/rts/{rts_id}")
+
+    if response is None:
+        return []
+
+    return [models.Log(**log) for log in response.json()]
+
+
+async def download_log(device: models.Device, log_id: int) -> Union[bytes, None]:
+    response = await request(device, "GET", f"/logs/download/{log_id}")
+
+    if response is None:
+        return None
+
+    return response.content
+
+
+async def stream_log(
+    device: models.DeviceCreate, log_id: int
+) -> Union[httpx.Response, None]:
+    # The caller is responsible for closing the response with aclose
+    return await request(
+        device, "GET", f"/logs/download/{log_id}", timeout=10.0, stream=True
+    )
+
+
+async def get_log_range(
+    device: models.DeviceCreate,
+    log_id: int,
+    start: Optional[int] = None,
+    end: Optional[int] = None,
+    last: Optional[int] = None,
+) -> Union[models.LogChunk, None]:
+    # Either the last `last` bytes or the bytes from `start` to `end` (inclusive)
+    byte_range = (
+        f"-{last}" if last is not None else f"{start or 0}-{'' if end is None else end}"
+    )
+    response = await request(
+        device,
+        "GET",
+        f"/logs/download/{log_id}",
+        timeout=2.0,
+        stream=True,
+        accepted_status=(206, 416),
+        headers={"Range": f"bytes={byte_range}"},
+    )
+
+    if response is None:
+        return None
+
+    try:
+        content_range = response.headers.get("Content-Range", "")
+        size = content_range.rpartition("/")[2]
+        total = int(size) if size.isdigit() else None
+
+        if response.status_code == 416:
+            return models.LogChunk(
+                content=b"", start=total or 0, end=total or 0, total=total
+            )
+
+        content = await response.aread()
+        first = content_range.removeprefix("bytes ").partition("-")[0]
+        start = int(first) if first.isdigit() else 0
+    finally:
+        await response.aclose()
+
+    return models.LogChunk(
+        content=content, start=start, end=start + len(content), total=total
+    )
+
+
+async def get_tracking_settings(
+    device: models.Device, rts_id: int
+) -> Union[dict, None]:
+    response = await request(device, "GET", f"/tracking/settings/{rts_id}")
+
+    if response is None:
+        return None
+
+    return response.json()
+
+
+async def update_tracking_settings(
+    device: models.Device, rts_id: int, tracking_settings: models.TrackingSettings
+) -> bool:
+    response = await request(
+        device,
+        "PUT",
+        f"/tracking/settings/{rts_id}",
+        json=tracking_settings.model_dump(),
+    )
+
+    if response is None:
+        return False
+
+    return True
+
+
+async def turn_to_target(
+    device: models.Device, rts_id: int, target_position: models.Position
+) -> bool:
+    response = await request(
+        device,
+        "PUT",
+        f"/rts/turnto/{rts_id}",
+        json=target_position.model_dump(),
+    )
+
+    if response is None:
+        return False
+
+    return True
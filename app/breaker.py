@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from enum import Enum
+
+from app import config, models
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+
+class BreakerState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the requests to a single logging device.
+
+    After `failure_threshold` consecutive connection failures the breaker opens and
+    requests fail immediately. Once the backoff has elapsed, a single probe request
+    is let through (half-open). If the probe succeeds the breaker closes again,
+    otherwise it reopens with twice the backoff, up to `max_backoff`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = config.BREAKER_FAILURE_THRESHOLD,
+        base_backoff: float = config.BREAKER_BASE_BACKOFF,
+        max_backoff: float = config.BREAKER_MAX_BACKOFF,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.failures = 0
+        self.backoff = base_backoff
+        self.open_until = 0.0
+        self._state = BreakerState.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        if self._state == BreakerState.OPEN and time.monotonic() >= self.open_until:
+            return BreakerState.HALF_OPEN
+
+        return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == BreakerState.CLOSED:
+                return True
+
+            if time.monotonic() < self.open_until:
+                return False
+
+            # Let a single probe through per backoff period
+            self._state = BreakerState.HALF_OPEN
+            self.open_until = time.monotonic() + self.backoff
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.backoff = self.base_backoff
+            self._state = BreakerState.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+
+            if self._state == BreakerState.HALF_OPEN:
+                self.backoff = min(2 * self.backoff, self.max_backoff)
+            elif self.failures < self.failure_threshold:
+                return
+
+            self._state = BreakerState.OPEN
+            self.open_until = time.monotonic() + self.backoff
+
+
+class BreakerRegistry:
+    """
+    Keeps one circuit breaker per logging device.
+    """
+
+    def __init__(self) -> None:
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, device: models.DeviceCreate) -> CircuitBreaker:
+        key = device_key(device)
+
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker()
+
+            return self._breakers[key]
+
+    def remove(self, device: models.DeviceCreate) -> None:
+        with self._lock:
+            self._breakers.pop(device_key(device), None)
+
+
+breakers = BreakerRegistry()
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app import config, models
+from app.commands import CommandKind, CommandState, commands
+from app.inventory import inventory
+
+logger = logging.getLogger("root")
+
+# Fetches the RTS of the devices, which may block on the devices or the shared cache
+_executor = ThreadPoolExecutor(
+    max_workers=config.BROADCAST_WORKERS, thread_name_prefix="rts-broadcast"
+)
+
+
+async def _get_all_rts(
+    devices: list[models.Device],
+) -> list[tuple[models.Device, models.RTS_API]]:
+    loop = asyncio.get_running_loop()
+    rts_lists = await asyncio.gather(
+        *(
+            loop.run_in_executor(_executor, inventory.get_rts, device)
+            for device in devices
+        )
+    )
+    return [
+        (device, rts)
+        for device, rts_list in zip(devices, rts_lists)
+        for rts in rts_list
+    ]
+
+
+def _get_result(
+    command: models.Command,
+    device: models.Device,
+    rts: models.RTS_API,
+) -> models.CommandResult:
+    success = command.state == CommandState.DONE
+    finished = command.finished or time.time()
+
+    return models.CommandResult(
+        device_id=device.id,
+        device_name=device.name,
+        rts_id=str(rts.id),
+        rts_name=rts.name,
+        success=success,
+        latency=finished - (command.started or command.submitted),
+        acknowledged=finished,
+    )
+
+
+async def _broadcast(
+    devices: list[models.Device], kind: CommandKind
+) -> models.BroadcastResult:
+    all_rts = await _get_all_rts(devices)
+    queued = [
+        (commands.submit(device=device, rts_id=rts.id, kind=kind), device, rts)
+        for device, rts in all_rts
+    ]
+    finished = await asyncio.gather(
+        *(commands.wait(command) for command, _, _ in queued)
+    )
+
+    result = models.BroadcastResult(
+        results=[
+            _get_result(command, device, rts)
+            for command, (_, device, rts) in zip(finished, queued)
+        ]
+    )
+
+    logger.info(
+        "Broadcast %s to %i RTS: %i succeeded, spread %.3f s",
+        kind.value,
+        len(result.results),
+        result.num_success,
+        result.spread,
+    )
+    return result
+
+
+def broadcast(devices: list[models.Device], kind: CommandKind) -> Future:
+    """
+    This function sends a command to all RTS of the given devices concurrently and
+    returns immediately.
+
+    The RTS of all devices are fetched first, so that all commands can be queued at
+    the same time afterwards. This keeps the spread between the first and the last
+    acknowledgment small, even if some devices are slow or unreachable. The
+    commands go through the command queue of each RTS, so that they are
+    serialized with the commands sent to single RTS, and their progress is shown
+    in the RTS list like that of any other command.
+
+    Args:
+        devices (list[models.Device]): The devices
+        kind (CommandKind): The command to send to each RTS, e.g.
+            CommandKind.START
+
+    Returns:
+        Future: The result of the command for each RTS, available once all
+            commands have finished
+    """
+    return commands.schedule(_broadcast(devices, kind))
@@ -1 +1,10 @@
-from app.callbacks import device, input_validators, logs, rts, settings, scan
+from app.callbacks import (
+    device,
+    export,
+    input_validators,
+    logs,
+    rts,
+    scan,
+    settings,
+    trajectory,
+)
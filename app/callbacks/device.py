@@ -1,32 +1,33 @@
 import dash_bootstrap_components as dbc
-from dash import ALL, MATCH, Input, Output, State, html, ctx
+from dash import ALL, Input, Output, State, html, no_update
 
-from app import api, app, models
+from app import api, app, config, models
 from app.callbacks.input_validators import validate_ip_address, validate_port
 from app.components import ids
-from app.components.device import render_device
-from app.utils import (
-    DeviceNotFound,
-    get_button_index,
-    devices_to_dropdown_options,
-    get_device_from_storage,
+from app.components.device import (
+    EMPTY_SPARKLINE,
+    format_rtt_stats,
+    render_device,
+    render_rtt_sparkline,
 )
+from app.follow import follower
+from app.health import health
+from app.inventory import inventory
+from app.poller import poller
+from app.registry import registry
+from app.sessions import device_key
+from app.utils import DeviceNotFound, devices_to_dropdown_options, get_button_index
 
 
-def render_device_list(device_storage: dict[str, dict]) -> list[html.Div]:
+def render_device_list() -> list[html.Div]:
     """
-    This function renders the device list from the device storage.
-
-    Args:
-        device_storage (list[dict]): The current device storage
+    This function renders the device list from the device registry.
 
     Returns:
         list[html.Div]: The device list
     """
     return dbc.ListGroup(
-        children=[
-            render_device(models.Device(**device)) for device in device_storage.values()
-        ],
+        children=[render_device(device) for device in registry.all()],
         id=ids.DEVICE_LIST,
     )
 
@@ -35,59 +36,62 @@ def render_device_list(device_storage: dict[str, dict]) -> list[html.Div]:
     Output(ids.DEVICE_STORAGE, "data", allow_duplicate=True),
     Input({"type": "device-remove", "device_id": ALL}, "n_clicks"),
     Input({"type": "device-remove", "device_id": ALL}, "id"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def remove_device(
-    n_clicks: list[int | None],
-    trigger_info: list[dict],
-    device_storage: dict[str, dict],
-):
+def remove_device(n_clicks: list[int | None], trigger_info: list[dict]):
     """
     This callback is triggered when the user clicks on the "Remove" button for a device.
 
-    It will remove the device from the device storage.
+    It will remove the device from the device registry.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
         trigger_info (list[dict]): The information about the button that was clicked
-        device_storage (list[dict]): The current device storage
 
     Returns:
-        list[dict]: The updated device storage
+        list[int]: The IDs of the registered devices
     """
     if not any(n_clicks):
-        return device_storage
+        return no_update
 
     button_index = get_button_index(n_clicks)
     device_id = trigger_info[button_index]["device_id"]
-    del device_storage[str(device_id)]
 
-    return device_storage
+    try:
+        device = registry.remove(device_id)
+    except DeviceNotFound:
+        return registry.ids()
+
+    api.close_session(device)
+    poller.forget_device(device)
+    follower.forget_device(device)
+    inventory.invalidate(device)
+
+    return registry.ids()
 
 
 @app.callback(
     Output(ids.DEVICE_LIST, "children"),
     Output(ids.DEVICE_DROPDOWN, "options"),
     Input(ids.DEVICE_STORAGE, "data"),
-    prevent_initial_call=True,
 )
-def update_device_list(device_storage: dict[str, dict]):
+def update_device_list(_: list[int]):
     """
-    This callback is triggered when the device storage is updated.
+    This callback is triggered when the page is loaded and whenever the device
+    storage, which holds the IDs of the registered devices, is updated.
 
     It will update the device list and the device dropdown options
     in the RTS modal.
 
     Args:
-        device_storage (list[dict]): The current device storage
+        _: The IDs of the registered devices
 
     Returns:
         list[html.Div]: The updated device list
         list[dict]: The updated device dropdown options
     """
-    device_list = render_device_list(device_storage)
-    dropdown_options = devices_to_dropdown_options(device_storage)
+    device_list = render_device_list()
+    dropdown_options = devices_to_dropdown_options(registry.all())
 
     return device_list, dropdown_options
 
@@ -130,7 +134,6 @@ def toggle_modal(n1, n2, is_open):
     State(ids.DEVICE_IP_INPUT, "value"),
     State(ids.DEVICE_PORT_INPUT, "value"),
     State(ids.DEVICE_MODAL, "is_open"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
 def device_modal_actions(
@@ -139,13 +142,12 @@ def device_modal_actions(
     device_ip: str,
     device_port: int,
     modal_is_open: bool,
-    device_storage: dict[str, dict],
 ):
     """
     This callback is triggered when the user clicks on the "Create" button
     in the device modal.
 
-    It will create a new device and add it to the device storage.
+    It will create a new device and add it to the device registry.
 
     Args:
         n_clicks_create_device (int): The number of times the "Create" button has been clicked
@@ -155,7 +157,7 @@ def device_modal_actions(
         modal_is_open (bool): Whether the device modal is open
 
     Returns:
-        list[dict]: The updated device storage
+        list[int]: The IDs of the registered devices
         bool: Whether the device modal is open
         bool: Whether the device input is invalid
     """
@@ -165,59 +167,85 @@ def device_modal_actions(
         and validate_ip_address(device_ip)
         and validate_port(device_port)
     ):
-        device = models.Device(
-            id=len(device_storage),
-            ip=device_ip,
-            port=device_port,
-            name=device_name,
+        registry.add(
+            models.DeviceCreate(ip=device_ip, port=device_port, name=device_name)
         )
-        device_storage[str(device.id)] = device.model_dump()
-        return device_storage, not modal_is_open, False
+        return registry.ids(), not modal_is_open, False
+
+    return no_update, modal_is_open, True
 
-    return device_storage, modal_is_open, True
+
+STATUS_ICONS = {
+    "success": "status-success.svg",
+    "error": "status-error.svg",
+    "backoff": "status-backoff.svg",
+}
 
 
 @app.callback(
-    Output(
-        {"type": "device-status-icon", "device_id": MATCH}, "src", allow_duplicate=True
-    ),
-    Output({"type": "device-status-changed", "device_id": MATCH}, "data"),
-    Input({"type": "device-status-interval", "device_id": MATCH}, "n_intervals"),
-    State({"type": "device-status-icon", "device_id": MATCH}, "src"),
-    State(ids.DEVICE_STORAGE, "data"),
-    prevent_initial_call=True,
+    Output({"type": "device-status-icon", "device_id": ALL}, "src"),
+    Output({"type": "device-rtt-sparkline", "device_id": ALL}, "src"),
+    Output({"type": "device-rtt", "device_id": ALL}, "children"),
+    Output(ids.DEVICE_STATUS_INTERVAL, "interval"),
+    Input(ids.DEVICE_STATUS_INTERVAL, "n_intervals"),
+    Input({"type": "device-status-icon", "device_id": ALL}, "id"),
+    State({"type": "device-status-icon", "device_id": ALL}, "src"),
 )
-def update_device_status_icon(_, current_icon: str, device_storage: dict[str, dict]):
+def update_device_status_icons(_, icon_ids: list[dict], current_icons: list[str]):
     """
-    This callback is triggered by the device status interval.
+    This callback is triggered by the device status interval and whenever devices
+    are added to or removed from the device list.
 
-    It will update the status icon for the device to either a green or red light
-    depending on whether the device is reachable or not.
+    It will probe all displayed devices concurrently in a single pass and update
+    their status icons to either a green or red light depending on whether the
+    device is reachable or not. While requests to a device are backing off after
+    repeated connection failures, an orange light is shown without sending a
+    request. The round-trip times of each device are shown as a sparkline together
+    with their median, 95th percentile and jitter.
+
+    The status is checked again soon after any icon has changed, and less
+    frequently while all icons stay the same.
 
     Args:
-        device_storage (dict[dict]): The current device storage
+        _: The number of times the interval has fired
+        icon_ids (list[dict]): The IDs of the displayed status icons
+        current_icons (list[str]): The URLs of the currently displayed icons
 
     Returns:
-        str: The URL of the icon to display
-        bool: Whether the icon has changed
+        list[str]: The URLs of the icons to display
+        list[str]: The round-trip time sparklines
+        list[str]: The round-trip time statistics
+        int: The time until the next status check in milliseconds
     """
-    trigger_id = ctx.triggered_id
-
-    if not trigger_id:
-        return app.get_asset_url("status-unknown.svg")
-
-    device_id = trigger_id["device_id"]
-
-    try:
-        device = get_device_from_storage(device_id, device_storage)
-    except DeviceNotFound:
-        return app.get_asset_url("status-error.svg")
-
-    connection_status = api.validate_device_connection(device)
-
-    if connection_status:
-        new_icon = app.get_asset_url("status-success.svg")
-    else:
-        new_icon = app.get_asset_url("status-error.svg")
-
-    return new_icon, current_icon != new_icon
+    devices = []
+
+    for icon_id in icon_ids:
+        try:
+            devices.append(registry.get(icon_id["device_id"]))
+        except DeviceNotFound:
+            devices.append(None)
+
+    device_health = health.check([device for device in devices if device])
+    new_icons = [
+        app.get_asset_url(
+            STATUS_ICONS[device_health[device_key(device)].state]
+            if device
+            else STATUS_ICONS["error"]
+        )
+        for device in devices
+    ]
+    rtt_series = [health.get_rtt(device) if device else None for device in devices]
+    sparklines = [
+        render_rtt_sparkline(list(series.values())) if series else EMPTY_SPARKLINE
+        for series in rtt_series
+    ]
+    rtt_stats = [
+        format_rtt_stats(series.stats() if series else None) for series in rtt_series
+    ]
+
+    interval = (
+        config.DEVICE_STATUS_FAST_INTERVAL
+        if new_icons != current_icons
+        else config.DEVICE_STATUS_SLOW_INTERVAL
+    )
+    return new_icons, sparklines, rtt_stats, int(interval * 1000)
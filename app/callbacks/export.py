@@ -0,0 +1,85 @@
+import logging
+
+from dash import Input, Output, State, ctx
+
+from app import app, export
+from app.components import ids
+from app.registry import registry
+
+logger = logging.getLogger("root")
+
+
+@app.callback(
+    Output(ids.EXPORT_MODAL, "is_open"),
+    Output(ids.EXPORT_LOG_CHECKLIST, "options"),
+    Output(ids.EXPORT_LOG_CHECKLIST, "value"),
+    Input(ids.OPEN_EXPORT_MODAL_BUTTON, "n_clicks"),
+    Input(ids.CLOSE_EXPORT_MODAL_BUTTON, "n_clicks"),
+    State(ids.EXPORT_MODAL, "is_open"),
+    prevent_initial_call=True,
+)
+def toggle_modal(n1: int, n2: int, is_open: bool):
+    """
+    This callback is triggered when the user clicks on the "Export Logs" button or
+    the "Close" button of the export modal.
+
+    When opening the modal, it lists the logs of all RTS of all devices, which are
+    fetched from the devices concurrently.
+
+    Args:
+        n1 (int): The number of times the "Export Logs" button has been clicked
+        n2 (int): The number of times the "Close" button has been clicked
+        is_open (bool): Whether the export modal is open
+
+    Returns:
+        bool: Whether the export modal is open
+        list[dict]: The logs that can be exported
+        list[str]: The selected logs
+    """
+    if ctx.triggered_id == ids.CLOSE_EXPORT_MODAL_BUTTON or is_open:
+        return False, [], []
+
+    entries = export.list_logs(registry.all())
+    options = [
+        {
+            "label": f"{entry.device.name} / {entry.rts.name}: "
+            f"{'Active' if entry.log.active else 'Inactive'} {entry.log.name}",
+            "value": entry.value,
+        }
+        for entry in entries
+    ]
+    return True, options, [entry.value for entry in entries if not entry.log.active]
+
+
+@app.callback(
+    Output(ids.EXPORT_FORM, "action"),
+    Output(ids.EXPORT_SELECTION, "value"),
+    Output(ids.EXPORT_LEVEL, "value"),
+    Output(ids.EXPORT_DOWNLOAD, "disabled"),
+    Input(ids.EXPORT_LOG_CHECKLIST, "value"),
+    Input(ids.EXPORT_COMPRESSION, "value"),
+)
+def update_export_form(selected: list[str], level: int):
+    """
+    This callback is triggered when the user changes the selected logs or the
+    compression level.
+
+    It fills the export form, which posts the selection to the export route of the
+    server, which streams the archive of the selected logs to the browser.
+
+    Args:
+        selected (list[str]): The selected logs
+        level (int): The compression level
+
+    Returns:
+        str: The export URL
+        str: The selected logs separated by commas
+        int: The compression level
+        bool: Whether the download button is disabled
+    """
+    action = app.get_relative_path("/logs/export")
+
+    if not selected:
+        return action, "", level, True
+
+    return action, ",".join(selected), level, False
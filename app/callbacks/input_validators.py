@@ -3,7 +3,7 @@ from typing import Tuple
 
 from dash import Input, Output
 
-from app import app
+from app import app, config
 from app.components import ids
 
 
@@ -24,6 +24,30 @@ def validate_ip_network(ip_string: str) -> bool:
         return False
 
 
+def validate_scan_network(
+    ip_string: str, min_prefix: int = config.SCAN_MIN_PREFIX
+) -> bool:
+    """
+    Check if the given string is a valid IP network that is small enough to be
+    scanned, i.e. it has at most as many addresses as an IPv4 network with the given
+    prefix length.
+
+    Args:
+        ip_string (str): The string to check.
+        min_prefix (int): The prefix length of the widest IPv4 network to allow.
+
+    Returns:
+        bool: True if the string is a valid IP network that can be scanned, False
+        otherwise.
+    """
+    try:
+        network = ipaddress.ip_network(ip_string, strict=False)
+    except ValueError:
+        return False
+
+    return network.num_addresses <= 2 ** (32 - min_prefix)
+
+
 def validate_ip_address(ip_string: str) -> bool:
     """
     Check if the given string is a valid IP address.
@@ -127,7 +151,7 @@ def update_ip_network_form(text: str) -> Tuple[bool, bool]:
     if not text:
         return False, False
 
-    valid = validate_ip_network(text)
+    valid = validate_ip_network(text) and validate_scan_network(text)
     return valid, not valid
 
 
@@ -1,13 +1,18 @@
 import logging
 
-from dash import ALL, Input, Output, State, ctx
+from dash import ALL, Input, Output, State, ctx, no_update
 
-from app import api, app
+from app import api, app, config
 from app.components import ids
-from app.utils import DeviceNotFound, get_device_from_storage, logs_to_dropdown_options
+from app.components.log_modal import log_summary_table
+from app.logparser import log_cache
+from app.registry import registry
+from app.utils import DeviceNotFound, logs_to_dropdown_options
 
 logger = logging.getLogger("root")
 
+SUMMARY_WAIT = 0.5
+
 
 @app.callback(
     Output(ids.LOG_MODAL, "is_open", allow_duplicate=True),
@@ -17,12 +22,9 @@ logger = logging.getLogger("root")
     Input({"type": "rts-logs", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
     Input(ids.CLOSE_LOG_MODAL_BUTTON, "n_clicks"),
     State(ids.LOG_MODAL, "is_open"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def toggle_modal(
-    n_clicks: list[int], _: int, is_open: bool, device_storage: dict[str, dict]
-):
+def toggle_modal(n_clicks: list[int], _: int, is_open: bool):
     """
     This callback is triggered when the user clicks on the logs button of an RTS.
 
@@ -34,7 +36,6 @@ def toggle_modal(
         n_clicks (list): List of n_clicks for all logs buttons
         n_clicks_close (int): n_clicks for the close button
         is_open (bool): Current state of the modal
-        device_storage (dict[str, dict]): Dictionary containing all devices
 
     Returns:
         tuple: Tuple containing the new state of the modal, the current logs and the
@@ -55,9 +56,7 @@ def toggle_modal(
     rts_id = button_id["rts_id"]
 
     try:
-        device = get_device_from_storage(
-            device_id=device_id, device_storage=device_storage
-        )
+        device = registry.get(device_id)
     except DeviceNotFound:
         logger.error("Unable to get tracking settings")
         return modal_state, options, device_id, rts_id
@@ -69,60 +68,172 @@ def toggle_modal(
 
 
 @app.callback(
-    Output(ids.LOG_MODAL, "is_open", allow_duplicate=True),
-    Output(ids.LOG_DOWNLOAD, "data"),
-    Input(ids.DOWNLOAD_LOG, "n_clicks"),
-    State(ids.LOG_MODAL, "is_open"),
-    State(ids.LOG_DROPDOWN, "value"),
+    Output(ids.DOWNLOAD_LOG, "href"),
+    Output(ids.DOWNLOAD_LOG, "disabled"),
+    Input(ids.LOG_DROPDOWN, "value"),
     State(ids.ACTIVE_DEVICE, "data"),
-    State(ids.DEVICE_STORAGE, "data"),
-    prevent_initial_call=True,
 )
-def download_log(
-    _: int,
-    is_open: bool,
+def update_download_link(
     log_id: int | None,
-    device_id: int,
-    device_storage: dict[str, dict],
+    device_id: int | None,
 ):
     """
-    This callback is triggered when the user clicks on the download button of the log
-    modal.
+    This callback is triggered when the user selects a log in the log modal.
 
-    It downloads the log from the device and returns it as a download.
+    It points the download button to the log download route of the server, which
+    streams the log from the device directly to the browser.
 
     Args:
-        _: n_clicks of the download button
-        is_open: Current state of the modal
-        log_id: Id of the log to download
+        log_id: Id of the selected log
         device_id: Id of the device
-        device_storage: Dictionary containing all devices
 
     Returns:
-        tuple: Tuple containing the new state of the modal and the download data
+        tuple: Tuple containing the download URL and whether the button is disabled
     """
-    if log_id is None:
-        return is_open, None
+    if log_id is None or device_id is None:
+        return None, True
+
+    try:
+        device = registry.get(device_id)
+    except DeviceNotFound:
+        logger.error("Unable to get device %i", device_id)
+        return None, True
 
-    logger.info("Downloading log %i from device %i", log_id, device_id)
+    return app.get_relative_path(f"/logs/download/{device.id}/{log_id}"), False
+
+
+@app.callback(
+    Output(ids.LOG_SUMMARY, "children"),
+    Output(ids.LOG_SUMMARY_INTERVAL, "disabled"),
+    Input(ids.LOG_DROPDOWN, "value"),
+    Input(ids.LOG_SUMMARY_INTERVAL, "n_intervals"),
+    State(ids.ACTIVE_DEVICE, "data"),
+    State(ids.ACTIVE_RTS, "data"),
+)
+def update_log_summary(
+    log_id: str | None, _: int, device_id: int | None, rts_id: int | None
+):
+    """
+    This callback is triggered when the user selects a log in the log modal, and
+    periodically while the log is being analyzed.
+
+    It shows the summary statistics of the log. The log is downloaded and indexed
+    on the server once in the background, only the new bytes of active logs are
+    downloaded again since they are still growing. While the log is being
+    analyzed, the callback returns right away and the summary interval is enabled
+    to pick up the result. Only the statistics are sent to the browser.
+
+    Args:
+        log_id: Id of the selected log
+        _: Number of times the summary interval has fired
+        device_id: Id of the device
+        rts_id: Id of the RTS
+
+    Returns:
+        tuple: Tuple containing the summary statistics of the log and whether the
+            summary interval is disabled
+    """
+    if log_id is None or device_id is None:
+        return None, True
 
     try:
-        device = get_device_from_storage(
-            device_id=device_id, device_storage=device_storage
+        device = registry.get(device_id)
+    except DeviceNotFound:
+        logger.error("Unable to get device %i", device_id)
+        return None, True
+
+    job = None
+    if ctx.triggered_id == ids.LOG_SUMMARY_INTERVAL:
+        job = log_cache.get_job(device, log_id)
+
+    if job is None:
+        active = any(
+            log.active for log in api.get_logs(device, rts_id) if log.id == str(log_id)
         )
+        job = log_cache.submit_index(device, log_id, active=active)
+
+    try:
+        # Cached logs are indexed before the browser would poll for the result
+        index = job.result(timeout=SUMMARY_WAIT)
+    except TimeoutError:
+        return "Analyzing log...", False
+    except Exception:
+        logger.exception("Failed to analyze log %s", log_id)
+        index = None
+
+    if index is None:
+        return "Failed to analyze log.", True
+
+    return log_summary_table(index.summary), True
+
+
+@app.callback(
+    Output(ids.LOG_PREVIEW, "children"),
+    Output(ids.LOG_PREVIEW_INFO, "children"),
+    Output(ids.LOG_PREVIEW_INTERVAL, "disabled"),
+    Input(ids.LOG_DROPDOWN, "value"),
+    Input(ids.LOG_PREVIEW_INTERVAL, "n_intervals"),
+    Input(ids.LOG_MODAL, "is_open"),
+    State(ids.ACTIVE_DEVICE, "data"),
+    State(ids.ACTIVE_RTS, "data"),
+)
+def update_log_preview(
+    log_id: str | None,
+    _: int,
+    is_open: bool,
+    device_id: int | None,
+    rts_id: int | None,
+):
+    """
+    This callback is triggered when the user selects a log in the log modal and
+    periodically while an active log is selected.
+
+    It shows the last lines of the log. Only the end of the log is requested from
+    the device using a Range request, so that active logs can be monitored without
+    downloading them.
+
+    Args:
+        log_id: Id of the selected log
+        _: Number of times the preview interval has fired
+        is_open: Whether the log modal is open
+        device_id: Id of the device
+        rts_id: Id of the RTS
+
+    Returns:
+        tuple: Tuple containing the last lines of the log, the size information and
+            whether the preview interval is disabled
+    """
+    if not is_open or log_id is None or device_id is None:
+        return None, None, True
+
+    try:
+        device = registry.get(device_id)
     except DeviceNotFound:
         logger.error("Unable to get device %i", device_id)
-        return is_open, None
+        return None, None, True
+
+    if ctx.triggered_id == ids.LOG_PREVIEW_INTERVAL:
+        interval_disabled = no_update
+    else:
+        interval_disabled = not any(
+            log.active for log in api.get_logs(device, rts_id) if log.id == str(log_id)
+        )
 
-    log_content = api.download_log(device=device, log_id=log_id)
+    chunk = api.get_log_range(device, log_id, last=config.LOG_PREVIEW_KB * 1024)
 
-    if log_content is None:
-        logger.error("Failed to download log")
-        return is_open, None
+    if chunk is None:
+        return None, "Preview not available.", True
 
-    return not is_open, dict(
-        content=str(log_content, encoding="utf-8"), filename=f"log_{log_id}.txt"
-    )
+    lines = chunk.content.decode(errors="replace").splitlines()
+
+    if chunk.start > 0 and lines:
+        # The first line is incomplete
+        lines = lines[1:]
+
+    total = f" of {chunk.total / 1024**2:.2f} MB" if chunk.total is not None else ""
+    info = f"Last {(chunk.end - chunk.start) / 1024:.1f} KB{total}"
+
+    return "\n".join(lines), info, interval_disabled
 
 
 @app.callback(
@@ -132,7 +243,6 @@ def download_log(
     State(ids.LOG_DROPDOWN, "value"),
     State(ids.ACTIVE_DEVICE, "data"),
     State(ids.ACTIVE_RTS, "data"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
 def delete_log(
@@ -141,7 +251,6 @@ def delete_log(
     log_id: int | None,
     device_id: int,
     rts_id: int,
-    device_storage: dict[str, dict],
 ):
     """
     This callback is triggered when the user clicks on the delete button of the log
@@ -155,7 +264,6 @@ def delete_log(
         log_id: Id of the log to delete
         device_id: Id of the device
         rts_id: Id of the RTS
-        device_storage: Dictionary containing all devices
 
     Returns:
         dict: New options of the log dropdown
@@ -164,9 +272,7 @@ def delete_log(
         return options
 
     try:
-        device = get_device_from_storage(
-            device_id=device_id, device_storage=device_storage
-        )
+        device = registry.get(device_id)
     except DeviceNotFound:
         logger.error("Unable to get device %i", device_id)
         return options
@@ -178,6 +284,7 @@ def delete_log(
         return options
 
     logger.info("Deleted log %i from rts %i on device %i", log_id, rts_id, device_id)
+    log_cache.invalidate(device, log_id)
 
     log_list = api.get_logs(device, rts_id)
     options = logs_to_dropdown_options(log_list)
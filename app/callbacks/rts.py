@@ -1,99 +1,59 @@
 import logging
-from typing import Callable
+from typing import Optional
 
-from dash import ALL, MATCH, Input, Output, State, ctx
+from dash import ALL, MATCH, Input, Output, Patch, State, ctx, no_update
 
 from app import api, app, models
+from app.broadcast import broadcast
+from app.commands import CommandKind, command_view, commands
 from app.components import ids
+from app.components.alert import broadcast_queued_content
 from app.components.rts import render_rts
-from app.utils import DeviceNotFound, get_device_from_storage
+from app.follow import follower
+from app.inventory import inventory
+from app.poller import poller
+from app.registry import registry
+from app.stream import rts_view
+from app.utils import DEFAULT_POSITION, DeviceNotFound
 
 logger = logging.getLogger("root")
 
-STATUS_ICONS = {
-    True: app.get_asset_url("status-success.svg"),
-    False: app.get_asset_url("status-error.svg"),
-}
 
-DEFAULT_POSITION = {
-    "timestamp": 0.0,
-    "device": "-",
-    "pos_x": 0.0,
-    "pos_y": 0.0,
-    "pos_z": 0.0,
-}
-
-
-def get_newest_position(tracking_response: dict, rts_target_position: dict) -> dict:
-    """
-    This function returns the newest position from the tracking response and the current
-    stored position.
-
-    Args:
-        tracking_response (dict): The tracking response from the device
-        rts_target_position (dict): The current stored position
-
-    Returns:
-        dict: The newest position
-    """
-    current_position = rts_target_position or DEFAULT_POSITION
-
-    if tracking_response is None:
-        return current_position
-
-    tracking_status = tracking_response["active"]
-
-    if tracking_status:
-        position = {
-            k: v
-            for k, v in tracking_response.items()
-            if k in ["timestamp", "pos_x", "pos_y", "pos_z", "device"]
-        }
-    else:
-        position = DEFAULT_POSITION
-
-    if float(position["timestamp"]) > float(current_position["timestamp"]):
-        current_position = position
-
-    return current_position
-
-
-def handle_api_request(
-    api_func: Callable[[models.Device, int], bool],
+def submit_command(
+    kind: CommandKind,
     trigger_id: dict,
-    device_storage: dict[str, dict],
-) -> None:
+    target: Optional[models.Position] = None,
+) -> Optional[models.Command]:
     """
-    Helper function to handle API requests.
+    Helper function to queue a command for the RTS of the button that was clicked.
+    The command is sent to the device in the background, so the callback returns
+    without waiting for the RTS.
 
     Args:
-        api_func (Callable[[models.Device, int], bool]): The API function to call
+        kind (CommandKind): The command
         trigger_id (dict): The information about the button that was clicked
-        device_storage (dict[str, dict]): The current device storage
+        target (Optional[models.Position]): The target position of a Turn To Target
+            command
 
+    Returns:
+        Optional[models.Command]: The queued command or None if the device was not
+            found
     """
     try:
-        device, rts_id = get_device_and_rts_id(
-            trigger_id=trigger_id, device_storage=device_storage
-        )
-        api_success = api_func(device, rts_id)
+        device, rts_id = get_device_and_rts_id(trigger_id=trigger_id)
     except DeviceNotFound:
         logger.error("Failed to get device")
+        return None
 
-    if not api_success:
-        logger.error("API request to device failed.")
-
-    return
+    return commands.submit(device=device, rts_id=rts_id, kind=kind, target=target)
 
 
-def get_device_and_rts_id(
-    trigger_id: dict, device_storage: dict[str, dict]
-) -> tuple[models.Device, int]:
+def get_device_and_rts_id(trigger_id: dict) -> tuple[models.Device, int]:
     """
     This function returns the device and RTS ID of the button that was clicked.
 
     Raises:
-        DeviceNotFound: If the device with the given ID is not in the device storage
+        DeviceNotFound: If the device with the given ID is not in the device registry
 
     Args:
         n_clicks (int): The number of times the button has been clicked
@@ -105,28 +65,73 @@ def get_device_and_rts_id(
     device_id = trigger_id["device_id"]
     rts_id = trigger_id["rts_id"]
 
-    device = get_device_from_storage(device_id=device_id, device_storage=device_storage)
+    device = registry.get(device_id)
     return device, rts_id
 
 
-def render_rts_list(device_storage: dict[str, dict]):
+def render_rts_list():
     """
-    This function renders the RTS list from the device storage.
-
-    Args:
-        device_storage (dict[str, dict]): The current device storage
+    This function renders the RTS list from the device registry. The RTS of each
+    device are read from the inventory cache.
 
     Returns:
         list[html.Div]: The RTS list
     """
     rts_children = []
 
-    for device_dict in device_storage.values():
-        device = models.Device(**device_dict)
-        device_rts = api.get_rts(device)
+    for device in registry.all():
+        device_rts = inventory.get_rts(device)
 
         for rts in device_rts:
-            rts_children.append(render_rts(device=device, rts=rts))
+            rts_children.append(
+                render_rts(
+                    device=device,
+                    rts=rts,
+                    following=follower.is_following(device=device, rts_id=rts.id),
+                )
+            )
+
+    return rts_children
+
+
+def patch_rts_list(rendered_ids: list[dict]) -> Patch:
+    """
+    This function returns a patch for the RTS list that only removes the RTS that
+    no longer exist and appends the RTS that are not rendered yet. All other RTS
+    items, including their stores and intervals, are left untouched.
+
+    Args:
+        rendered_ids (list[dict]): The IDs of the currently rendered RTS items,
+            in the order they appear in the RTS list
+
+    Returns:
+        Patch: The patch for the children of the RTS list
+    """
+    current_rts: dict[tuple[str, str], tuple[models.Device, models.RTS_API]] = {}
+
+    for device in registry.all():
+        for rts in inventory.get_rts(device):
+            current_rts[(str(device.id), str(rts.id))] = (device, rts)
+
+    rendered_keys = [
+        (str(item_id["device_id"]), str(item_id["rts_id"])) for item_id in rendered_ids
+    ]
+
+    rts_children = Patch()
+
+    for index in reversed(range(len(rendered_keys))):
+        if rendered_keys[index] not in current_rts:
+            del rts_children[index]
+
+    for key, (device, rts) in current_rts.items():
+        if key not in rendered_keys:
+            rts_children.append(
+                render_rts(
+                    device=device,
+                    rts=rts,
+                    following=follower.is_following(device=device, rts_id=rts.id),
+                )
+            )
 
     return rts_children
 
@@ -134,21 +139,24 @@ def render_rts_list(device_storage: dict[str, dict]):
 @app.callback(
     Output(ids.RTS_LIST, "children", allow_duplicate=True),
     Input(ids.DEVICE_STORAGE, "data"),
-    prevent_initial_call=True,
+    State({"type": "rts-item", "rts_id": ALL, "device_id": ALL}, "id"),
+    prevent_initial_call="initial_duplicate",
 )
-def update_rts_list(device_storage: dict[str, dict]):
+def update_rts_list(_: list[int], rendered_ids: list[dict]):
     """
-    This callback is triggered when the device storage is updated.
+    This callback is triggered when the page is loaded and whenever the device
+    storage, which holds the IDs of the registered devices, is updated.
 
-    It will re-render the RTS list.
+    It will patch the RTS list, so that only RTS of added or removed devices are
+    inserted or deleted.
 
     Args:
-        device_storage (dict[str, dict]): The current device storage
+        rendered_ids (list[dict]): The IDs of the currently rendered RTS items
 
     Returns:
-        list[html.Div]: The updated RTS list
+        Patch: The patch for the RTS list
     """
-    return render_rts_list(device_storage)
+    return patch_rts_list(rendered_ids)
 
 
 # @app.callback(
@@ -180,203 +188,205 @@ def update_rts_list(device_storage: dict[str, dict]):
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-test", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def test_rts_connection(n_clicks: list[int], device_storage: dict[str, dict]):
+def test_rts_connection(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Test" button for a RTS.
 
-    It will test the connection to the RTS and update the status icon.
+    It will queue a connection test for the RTS, the status icon is updated once
+    the test has been sent.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    handle_api_request(
-        api_func=api.validate_rts_connection,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
-    )
+    submit_command(kind=CommandKind.TEST, trigger_id=ctx.triggered_id)
 
 
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-start", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def start_tracking(n_clicks: list[int], device_storage: dict[str, dict]):
+def start_tracking(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Start" button for a RTS.
 
-    It will start tracking for the RTS by sending an API request to the device.
+    It will queue a request to the device to start tracking for the RTS.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    handle_api_request(
-        api_func=api.start_tracking,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
-    )
+    submit_command(kind=CommandKind.START, trigger_id=ctx.triggered_id)
 
 
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-dummy", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def start_dummy_tracking(n_clicks: list[int], device_storage: dict[str, dict]):
+def start_dummy_tracking(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Start Dummy Tracking" button for a RTS.
 
-    It will start fake tracking for the RTS by sending an API request to the device.
+    It will queue a request to the device to start fake tracking for the RTS.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    handle_api_request(
-        api_func=api.start_dummy_tracking,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
-    )
+    submit_command(kind=CommandKind.START_DUMMY, trigger_id=ctx.triggered_id)
 
 
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-stop", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def stop_tracking(n_clicks: list[int], device_storage: dict[str, dict]):
+def stop_tracking(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Stop" button for a RTS.
 
-    It will stop tracking for the RTS by sending an API request to the device.
+    It will queue a request to the device to stop tracking for the RTS. If the start
+    of tracking is still queued, both commands are cancelled.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    handle_api_request(
-        api_func=api.stop_tracking,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
-    )
+    submit_command(kind=CommandKind.STOP, trigger_id=ctx.triggered_id)
 
 
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-change-face", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def change_face(n_clicks: list[int], device_storage: dict[str, dict]):
+def change_face(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Change Face" button for a RTS.
 
-    It will change the face of the RTS by sending an API request to the device.
+    It will queue a request to the device to change the face of the RTS.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    handle_api_request(
-        api_func=api.change_face,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
-    )
+    submit_command(kind=CommandKind.CHANGE_FACE, trigger_id=ctx.triggered_id)
 
 
 @app.callback(
     Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
     Input({"type": "rts-turn-to-target", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.RTS_POSITION_STORAGE, "data"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def turn_to_target(
-    n_clicks: list[int], rts_positions: dict, device_storage: dict[str, dict]
-):
+def turn_to_target(n_clicks: list[int]):
     """
     This callback is triggered when the user clicks on the "Turn To Target" button for a RTS.
 
-    It will turn the RTS to the current target position by sending an API request to the device.
+    It will queue a request to the device to turn the RTS to the current target
+    position. The target position is the newest position recorded by any RTS, as
+    tracked by the background poller. If a Turn To Target is still queued, only its
+    target is updated.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
     """
     if not any(n_clicks):
         return
 
-    trigger_id = ctx.triggered_id
+    rts_positions = poller.get_target_position()
+    target_position = models.Position(
+        east=float(rts_positions["pos_x"]),
+        north=float(rts_positions["pos_y"]),
+        up=float(rts_positions["pos_z"]),
+    )
+    submit_command(
+        kind=CommandKind.TURN_TO_TARGET,
+        trigger_id=ctx.triggered_id,
+        target=target_position,
+    )
+
+
+@app.callback(
+    Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
+    Input({"type": "rts-follow-switch", "rts_id": ALL, "device_id": ALL}, "value"),
+    prevent_initial_call=True,
+)
+def toggle_follow_target(_: list[bool]):
+    """
+    This callback is triggered when the user toggles the "Follow Target" switch of
+    a RTS.
+
+    It will turn the follow mode of the RTS on or off. While it is on, the RTS is
+    turned to the target position in the background whenever the target moves,
+    until the RTS starts tracking.
+
+    Args:
+        _: Whether the switches are on
+    """
+    if ctx.triggered_id is None or not ctx.triggered:
+        return
 
     try:
-        device, rts_id = get_device_and_rts_id(
-            trigger_id=trigger_id, device_storage=device_storage
-        )
-        target_position = models.Position(
-            east=float(rts_positions["pos_x"]),
-            north=float(rts_positions["pos_y"]),
-            up=float(rts_positions["pos_z"]),
-        )
-        api_success = api.turn_to_target(
-            device, rts_id, target_position=target_position
-        )
+        device, rts_id = get_device_and_rts_id(trigger_id=ctx.triggered_id)
     except DeviceNotFound:
         logger.error("Failed to get device")
+        return
 
-    if not api_success:
-        logger.error("API request to device failed.")
-
-    return
+    follower.set_following(
+        device=device, rts_id=rts_id, following=bool(ctx.triggered[0]["value"])
+    )
 
 
 @app.callback(
     Output(ids.RTS_LIST, "children", allow_duplicate=True),
     Input({"type": "rts-remove", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
+    State({"type": "rts-item", "rts_id": ALL, "device_id": ALL}, "id"),
     prevent_initial_call=True,
 )
-def remove_rts(n_clicks: list[int], device_storage: dict[str, dict]):
+def remove_rts(n_clicks: list[int], rendered_ids: list[dict]):
     """
     This callback is triggered when the user clicks on the "Remove" button for a RTS.
 
-    It will remove the RTS from the device by sending an API request to the device.
+    It will queue a request to the device to remove the RTS and delete its item
+    from the RTS list right away. If the device fails to remove the RTS, it is
+    shown again the next time the RTS list is rendered.
 
     Args:
         n_clicks (list[int]): The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
+        rendered_ids (list[dict]): The IDs of the currently rendered RTS items
     """
     if not any(n_clicks):
-        return render_rts_list(device_storage)
+        return no_update
 
-    handle_api_request(
-        api_func=api.delete_rts,
-        trigger_id=ctx.triggered_id,
-        device_storage=device_storage,
+    if submit_command(kind=CommandKind.REMOVE, trigger_id=ctx.triggered_id) is None:
+        return no_update
+
+    removed_key = (
+        str(ctx.triggered_id["device_id"]),
+        str(ctx.triggered_id["rts_id"]),
     )
-    return render_rts_list(device_storage)
+    rts_children = Patch()
+
+    for index, item_id in enumerate(rendered_ids):
+        if (str(item_id["device_id"]), str(item_id["rts_id"])) == removed_key:
+            del rts_children[index]
+            break
+
+    return rts_children
 
 
 @app.callback(
@@ -393,6 +403,10 @@ def remove_rts(n_clicks: list[int], device_storage: dict[str, dict]):
     Output(
         {"type": "rts-position-storage", "rts_id": MATCH, "device_id": MATCH}, "data"
     ),
+    Output(
+        {"type": "rts-command-status", "rts_id": MATCH, "device_id": MATCH},
+        "children",
+    ),
     Input(
         {"type": "rts-tracking-status-interval", "rts_id": MATCH, "device_id": MATCH},
         "n_intervals",
@@ -401,26 +415,20 @@ def remove_rts(n_clicks: list[int], device_storage: dict[str, dict]):
         {"type": "rts-tracking-status-interval", "rts_id": MATCH, "device_id": MATCH},
         "id",
     ),
-    State(ids.DEVICE_STORAGE, "data"),
-    State(
-        {"type": "rts-position-storage", "rts_id": MATCH, "device_id": MATCH}, "data"
-    ),
+    prevent_initial_call=True,
 )
-def update_tracking_status(
-    _: int,
-    trigger_info: dict,
-    device_storage: dict[str, dict],
-    rts_target_position: dict,
-):
+def update_tracking_status(_: int, trigger_info: dict):
     """
     This callback is triggered when the tracking status interval fires. It will update
-    the tracking status of the RTS every second by sending an API request to the device.
+    the tracking status of the RTS from the snapshot of the background poller, so no
+    request is sent to the device from within the callback.
+
+    The interval is only enabled if push updates are disabled. Otherwise the same
+    values are pushed to the browser by the status event stream.
 
     Args:
         _: The number of times the interval has fired
         trigger_info (dict): The information about the interval that fired
-        device_storage (dict[str, dict]): The current device storage
-        rts_target_position (dict): The current stored position
 
     Returns:
         str: The source of the serial status icon
@@ -428,47 +436,33 @@ def update_tracking_status(
         str: The number of recorded positions
         str: The newest position as a string
         dict: The newest position as a dict
+        str: The state of the last command sent to the RTS
     """
     try:
-        device, rts_id = get_device_and_rts_id(
-            trigger_id=trigger_info, device_storage=device_storage
-        )
+        device, rts_id = get_device_and_rts_id(trigger_id=trigger_info)
     except DeviceNotFound:
         logger.error("Failed to get device")
+        view = rts_view(models.RTSStatus())
         return (
-            app.get_asset_url("status-error.svg"),
-            app.get_asset_url("status-error.svg"),
-            "0",
-            "0.00, 0.00, 0.00",
-            DEFAULT_POSITION,
-        )
-
-    tracking_response = api.get_tracking_status(device=device, rts_id=rts_id)
-    connection_response = api.get_connection_status(device=device, rts_id=rts_id)
-
-    if None in [tracking_response, connection_response]:
-        return (
-            app.get_asset_url("status-error.svg"),
-            app.get_asset_url("status-error.svg"),
-            "0",
-            "0.00, 0.00, 0.00",
+            view["serial"],
+            view["tracking"],
+            view["count"],
+            view["position"],
             DEFAULT_POSITION,
+            "",
         )
 
-    connection_status = connection_response["connected"]
-    tracking_status = tracking_response["active"]
-    num_positions = tracking_response["positions"]
-
-    newest_position = get_newest_position(tracking_response, rts_target_position)
-
-    position_str = f"{newest_position['pos_x']:.2f}, {newest_position['pos_y']:.2f}, {newest_position['pos_z']:.2f}"
+    poller.watch(device=device, rts_id=rts_id)
+    rts_status = poller.get_status(device=device, rts_id=rts_id)
+    view = rts_view(rts_status)
 
     return (
-        STATUS_ICONS[connection_status],
-        STATUS_ICONS[tracking_status],
-        num_positions,
-        position_str,
-        newest_position,
+        view["serial"],
+        view["tracking"],
+        view["count"],
+        view["position"],
+        (rts_status.position if rts_status else None) or DEFAULT_POSITION,
+        command_view(device=device, rts_id=rts_id),
     )
 
 
@@ -571,7 +565,7 @@ def toggle_modal(n1, n2, is_open):
     State(ids.RTS_BYTESIZE_INPUT, "value"),
     State(ids.RTS_TIMEOUT_INPUT, "value"),
     State(ids.RTS_MODAL, "is_open"),
-    State(ids.DEVICE_STORAGE, "data"),
+    State({"type": "rts-item", "rts_id": ALL, "device_id": ALL}, "id"),
     prevent_initial_call=True,
 )
 def rts_modal_actions(
@@ -585,7 +579,7 @@ def rts_modal_actions(
     rts_bytesize: int,
     rts_timeout: int,
     modal_is_open: bool,
-    device_storage: dict[str, dict],
+    rendered_ids: list[dict],
 ):
     """
     This callback is triggered when the user clicks on the "Add" button of the RTS modal.
@@ -603,9 +597,10 @@ def rts_modal_actions(
         rts_bytesize (int): The bytesize of the RTS
         rts_timeout (int): The timeout of the RTS
         modal_is_open (bool): Whether the RTS modal is open
-        device_storage (dict[str, dict]): The current device storage
+        rendered_ids (list[dict]): The IDs of the currently rendered RTS items
 
     Returns:
+        Patch: The patch for the RTS list
         bool: Whether the RTS modal is open
         str: The alert message
         bool: Whether the alert is open
@@ -621,18 +616,16 @@ def rts_modal_actions(
         and rts_timeout
     ):
         return (
-            render_rts_list(device_storage),
+            no_update,
             modal_is_open,
             "Inputs incomplete.",
             True,
         )
 
-    db_device = device_storage.get(str(device_id))
-
-    if db_device is None:
-        return render_rts_list(device_storage), modal_is_open, "Device not found.", True
-
-    device = models.Device(**db_device)
+    try:
+        device = registry.get(device_id)
+    except DeviceNotFound:
+        return no_update, modal_is_open, "Device not found.", True
 
     rts_api = models.RTS_APICreate(
         name=rts_name,
@@ -648,70 +641,67 @@ def rts_modal_actions(
 
     if added_rts is None:
         return (
-            render_rts_list(device_storage),
+            no_update,
             modal_is_open,
             "API request to device failed.",
             True,
         )
 
-    return render_rts_list(device_storage), not modal_is_open, "", False
+    inventory.invalidate(device)
+    return patch_rts_list(rendered_ids), not modal_is_open, "", False
 
 
 @app.callback(
-    Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "children", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "color", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "is_open", allow_duplicate=True),
     Input(ids.START_ALL_BUTTON, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def start_all(_: int, device_storage: dict[str, dict]):
+def start_all(_: int):
     """
     This callback is triggered when the user clicks on the "Start All" button.
 
-    It will start tracking for all RTS by sending an API request to the device.
+    It will start tracking for all RTS by queueing the commands for all RTS at once
+    in the background. The result of each RTS is shown in the RTS list.
 
     Args:
         _: The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
 
     Returns:
-        str: An empty string, to prevent the callback from returning None
+        list: The content of the broadcast alert
+        str: The color of the broadcast alert
+        bool: Whether the broadcast alert is open
     """
-    for device_dict in device_storage.values():
-        device = models.Device(**device_dict)
+    devices = registry.all()
+    broadcast(devices=devices, kind=CommandKind.START)
 
-        rts_list = api.get_rts(device)
-        for rts in rts_list:
-            api.start_tracking(device=device, rts_id=rts.id)
-            logger.info("Started tracking for RTS %i", rts.id)
-
-    return
+    return broadcast_queued_content(CommandKind.START.value, len(devices)), "info", True
 
 
 @app.callback(
-    Output(ids.DUMMY_OUTPUT, "children", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "children", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "color", allow_duplicate=True),
+    Output(ids.BROADCAST_ALERT, "is_open", allow_duplicate=True),
     Input(ids.STOP_ALL_BUTTON, "n_clicks"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def stop_all(_: int, device_storage: dict[str, dict]):
+def stop_all(_: int):
     """
     This callback is triggered when the user clicks on the "Stop All" button.
 
-    It will stop tracking for all RTS by sending an API request to the device.
+    It will stop tracking for all RTS by queueing the commands for all RTS at once
+    in the background. The result of each RTS is shown in the RTS list.
 
     Args:
         _: The number of times the button has been clicked
-        device_storage (dict[str, dict]): The current device storage
 
     Returns:
-        str: An empty string, to prevent the callback from returning None
+        list: The content of the broadcast alert
+        str: The color of the broadcast alert
+        bool: Whether the broadcast alert is open
     """
-    for device_dict in device_storage.values():
-        device = models.Device(**device_dict)
-
-        rts_list = api.get_rts(device)
-        for rts in rts_list:
-            api.stop_tracking(device=device, rts_id=rts.id)
-            logger.info("Stopped tracking for RTS %i", rts.id)
+    devices = registry.all()
+    broadcast(devices=devices, kind=CommandKind.STOP)
 
-    return
+    return broadcast_queued_content(CommandKind.STOP.value, len(devices)), "info", True
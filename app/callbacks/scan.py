@@ -1,9 +1,14 @@
-import logging
-from dash import Input, Output, State
-import networkscan
-from app import api, app, models
-from app.callbacks.input_validators import validate_ip_network, validate_port
+from dash import Input, Output, State, no_update
+
+from app import app, models
+from app.callbacks.input_validators import (
+    validate_ip_network,
+    validate_port,
+    validate_scan_network,
+)
 from app.components import ids
+from app.registry import registry
+from app.scanner import scanner
 
 
 @app.callback(
@@ -36,47 +41,89 @@ def toggle_modal(n1, n2, is_open):
 
 
 @app.callback(
-    Output(ids.DEVICE_STORAGE, "data", allow_duplicate=True),
-    Output(ids.SCAN_MODAL, "is_open", allow_duplicate=True),
+    Output(ids.SCAN_JOB, "data"),
+    Output(ids.SCAN_INTERVAL, "disabled", allow_duplicate=True),
     Output(ids.INVALID_SCAN_INPUT_ALERT, "is_open", allow_duplicate=True),
-    Output(ids.SCAN_DEVICE_LOADING, "children", allow_duplicate=True),
+    Output(ids.SCAN_PROGRESS, "value", allow_duplicate=True),
     Input(ids.SCAN_DEVICE_BUTTON, "n_clicks"),
     State(ids.NETWORK_INPUT, "value"),
     State(ids.NETWORK_PORT_INPUT, "value"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
-def scan_for_devices(
-    n_clicks: int, network: str, port: int, device_storage: dict[str, dict]
-):
+def scan_for_devices(n_clicks: int, network: str, port: int):
     """
     This callback is triggered when the user clicks on the "Scan" button.
 
-    It will scan the network for devices and add them to the device storage.
+    It will start scanning the network for devices in the background and enable
+    the scan interval, which adds the found devices to the device registry.
 
     Args:
-        _: The number of times the button has been clicked
-        device_storage (list[dict]): The current device storage
+        n_clicks (int): The number of times the button has been clicked
+        network (str): The network to scan
+        port (int): The port of the RTS Server
 
     Returns:
-        dict[dict]: The updated device storage
+        str: The ID of the scan job
+        bool: Whether the scan interval is disabled
+        bool: Whether the input is invalid
+        float: The progress of the scan
     """
     if not (
-        n_clicks and network and validate_ip_network(network) and validate_port(port)
+        n_clicks
+        and network
+        and validate_ip_network(network)
+        and validate_scan_network(network)
+        and validate_port(port)
     ):
-        return device_storage, True, True, None
+        return no_update, True, True, 0
+
+    job_id = scanner.start(network=network, port=port)
+    return job_id, False, False, 0
 
-    logging.info("Scanning network %s on port %s", network, port)
-    scan = networkscan.Networkscan(network)
-    # This will cause problems if the scan takes longer than 30s"
-    scan.run()
 
-    for host in scan.list_of_hosts_found:
-        device = models.Device(id=len(device_storage), ip=host, port=port, name=host)
+@app.callback(
+    Output(ids.DEVICE_STORAGE, "data", allow_duplicate=True),
+    Output(ids.SCAN_PROGRESS, "value", allow_duplicate=True),
+    Output(ids.SCAN_INTERVAL, "disabled", allow_duplicate=True),
+    Output(ids.SCAN_MODAL, "is_open", allow_duplicate=True),
+    Input(ids.SCAN_INTERVAL, "n_intervals"),
+    State(ids.SCAN_JOB, "data"),
+    prevent_initial_call=True,
+)
+def update_scan_progress(_: int, job_id: str):
+    """
+    This callback is triggered by the scan interval while a scan is running.
+
+    It will add the devices found so far to the device registry and update the
+    progress bar. Once the scan is finished, the interval is disabled and the
+    scan modal is closed.
+
+    Args:
+        _: The number of times the interval has fired
+        job_id (str): The ID of the scan job
+
+    Returns:
+        list[int]: The IDs of the registered devices
+        float: The progress of the scan
+        bool: Whether the scan interval is disabled
+        bool: Whether the scan modal is open
+    """
+    job = scanner.get(job_id) if job_id else None
+
+    if job is None:
+        return no_update, 0, True, no_update
 
-        if not api.validate_device_connection(device):
-            continue
+    known_addresses = {(device.ip, device.port) for device in registry.all()}
+    new_hosts = [
+        host for host in job.get_found() if (host, job.port) not in known_addresses
+    ]
 
-        device_storage[str(device.id)] = device.model_dump()
+    for host in new_hosts:
+        registry.add(models.DeviceCreate(ip=host, port=job.port, name=host))
 
-    return device_storage, False, False, None
+    return (
+        registry.ids() if new_hosts else no_update,
+        job.progress,
+        job.done,
+        not job.done,
+    )
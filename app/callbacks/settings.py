@@ -4,7 +4,8 @@ from dash import ALL, Input, Output, State, ctx
 
 from app import api, app, models
 from app.components import ids
-from app.utils import DeviceNotFound, get_device_from_storage
+from app.registry import registry
+from app.utils import DeviceNotFound
 
 logger = logging.getLogger("root")
 
@@ -24,14 +25,12 @@ logger = logging.getLogger("root")
     Input({"type": "rts-settings", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
     Input(ids.CLOSE_SETTINGS_MODAL_BUTTON, "n_clicks"),
     State(ids.SETTINGS_MODAL, "is_open"),
-    State(ids.DEVICE_STORAGE, "data"),
     prevent_initial_call=True,
 )
 def toggle_modal(
     n_clicks_settings: list,
     _: int,
     is_open: bool,
-    device_storage: dict[str, dict],
 ):
     """
     This callback is triggered when the user clicks on the settings button of an RTS.
@@ -45,7 +44,6 @@ def toggle_modal(
         n_clicks_settings (list): List of n_clicks for all settings buttons
         n_clicks_close (int): n_clicks for the close button
         is_open (bool): Current state of the modal
-        device_storage (dict[str, dict]): Dictionary containing all devices
 
     Returns:
         tuple: Tuple containing the new state of the modal, the current settings
@@ -69,9 +67,7 @@ def toggle_modal(
     rts_id = button_id["rts_id"]
 
     try:
-        device = get_device_from_storage(
-            device_id=device_id, device_storage=device_storage
-        )
+        device = registry.get(device_id)
         rts_api_settings = api.get_tracking_settings(device=device, rts_id=rts_id)
     except DeviceNotFound:
         logger.error("Unable to get tracking settings")
@@ -97,7 +93,6 @@ def toggle_modal(
     State(ids.RTS_POWER_SEARCH_RANGE, "value"),
     State(ids.RTS_POWER_SEARCH_ENABLED, "value"),
     State(ids.SETTINGS_MODAL, "is_open"),
-    State(ids.DEVICE_STORAGE, "data"),
     State(ids.ACTIVE_RTS, "data"),
     State(ids.ACTIVE_DEVICE, "data"),
     prevent_initial_call=True,
@@ -113,7 +108,6 @@ def update_tracking_settings(
     power_search_range: int,
     power_search_enabled: bool,
     is_open: bool,
-    device_storage: dict[str, dict],
     active_rts: int,
     active_device: int,
 ):
@@ -138,7 +132,6 @@ def update_tracking_settings(
         power_search_range (int): Power search range
         power_search_enabled (bool): Power search enabled
         is_open (bool): Current state of the modal
-        device_storage (dict[str, dict]): Dictionary containing all devices
         active_rts (int): Active RTS
         active_device (int): Active device
 
@@ -164,9 +157,7 @@ def update_tracking_settings(
     )
 
     try:
-        device = get_device_from_storage(
-            device_id=active_device, device_storage=device_storage
-        )
+        device = registry.get(active_device)
     except DeviceNotFound:
         return is_open, True, "Could not find device"
 
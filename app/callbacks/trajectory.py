@@ -0,0 +1,115 @@
+import logging
+
+from dash import ALL, Input, Output, State, ctx, no_update
+
+from app import app, config
+from app.components import ids
+from app.trajectory import (
+    create_figure,
+    extend_figure,
+    get_trajectory_keys,
+    get_trajectory_options,
+)
+from app.utils import DeviceNotFound
+
+logger = logging.getLogger("root")
+
+
+@app.callback(
+    Output(ids.TRAJECTORY_DROPDOWN, "options"),
+    Input(ids.TRAJECTORY_INTERVAL, "n_intervals"),
+    State(ids.TRAJECTORY_DROPDOWN, "options"),
+)
+def update_trajectory_options(_: int, current_options: list[dict]):
+    """
+    This callback is triggered when the trajectory interval fires.
+
+    It will update the RTS that can be selected for the trajectory plot.
+
+    Args:
+        _: The number of times the interval has fired
+        current_options (list[dict]): The current options
+
+    Returns:
+        list[dict]: The options
+    """
+    options = get_trajectory_options()
+
+    if options == current_options:
+        return no_update
+
+    return options
+
+
+@app.callback(
+    Output(ids.TRAJECTORY_DROPDOWN, "value"),
+    Input({"type": "rts-trajectory", "rts_id": ALL, "device_id": ALL}, "n_clicks"),
+    prevent_initial_call=True,
+)
+def select_trajectory(n_clicks: list[int]):
+    """
+    This callback is triggered when the user clicks on the "Trajectory" button of a RTS.
+
+    It will show the trajectory of this RTS in the trajectory plot.
+
+    Args:
+        n_clicks (list[int]): The number of times the buttons have been clicked
+
+    Returns:
+        str: The selected RTS
+    """
+    if not any(n_clicks):
+        return no_update
+
+    return f"{ctx.triggered_id['device_id']}:{ctx.triggered_id['rts_id']}"
+
+
+@app.callback(
+    Output(ids.TRAJECTORY_GRAPH, "figure"),
+    Output(ids.TRAJECTORY_GRAPH, "extendData"),
+    Output(ids.TRAJECTORY_STATE, "data"),
+    Input(ids.TRAJECTORY_INTERVAL, "n_intervals"),
+    Input(ids.TRAJECTORY_DROPDOWN, "value"),
+    State(ids.TRAJECTORY_STATE, "data"),
+)
+def update_trajectory(_: int, selection: str, state: dict):
+    """
+    This callback is triggered when the trajectory interval fires or the user selects
+    another RTS.
+
+    If the selection or the displayed RTS changed, or too many points have been
+    appended since the last downsampling, it will create the whole figure from the
+    position history. Otherwise it will only send the positions recorded since the
+    last update, which are appended to the figure in the browser.
+
+    Args:
+        _: The number of times the interval has fired
+        selection (str): The selected RTS
+        state (dict): The state of the displayed figure
+
+    Returns:
+        dict: The figure
+        list: The new positions
+        dict: The state of the displayed figure
+    """
+    keys = get_trajectory_keys(selection)
+
+    try:
+        if (
+            state is None
+            or ctx.triggered_id == ids.TRAJECTORY_DROPDOWN
+            or state["keys"] != [[device_id, rts_id] for device_id, rts_id, _ in keys]
+            or state["points"] > 2 * config.PLOT_MAX_POINTS
+        ):
+            figure, state = create_figure(keys)
+            return figure, no_update, state
+
+        extend_data, state = extend_figure(state)
+    except DeviceNotFound:
+        logger.error("Failed to get device")
+        return no_update, no_update, None
+
+    if extend_data is None:
+        return no_update, no_update, no_update
+
+    return no_update, extend_data, state
@@ -0,0 +1,301 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from typing import Coroutine, Optional
+
+from app import async_api, models
+from app.inventory import inventory
+from app.poller import poller
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+
+class CommandKind(str, Enum):
+    TEST = "Test Connection"
+    START = "Start Tracking"
+    START_DUMMY = "Start Dummy Tracking"
+    STOP = "Stop Tracking"
+    CHANGE_FACE = "Change Face"
+    TURN_TO_TARGET = "Turn To Target"
+    REMOVE = "Remove"
+
+
+class CommandState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+API_FUNCTIONS = {
+    CommandKind.TEST: async_api.validate_rts_connection,
+    CommandKind.START: async_api.start_tracking,
+    CommandKind.START_DUMMY: async_api.start_dummy_tracking,
+    CommandKind.STOP: async_api.stop_tracking,
+    CommandKind.CHANGE_FACE: async_api.change_face,
+    CommandKind.REMOVE: async_api.delete_rts,
+}
+
+
+class CommandQueue:
+    """
+    Per-RTS queues for the commands sent to the RTS.
+
+    Commands are executed on a background event loop with the async device API, so
+    callbacks return as soon as a command is queued instead of waiting for the
+    instrument, and a queue does not occupy a thread while its commands are in
+    flight. The commands of each RTS are executed one after another in the order
+    they were submitted, while commands to different RTS run concurrently, limited
+    to the connection pool size per device. Redundant commands that are still
+    queued are coalesced:
+
+    - A command of the same kind as the last queued command is dropped. For Turn To
+      Target, the queued command takes over the new target, so that only the
+      latest target is sent.
+    - A Stop cancels a queued Start, so that the RTS does not start tracking just to
+      be stopped again. The Stop itself is still sent.
+
+    The last command of each RTS is kept with its state and latency, so that it
+    can be shown in the RTS list.
+
+    The queues are kept in the memory of each process. With several gunicorn
+    workers, commands submitted to the same RTS through different workers are
+    neither serialized nor coalesced with each other.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[tuple[str, str], deque[models.Command]] = {}
+        self._running: set[tuple[str, str]] = set()
+        self._last: dict[tuple[str, str], models.Command] = {}
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_running(self) -> asyncio.AbstractEventLoop:
+        # Concurrent callbacks must not start a second event loop
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="rts-command", daemon=True
+                ).start()
+
+            return self._loop
+
+    def schedule(self, coroutine: Coroutine) -> Future:
+        """
+        This function runs a coroutine on the event loop of the command queue, e.g.
+        to submit commands and wait for them without blocking the caller.
+
+        Args:
+            coroutine (Coroutine): The coroutine
+
+        Returns:
+            Future: The result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_running())
+
+    def _finish(self, command: models.Command, state: CommandState) -> None:
+        # Must be called with the lock held
+        command.state = state.value
+        command.finished = time.time()
+
+        for waiter in self._waiters.pop(command.id, []):
+            self._loop.call_soon_threadsafe(_set_done, waiter)
+
+    def _coalesce(
+        self, pending: deque[models.Command], command: models.Command
+    ) -> models.Command:
+        last = pending[-1] if pending else None
+
+        if last is None:
+            return command
+
+        if last.kind == command.kind:
+            # Only the newest target matters
+            last.target = command.target
+            return last
+
+        if command.kind == CommandKind.STOP and last.kind in (
+            CommandKind.START,
+            CommandKind.START_DUMMY,
+        ):
+            # The Stop is still sent, since the RTS may already be tracking
+            pending.pop()
+            self._finish(last, CommandState.CANCELLED)
+            return self._coalesce(pending, command)
+
+        return command
+
+    def submit(
+        self,
+        device: models.Device,
+        rts_id: str,
+        kind: CommandKind,
+        target: Optional[models.Position] = None,
+    ) -> models.Command:
+        """
+        This function queues a command for an RTS and returns immediately.
+
+        Args:
+            device (models.Device): The device the RTS is connected to
+            rts_id (str): The ID of the RTS
+            kind (CommandKind): The command
+            target (Optional[models.Position]): The target position of a Turn To
+                Target command
+
+        Returns:
+            models.Command: The queued command, or the queued command it has been
+                coalesced with
+        """
+        loop = self._ensure_running()
+        key = (device_key(device), str(rts_id))
+        command = models.Command(
+            id=uuid.uuid4().hex,
+            kind=kind.value,
+            device_id=device.id,
+            rts_id=str(rts_id),
+            target=target,
+            submitted=time.time(),
+        )
+
+        with self._lock:
+            pending = self._pending.setdefault(key, deque())
+            queued = self._coalesce(pending, command)
+
+            if queued is command:
+                pending.append(command)
+            else:
+                logger.info("Coalesced %s for RTS %s", kind.value, rts_id)
+
+            self._last[key] = queued
+            start = key not in self._running and bool(pending)
+
+            if start:
+                self._running.add(key)
+
+        if start:
+            asyncio.run_coroutine_threadsafe(self._drain(key, device), loop)
+
+        poller.notify_change()
+        return queued
+
+    async def _execute(self, device: models.Device, command: models.Command) -> bool:
+        if command.kind == CommandKind.TURN_TO_TARGET:
+            return await async_api.turn_to_target(
+                device, command.rts_id, target_position=command.target
+            )
+
+        return await API_FUNCTIONS[CommandKind(command.kind)](device, command.rts_id)
+
+    async def _drain(self, key: tuple[str, str], device: models.Device) -> None:
+        while True:
+            with self._lock:
+                pending = self._pending.get(key)
+
+                if not pending:
+                    self._pending.pop(key, None)
+                    self._running.discard(key)
+                    return
+
+                command = pending.popleft()
+                command.state = CommandState.RUNNING.value
+                command.started = time.time()
+                self._last[key] = command
+
+            poller.notify_change()
+
+            try:
+                success = await self._execute(device, command)
+            except Exception:
+                logger.exception("Command %s failed", command.kind)
+                success = False
+
+            if not success:
+                logger.error("API request to device failed.")
+            elif command.kind == CommandKind.REMOVE:
+                # Before waiters are notified, so that they see the RTS removed
+                inventory.invalidate(device)
+
+            with self._lock:
+                self._finish(
+                    command, CommandState.DONE if success else CommandState.FAILED
+                )
+
+            poller.poke(device=device, rts_id=command.rts_id)
+            poller.notify_change()
+
+    async def wait(self, command: models.Command) -> models.Command:
+        """
+        This function waits until a command has finished or has been cancelled. It
+        must be awaited on the event loop of the command queue, see `schedule`.
+
+        Args:
+            command (models.Command): The command returned by `submit`
+
+        Returns:
+            models.Command: The finished command
+        """
+        with self._lock:
+            if command.finished is not None:
+                return command
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.setdefault(command.id, []).append(waiter)
+
+        await waiter
+        return command
+
+    def get_last(
+        self, device: models.DeviceCreate, rts_id: str
+    ) -> Optional[models.Command]:
+        with self._lock:
+            return self._last.get((device_key(device), str(rts_id)))
+
+    def get_pending(self, device: models.DeviceCreate, rts_id: str) -> int:
+        with self._lock:
+            return len(self._pending.get((device_key(device), str(rts_id)), ()))
+
+
+def _set_done(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+commands = CommandQueue()
+
+
+def command_view(device: models.DeviceCreate, rts_id: str) -> str:
+    """
+    This function returns the status of the last command of an RTS as displayed in
+    its list item.
+
+    Args:
+        device (models.DeviceCreate): The device the RTS is connected to
+        rts_id (str): The ID of the RTS
+
+    Returns:
+        str: The status of the last command
+    """
+    command = commands.get_last(device, rts_id)
+
+    if command is None:
+        return ""
+
+    pending = commands.get_pending(device, rts_id)
+    text = f"{command.kind}: {command.state}"
+
+    if command.state in (CommandState.DONE.value, CommandState.FAILED.value):
+        text += f" after {command.latency * 1000:.0f} ms"
+
+    if pending:
+        text += f", {pending} queued"
+
+    return text
@@ -13,3 +13,28 @@ def invalid_input_alert(alert_id: str) -> html.Div:
             duration=4000,
         )
     )
+
+
+def broadcast_alert(alert_id: str) -> html.Div:
+    return html.Div(
+        dbc.Alert(
+            children=[],
+            color="info",
+            dismissable=True,
+            is_open=False,
+            id=alert_id,
+        )
+    )
+
+
+def broadcast_queued_content(action: str, num_devices: int) -> list:
+    return [
+        html.P(
+            f"{action} queued for all RTS of {num_devices} devices.",
+            className="mb-1",
+        ),
+        html.P(
+            "The result of each RTS is shown in the RTS list.",
+            className="mb-0",
+        ),
+    ]
@@ -1,30 +1,92 @@
 import logging
+import math
+from typing import Optional
+from urllib.parse import quote
 
 import dash_bootstrap_components as dbc
-from dash import html, dcc
+from dash import dcc, html
+
+from app import config, models
 from app.components import ids
-from app import models
 
 logger = logging.getLogger("root")
 
 
-def create_device_list() -> dbc.ListGroup:
-    return dbc.ListGroup(children=[], id=ids.DEVICE_LIST)
+def create_device_list() -> html.Div:
+    return html.Div(
+        [
+            dcc.Interval(
+                id=ids.DEVICE_STATUS_INTERVAL,
+                interval=int(config.DEVICE_STATUS_FAST_INTERVAL * 1000),
+                n_intervals=0,
+            ),
+            dbc.ListGroup(children=[], id=ids.DEVICE_LIST),
+        ]
+    )
+
+
+SPARKLINE_WIDTH = 60
+SPARKLINE_HEIGHT = 16
+EMPTY_SPARKLINE = "data:image/svg+xml," + quote(
+    f'<svg xmlns="http://www.w3.org/2000/svg" width="{SPARKLINE_WIDTH}" '
+    f'height="{SPARKLINE_HEIGHT}"/>'
+)
+
+
+def render_rtt_sparkline(values: list[float]) -> str:
+    """
+    This function renders the round-trip times of a device as a small line chart.
+
+    Failed probes (NaN) interrupt the line. The chart is returned as an SVG data
+    URI, so that it can be used as the source of an image without an extra request.
+
+    Args:
+        values (list[float]): The round-trip times in seconds, oldest first
+
+    Returns:
+        str: The data URI of the SVG image
+    """
+    finite = [value for value in values if not math.isnan(value)]
+
+    if len(values) < 2 or not finite:
+        return EMPTY_SPARKLINE
+
+    scale = (SPARKLINE_HEIGHT - 2) / (max(finite) or 1.0)
+    step = SPARKLINE_WIDTH / (len(values) - 1)
+    path = []
+    command = "M"
+
+    for i, value in enumerate(values):
+        if math.isnan(value):
+            command = "M"
+            continue
+
+        y = SPARKLINE_HEIGHT - 1 - value * scale
+        path.append(f"{command}{i * step:.1f},{y:.1f}")
+        command = "L"
+
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SPARKLINE_WIDTH}" '
+        f'height="{SPARKLINE_HEIGHT}"><path d="{" ".join(path)}" fill="none" '
+        'stroke="#0d6efd" stroke-width="1.5"/></svg>'
+    )
+    return "data:image/svg+xml," + quote(svg)
+
+
+def format_rtt_stats(stats: Optional[models.RTTStats]) -> str:
+    if stats is None:
+        return "RTT -"
+
+    return (
+        f"p50 {stats.p50 * 1000:.0f} ms · p95 {stats.p95 * 1000:.0f} ms · "
+        f"jitter {stats.jitter * 1000:.0f} ms"
+    )
 
 
 def render_device(device: models.Device) -> html.Div:
     device_item = html.Div(
         className="list-item-container",
         children=[
-            dcc.Interval(
-                id={
-                    "type": "device-status-interval",
-                    "device_id": device.id,
-                },
-                interval=1000,
-                n_intervals=0,
-            ),
-            dcc.Store(id={"type": "device-status-changed", "device_id": device.id}),
             html.Div(
                 className="item-left-section",
                 children=[
@@ -68,7 +130,25 @@ def render_device(device: models.Device) -> html.Div:
                             ),
                         ],
                         className="item-status-row",
-                    )
+                    ),
+                    html.Div(
+                        [
+                            html.Img(
+                                className="item-rtt-sparkline",
+                                src=EMPTY_SPARKLINE,
+                                id={
+                                    "type": "device-rtt-sparkline",
+                                    "device_id": device.id,
+                                },
+                            ),
+                            html.Small(
+                                format_rtt_stats(None),
+                                className="item-rtt",
+                                id={"type": "device-rtt", "device_id": device.id},
+                            ),
+                        ],
+                        className="item-rtt-row",
+                    ),
                 ],
             ),
             html.Div(
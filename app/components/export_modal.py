@@ -0,0 +1,85 @@
+import logging
+
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+
+from app.components import ids
+
+logger = logging.getLogger("root")
+
+
+def compression_select() -> dbc.Select:
+    return dbc.Select(
+        id=ids.EXPORT_COMPRESSION,
+        options=[
+            {"label": "No compression", "value": 0},
+            {"label": "Fast", "value": 1},
+            {"label": "Default", "value": 6},
+            {"label": "Best", "value": 9},
+        ],
+        value=6,
+    )
+
+
+def export_form() -> html.Form:
+    # The selection is posted, since it can exceed the maximum length of a URL
+    return html.Form(
+        [
+            dcc.Input(id=ids.EXPORT_SELECTION, type="hidden", name="logs", value=""),
+            dcc.Input(id=ids.EXPORT_LEVEL, type="hidden", name="level", value=6),
+            dbc.Button(
+                "Download",
+                id=ids.EXPORT_DOWNLOAD,
+                type="submit",
+                disabled=True,
+                style={"margin-right": "5px"},
+            ),
+        ],
+        id=ids.EXPORT_FORM,
+        method="POST",
+        className="ms-auto",
+    )
+
+
+def create_export_modal() -> html.Div:
+    return html.Div(
+        [
+            dbc.Modal(
+                [
+                    dbc.ModalHeader(dbc.ModalTitle("Export Logs")),
+                    dbc.ModalBody(
+                        [
+                            dbc.Label("Compression"),
+                            compression_select(),
+                            dbc.Label("Logs", className="mt-3"),
+                            dcc.Loading(
+                                dbc.Checklist(
+                                    id=ids.EXPORT_LOG_CHECKLIST,
+                                    options=[],
+                                    value=[],
+                                    className="export-log-checklist",
+                                )
+                            ),
+                        ]
+                    ),
+                    dbc.ModalFooter(
+                        children=html.Div(
+                            [
+                                export_form(),
+                                dbc.Button(
+                                    "Close",
+                                    id=ids.CLOSE_EXPORT_MODAL_BUTTON,
+                                    className="ms-auto",
+                                    n_clicks=0,
+                                ),
+                            ],
+                            className="modal-footer-buttons",
+                        ),
+                    ),
+                ],
+                id=ids.EXPORT_MODAL,
+                is_open=False,
+                scrollable=True,
+            ),
+        ]
+    )
@@ -21,6 +21,7 @@ CLOSE_RTS_MODAL_BUTTON = "close-rts-modal-button"
 RTS_MODAL = "rts-modal"
 
 DEVICE_LIST = "device-list"
+DEVICE_STATUS_INTERVAL = "device-status-interval"
 RTS_LIST = "rts-list"
 
 INVALID_DEVICE_INPUT_ALERT = "invalid-input-alert"
@@ -28,8 +29,19 @@ INVALID_RTS_INPUT_ALERT = "invalid-rts-input-alert"
 INVALID_SETTINGS_INPUT_ALERT = "invalid-settings-input-alert"
 INVALID_SCAN_INPUT_ALERT = "invalid-scan-input-alert"
 
+OPEN_EXPORT_MODAL_BUTTON = "open-export-modal-button"
+CLOSE_EXPORT_MODAL_BUTTON = "close-export-modal-button"
+EXPORT_MODAL = "export-modal"
+EXPORT_LOG_CHECKLIST = "export-log-checklist"
+EXPORT_COMPRESSION = "export-compression"
+EXPORT_DOWNLOAD = "export-download"
+EXPORT_FORM = "export-form"
+EXPORT_SELECTION = "export-selection"
+EXPORT_LEVEL = "export-level"
+
 START_ALL_BUTTON = "start-all-button"
 STOP_ALL_BUTTON = "stop-all-button"
+BROADCAST_ALERT = "broadcast-alert"
 
 DUMMY_OUTPUT = "dummy-output"
 
@@ -54,12 +66,16 @@ RTS_POWER_SEARCH_ENABLED = "rts-power-search-enabled"
 ACTIVE_RTS = "active-rts"
 ACTIVE_DEVICE = "active-device"
 
-LOG_DOWNLOAD = "log-download"
 LOG_DROPDOWN = "log-dropdown"
 DOWNLOAD_LOG = "download-log"
 DELETE_LOG = "delete-log"
 CLOSE_LOG_MODAL_BUTTON = "close-log-modal-button"
 LOG_MODAL = "log-modal"
+LOG_SUMMARY = "log-summary"
+LOG_SUMMARY_INTERVAL = "log-summary-interval"
+LOG_PREVIEW = "log-preview"
+LOG_PREVIEW_INFO = "log-preview-info"
+LOG_PREVIEW_INTERVAL = "log-preview-interval"
 
 CURRENT_TARGET_POSITION = "current-target-position"
 CURRENT_TARGET_RTS = "current-target-rts"
@@ -70,4 +86,11 @@ CLOSE_SCAN_MODAL_BUTTON = "close-scan-modal-button"
 NETWORK_INPUT = "network-input"
 NETWORK_PORT_INPUT = "network-port-input"
 OPEN_SCAN_MODAL_BUTTON = "open-scan-modal-button"
-SCAN_DEVICE_LOADING = "scan-device-loading"
+SCAN_PROGRESS = "scan-progress"
+SCAN_JOB = "scan-job"
+SCAN_INTERVAL = "scan-interval"
+
+TRAJECTORY_GRAPH = "trajectory-graph"
+TRAJECTORY_DROPDOWN = "trajectory-dropdown"
+TRAJECTORY_STATE = "trajectory-state"
+TRAJECTORY_INTERVAL = "trajectory-interval"
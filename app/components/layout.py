@@ -2,20 +2,24 @@ import dash_bootstrap_components as dbc
 from dash import dcc, html
 
 from app.components import ids
+from app.components.alert import broadcast_alert
 from app.components.device import create_device_list
 from app.components.device_modal import device_form_modal
+from app.components.export_modal import create_export_modal
 from app.components.log_modal import create_log_modal
 from app.components.rts import rts_listgroup
 from app.components.rts_modal import rts_form_modal
 from app.components.scan_modal import network_form_modal
 from app.components.settings_modal import create_settings_modal
+from app.components.trajectory import create_trajectory_section
+from app.registry import registry
 
 
 def create_layout() -> html.Div:
     return html.Div(
         className="app-container",
         children=[
-            dcc.Store(id=ids.DEVICE_STORAGE, storage_type="session", data={}),
+            dcc.Store(id=ids.DEVICE_STORAGE, data=registry.ids()),
             dcc.Store(id=ids.RTS_POSITION_STORAGE, storage_type="session"),
             dcc.Store(id=ids.ACTIVE_RTS),
             dcc.Store(id=ids.ACTIVE_DEVICE),
@@ -127,6 +131,7 @@ def create_content() -> html.Div:
             create_device_list(),
             create_settings_modal(),
             create_log_modal(),
+            create_export_modal(),
             network_form_modal(),
             html.Div(className="tab-divider"),
             html.P("", id=ids.DUMMY_OUTPUT, style={"display": "none"}),
@@ -154,10 +159,19 @@ def create_content() -> html.Div:
                                 color="primary",
                                 outline=True,
                             ),
+                            dbc.Button(
+                                "Export Logs",
+                                id=ids.OPEN_EXPORT_MODAL_BUTTON,
+                                color="primary",
+                                outline=True,
+                            ),
                         ]
                     ),
                 ],
             ),
+            broadcast_alert(ids.BROADCAST_ALERT),
             rts_listgroup(),
+            html.Div(className="tab-divider"),
+            create_trajectory_section(),
         ],
     )
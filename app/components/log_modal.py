@@ -1,9 +1,11 @@
 import logging
+from datetime import datetime, timedelta
 
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
 from app.components import ids
+from app.logparser import LogSummary
 
 logger = logging.getLogger("root")
 
@@ -14,7 +16,24 @@ def create_log_modal() -> html.Div:
             dbc.Modal(
                 [
                     dbc.ModalHeader(dbc.ModalTitle("Log Download")),
-                    dbc.ModalBody(dcc.Dropdown(id=ids.LOG_DROPDOWN, options=[])),
+                    dbc.ModalBody(
+                        [
+                            dcc.Dropdown(id=ids.LOG_DROPDOWN, options=[]),
+                            html.Div(id=ids.LOG_SUMMARY, className="log-summary"),
+                            dcc.Interval(
+                                id=ids.LOG_SUMMARY_INTERVAL,
+                                interval=1000,
+                                disabled=True,
+                            ),
+                            html.Pre(id=ids.LOG_PREVIEW, className="log-preview"),
+                            html.Small(id=ids.LOG_PREVIEW_INFO),
+                            dcc.Interval(
+                                id=ids.LOG_PREVIEW_INTERVAL,
+                                interval=2000,
+                                disabled=True,
+                            ),
+                        ]
+                    ),
                     dbc.ModalFooter(
                         children=html.Div(
                             [
@@ -22,7 +41,8 @@ def create_log_modal() -> html.Div:
                                     "Download",
                                     id=ids.DOWNLOAD_LOG,
                                     className="ms-auto",
-                                    n_clicks=0,
+                                    external_link=True,
+                                    disabled=True,
                                     style={"margin-right": "5px"},
                                 ),
                                 dbc.Button(
@@ -42,10 +62,28 @@ def create_log_modal() -> html.Div:
                             className="modal-footer-buttons",
                         ),
                     ),
-                    dcc.Download(id=ids.LOG_DOWNLOAD),
                 ],
                 id=ids.LOG_MODAL,
                 is_open=False,
+                size="lg",
             ),
         ]
     )
+
+
+def log_summary_table(summary: LogSummary) -> dbc.Table:
+    rows = [
+        ("Positions", f"{summary.count}"),
+        ("Start", datetime.fromtimestamp(summary.start).strftime("%Y-%m-%d %H:%M:%S")),
+        ("Duration", str(timedelta(seconds=round(summary.duration)))),
+        ("Rate", f"{summary.rate:.2f} Hz"),
+        ("Gaps", f"{summary.gaps}"),
+        ("Longest Gap", f"{summary.longest_gap:.2f} s"),
+    ]
+    return dbc.Table(
+        html.Tbody(
+            [html.Tr([html.Td(label), html.Td(value)]) for label, value in rows]
+        ),
+        size="sm",
+        borderless=True,
+    )
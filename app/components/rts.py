@@ -3,7 +3,7 @@ import logging
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
-from app import models
+from app import config, models
 from app.components import ids
 
 logger = logging.getLogger("root")
@@ -13,7 +13,9 @@ def rts_listgroup() -> list[html.Div]:
     return dbc.ListGroup(children=[], id=ids.RTS_LIST)
 
 
-def render_rts(rts: models.RTS_API, device: models.Device) -> html.Div:
+def render_rts(
+    rts: models.RTS_API, device: models.Device, following: bool = False
+) -> html.Div:
     return html.Div(
         className="list-item-container",
         children=[
@@ -96,12 +98,40 @@ def render_rts(rts: models.RTS_API, device: models.Device) -> html.Div:
                                     "rts_id": rts.id,
                                     "device_id": device.id,
                                 },
-                                interval=1000,
+                                interval=int(config.POLL_INTERVAL * 1000),
                                 n_intervals=0,
+                                disabled=config.PUSH_UPDATES,
                             ),
                         ],
                         className="item-status-row",
                     ),
+                    html.Div(
+                        [
+                            html.P(
+                                "Follow Target",
+                                className="item-status-label",
+                            ),
+                            dbc.Switch(
+                                value=following,
+                                className="item-follow-switch",
+                                id={
+                                    "type": "rts-follow-switch",
+                                    "rts_id": rts.id,
+                                    "device_id": device.id,
+                                },
+                            ),
+                        ],
+                        className="item-status-row",
+                    ),
+                    html.Small(
+                        "",
+                        className="item-command-status",
+                        id={
+                            "type": "rts-command-status",
+                            "rts_id": rts.id,
+                            "device_id": device.id,
+                        },
+                    ),
                 ],
             ),
             html.Div(className="item-divider"),
@@ -169,6 +199,14 @@ def rts_actions(rts_id: int, device_id: int) -> html.Div:
                             "device_id": device_id,
                         },
                     ),
+                    dbc.Button(
+                        "Trajectory",
+                        id={
+                            "type": "rts-trajectory",
+                            "rts_id": rts_id,
+                            "device_id": device_id,
+                        },
+                    ),
                     dbc.DropdownMenu(
                         [
                             dbc.DropdownMenuItem(
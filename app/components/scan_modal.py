@@ -1,7 +1,7 @@
 import logging
 
 import dash_bootstrap_components as dbc
-from dash import html, dcc
+from dash import dcc, html
 
 from app.components import ids
 from app.components.alert import invalid_input_alert
@@ -34,11 +34,15 @@ def create_network_form() -> html.Div:
                         [dbc.Label("Network", width="auto"), network_input()],
                         className="me-3",
                     ),
-                    dcc.Loading(children=[], id=ids.SCAN_DEVICE_LOADING),
                     html.Div(
                         [dbc.Label("Port", width="auto"), port_input()],
                         className="me-3",
                     ),
+                    dbc.Progress(
+                        value=0, id=ids.SCAN_PROGRESS, className="mt-3", striped=True
+                    ),
+                    dcc.Store(id=ids.SCAN_JOB),
+                    dcc.Interval(id=ids.SCAN_INTERVAL, interval=500, disabled=True),
                 ]
             ),
         ]
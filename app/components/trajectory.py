@@ -0,0 +1,32 @@
+import dash_bootstrap_components as dbc
+from dash import dcc, html
+
+from app.components import ids
+from app.trajectory import ALL_RTS
+
+
+def create_trajectory_section() -> html.Div:
+    return html.Div(
+        className="trajectory-section",
+        children=[
+            html.Div(
+                className="tab-header-group",
+                children=[
+                    html.P("Trajectory", className="plot-label"),
+                    dbc.Select(
+                        id=ids.TRAJECTORY_DROPDOWN,
+                        options=[{"label": "All RTS", "value": ALL_RTS}],
+                        value=ALL_RTS,
+                        className="trajectory-dropdown",
+                    ),
+                ],
+            ),
+            dcc.Graph(
+                id=ids.TRAJECTORY_GRAPH,
+                className="trajectory-graph",
+                config={"displaylogo": False},
+            ),
+            dcc.Store(id=ids.TRAJECTORY_STATE),
+            dcc.Interval(id=ids.TRAJECTORY_INTERVAL, interval=1000, n_intervals=0),
+        ],
+    )
@@ -0,0 +1,84 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Device connection pool
+POOL_SIZE = int(os.getenv("RTS_DASHBOARD_POOL_SIZE", "4"))
+POOL_IDLE_TIMEOUT = float(os.getenv("RTS_DASHBOARD_POOL_IDLE_TIMEOUT", "300"))
+
+# Background status poller
+POLL_FAST_INTERVAL = float(os.getenv("RTS_DASHBOARD_POLL_FAST_INTERVAL", "0.2"))
+POLL_INTERVAL = float(os.getenv("RTS_DASHBOARD_POLL_INTERVAL", "1.0"))
+POLL_SLOW_INTERVAL = float(os.getenv("RTS_DASHBOARD_POLL_SLOW_INTERVAL", "5.0"))
+POLL_WATCH_TIMEOUT = float(os.getenv("RTS_DASHBOARD_POLL_WATCH_TIMEOUT", "10.0"))
+POLL_WORKERS = int(os.getenv("RTS_DASHBOARD_POLL_WORKERS", "8"))
+
+# Follow mode, which turns the selected RTS to the moving target
+FOLLOW_MIN_DISTANCE = float(os.getenv("RTS_DASHBOARD_FOLLOW_MIN_DISTANCE", "0.5"))
+FOLLOW_MIN_INTERVAL = float(os.getenv("RTS_DASHBOARD_FOLLOW_MIN_INTERVAL", "2.0"))
+
+# Position history of each RTS
+HISTORY_MAX_POINTS = int(os.getenv("RTS_DASHBOARD_HISTORY_MAX_POINTS", "100000"))
+HISTORY_MAX_MB = float(os.getenv("RTS_DASHBOARD_HISTORY_MAX_MB", "0"))
+
+# Local copies of recorded logs
+LOG_CACHE_DIR = os.getenv("RTS_DASHBOARD_LOG_CACHE", "data/logs")
+LOG_CACHE_MAX_MB = float(os.getenv("RTS_DASHBOARD_LOG_CACHE_MAX_MB", "1024"))
+
+# Log preview
+LOG_PREVIEW_KB = int(os.getenv("RTS_DASHBOARD_LOG_PREVIEW_KB", "8"))
+
+# Bulk log export
+EXPORT_WORKERS = int(os.getenv("RTS_DASHBOARD_EXPORT_WORKERS", "4"))
+
+# Trajectory plot
+PLOT_MAX_POINTS = int(os.getenv("RTS_DASHBOARD_PLOT_MAX_POINTS", "2000"))
+
+# Device status checks
+DEVICE_STATUS_FAST_INTERVAL = float(
+    os.getenv("RTS_DASHBOARD_DEVICE_STATUS_FAST_INTERVAL", "1.0")
+)
+DEVICE_STATUS_SLOW_INTERVAL = float(
+    os.getenv("RTS_DASHBOARD_DEVICE_STATUS_SLOW_INTERVAL", "10.0")
+)
+DEVICE_RTT_SAMPLES = int(os.getenv("RTS_DASHBOARD_DEVICE_RTT_SAMPLES", "60"))
+
+# Push RTS status updates to the browser via Server-Sent Events
+PUSH_UPDATES = os.getenv("RTS_DASHBOARD_PUSH_UPDATES", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Status and inventory cache shared between gunicorn workers
+SHARED_CACHE = os.getenv("RTS_DASHBOARD_SHARED_CACHE", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+SHARED_CACHE_PATH = os.getenv("RTS_DASHBOARD_SHARED_CACHE_PATH", "data/shared-cache.db")
+LEADER_LEASE = float(os.getenv("RTS_DASHBOARD_LEADER_LEASE", "10.0"))
+
+# Start All / Stop All
+BROADCAST_WORKERS = int(os.getenv("RTS_DASHBOARD_BROADCAST_WORKERS", "32"))
+
+# RTS inventory cache
+INVENTORY_TTL = float(os.getenv("RTS_DASHBOARD_INVENTORY_TTL", "30.0"))
+
+# Network scan
+SCAN_CONCURRENCY = int(os.getenv("RTS_DASHBOARD_SCAN_CONCURRENCY", "256"))
+SCAN_TIMEOUT = float(os.getenv("RTS_DASHBOARD_SCAN_TIMEOUT", "0.5"))
+SCAN_MIN_PREFIX = int(os.getenv("RTS_DASHBOARD_SCAN_MIN_PREFIX", "22"))
+SCAN_JOB_TTL = float(os.getenv("RTS_DASHBOARD_SCAN_JOB_TTL", "300"))
+
+# Circuit breaker for unreachable devices
+BREAKER_FAILURE_THRESHOLD = int(
+    os.getenv("RTS_DASHBOARD_BREAKER_FAILURE_THRESHOLD", "3")
+)
+BREAKER_BASE_BACKOFF = float(os.getenv("RTS_DASHBOARD_BREAKER_BASE_BACKOFF", "2.0"))
+BREAKER_MAX_BACKOFF = float(os.getenv("RTS_DASHBOARD_BREAKER_MAX_BACKOFF", "60.0"))
+
+# Device registry
+DATABASE_PATH = os.getenv("RTS_DASHBOARD_DATABASE", "data/rts-dashboard.db")
@@ -0,0 +1,275 @@
+import csv
+import io
+import logging
+import re
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Iterator, NamedTuple, Optional
+
+from app import api, config, models
+from app.inventory import inventory
+from app.registry import registry
+from app.sessions import session_pool
+from app.utils import DeviceNotFound
+
+logger = logging.getLogger("root")
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_FIELDS = [
+    "device",
+    "ip",
+    "port",
+    "rts_id",
+    "rts_name",
+    "log_id",
+    "log_name",
+    "path",
+    "active",
+    "size",
+    "compressed_size",
+    "status",
+]
+
+
+class ExportEntry(NamedTuple):
+    device: models.Device
+    rts: models.RTS_API
+    log: models.Log
+
+    @property
+    def value(self) -> str:
+        return f"{self.device.id}:{self.rts.id}:{self.log.id}"
+
+    @property
+    def archive_name(self) -> str:
+        name = self.log.path.rsplit("/", 1)[-1] or f"{self.log.name}.txt"
+        parts = [self.device.name, self.rts.name, f"{self.log.id}_{name}"]
+        return "/".join(re.sub(r"[^A-Za-z0-9_.-]", "_", part) for part in parts)
+
+
+class _ZipStream:
+    """
+    Write-only file object that collects the bytes written by zipfile, so that they
+    can be forwarded to the response. It does not support tell and seek, which
+    makes zipfile write data descriptors instead of seeking back to the headers.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def list_logs(
+    devices: list[models.Device], max_workers: int = config.EXPORT_WORKERS
+) -> list[ExportEntry]:
+    """
+    This function lists the logs of all RTS of the given devices concurrently.
+
+    Args:
+        devices (list[models.Device]): The devices
+        max_workers (int): The maximum number of parallel requests
+
+    Returns:
+        list[ExportEntry]: The logs with their device and RTS
+    """
+    if not devices:
+        return []
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="log-export"
+    ) as executor:
+        rts_lists = executor.map(inventory.get_rts, devices)
+        all_rts = [
+            (device, rts)
+            for device, rts_list in zip(devices, rts_lists)
+            for rts in rts_list
+        ]
+        log_lists = executor.map(
+            lambda device_rts: api.get_logs(device_rts[0], device_rts[1].id), all_rts
+        )
+
+        return [
+            ExportEntry(device=device, rts=rts, log=log)
+            for (device, rts), log_list in zip(all_rts, log_lists)
+            for log in log_list
+        ]
+
+
+def get_entries(values: list[str]) -> list[ExportEntry]:
+    """
+    This function returns the logs for the given selection.
+
+    Args:
+        values (list[str]): The selected logs as "<device_id>:<rts_id>:<log_id>"
+
+    Returns:
+        list[ExportEntry]: The selected logs that still exist in the selected order
+    """
+    devices = {}
+
+    for value in values:
+        try:
+            device_id = int(value.split(":", 1)[0])
+            devices[device_id] = registry.get(device_id)
+        except (ValueError, DeviceNotFound):
+            logger.warning("Skipping unknown log %s", value)
+
+    entries = {entry.value: entry for entry in list_logs(list(devices.values()))}
+    return [entries[value] for value in values if value in entries]
+
+
+def _download(entry: ExportEntry) -> Optional[IO[bytes]]:
+    # Limit the downloads from each device across all exports to its pool size
+    with session_pool.limit(entry.device):
+        response = api.stream_log(device=entry.device, log_id=entry.log.id)
+
+        if response is None:
+            return None
+
+        # Spool to disk so that large logs are not kept in memory
+        file = tempfile.TemporaryFile()
+
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                file.write(chunk)
+        except Exception:
+            file.close()
+            raise
+        finally:
+            response.close()
+
+    file.seek(0)
+    return file
+
+
+def _zip_info(name: str, compression: int, compresslevel: int) -> zipfile.ZipInfo:
+    # ZipFile.open ignores the compression level of the archive for a ZipInfo
+    info = zipfile.ZipInfo(name)
+    info.compress_type = compression
+
+    if sys.version_info >= (3, 13):
+        info.compress_level = compresslevel or None
+    else:
+        info._compresslevel = compresslevel or None
+
+    return info
+
+
+def stream_archive(
+    entries: list[ExportEntry],
+    compresslevel: int = 6,
+    max_workers: int = config.EXPORT_WORKERS,
+) -> Iterator[bytes]:
+    """
+    This function yields a ZIP archive of the given logs while it is written.
+
+    The logs are downloaded from the devices concurrently into temporary files and
+    added to the archive in the given order as soon as they are available. At most
+    as many logs as the connection pool size are downloaded from each device at the
+    same time, also across concurrent exports. Each log is copied into the archive
+    in chunks, so that neither the logs nor the archive are kept in memory. A
+    manifest.csv with the device, RTS, log and sizes of each log is added at the
+    end.
+
+    Args:
+        entries (list[ExportEntry]): The logs to export
+        compresslevel (int): The deflate compression level from 1 to 9, or 0 to
+            store the logs uncompressed
+        max_workers (int): The maximum number of parallel downloads
+
+    Yields:
+        bytes: The next part of the archive
+    """
+    stream = _ZipStream()
+    compression = zipfile.ZIP_DEFLATED if compresslevel > 0 else zipfile.ZIP_STORED
+    executor = ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="log-export"
+    )
+    futures: list[Future] = [executor.submit(_download, entry) for entry in entries]
+    manifest = []
+
+    try:
+        with zipfile.ZipFile(
+            stream,
+            mode="w",
+            compression=compression,
+            compresslevel=compresslevel or None,
+        ) as archive:
+            for entry, future in zip(entries, futures):
+                row = {
+                    "device": entry.device.name,
+                    "ip": entry.device.ip,
+                    "port": entry.device.port,
+                    "rts_id": entry.rts.id,
+                    "rts_name": entry.rts.name,
+                    "log_id": entry.log.id,
+                    "log_name": entry.log.name,
+                    "path": entry.log.path,
+                    "active": entry.log.active,
+                    "size": 0,
+                    "compressed_size": 0,
+                    "status": "failed",
+                }
+                manifest.append(row)
+
+                try:
+                    file = future.result()
+                except Exception:
+                    logger.exception("Failed to download log %s", entry.log.id)
+                    continue
+
+                if file is None:
+                    logger.error("Failed to download log %s", entry.log.id)
+                    continue
+
+                info = _zip_info(entry.archive_name, compression, compresslevel)
+
+                with file, archive.open(info, mode="w", force_zip64=True) as dest:
+                    while chunk := file.read(CHUNK_SIZE):
+                        dest.write(chunk)
+                        if data := stream.pop():
+                            yield data
+
+                row.update(
+                    size=info.file_size,
+                    compressed_size=info.compress_size,
+                    status="ok",
+                )
+                if data := stream.pop():
+                    yield data
+
+            text = io.StringIO()
+            writer = csv.DictWriter(text, fieldnames=MANIFEST_FIELDS)
+            writer.writeheader()
+            writer.writerows(manifest)
+            archive.writestr("manifest.csv", text.getvalue())
+
+        if data := stream.pop():
+            yield data
+
+        logger.info(
+            "Exported %i of %i logs",
+            sum(row["status"] == "ok" for row in manifest),
+            len(entries),
+        )
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in futures:
+            if future.done() and not future.cancelled() and not future.exception():
+                file = future.result()
+                if file is not None:
+                    file.close()
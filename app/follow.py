@@ -0,0 +1,196 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from app import config, models
+from app.commands import CommandKind, commands
+from app.poller import Poller, poller
+from app.sessions import device_key
+from app.shared import SharedCache, shared_cache
+
+logger = logging.getLogger("root")
+
+
+def position_to_array(position: dict) -> np.ndarray:
+    return np.array(
+        [float(position["pos_x"]), float(position["pos_y"]), float(position["pos_z"])]
+    )
+
+
+class Follower:
+    """
+    Server-side follow mode that keeps selected RTS aimed at the target.
+
+    Whenever the status snapshot of the poller changes, the newest target position
+    is compared to the position each following RTS was last turned to. If the
+    prism has moved more than `min_distance` meters since then, a Turn To Target
+    is queued for the RTS, at most once every `min_interval` seconds per RTS. This
+    keeps idle stations pointed at a moving prism, so that they can lock on to it
+    when the prism is handed over between stations. RTS that are tracking are not
+    turned, since they already follow the prism on their own.
+
+    If a shared cache is given, the selection is shared between the gunicorn
+    workers and only the worker whose poller is the leader sends the commands.
+    """
+
+    def __init__(
+        self,
+        min_distance: float = config.FOLLOW_MIN_DISTANCE,
+        min_interval: float = config.FOLLOW_MIN_INTERVAL,
+        source: Poller = poller,
+        store: Optional[SharedCache] = shared_cache,
+    ) -> None:
+        self.min_distance = min_distance
+        self.min_interval = min_interval
+        self.source = source
+        self.store = store
+        self._following: dict[tuple[str, str], models.Device] = {}
+        self._aimed: dict[tuple[str, str], tuple[np.ndarray, float]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_running(self) -> None:
+        # Concurrent callbacks must not start a second follower thread
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="rts-follower", daemon=True
+            )
+            self._thread.start()
+
+    def set_following(
+        self, device: models.Device, rts_id: str, following: bool
+    ) -> None:
+        """
+        This function turns the follow mode of an RTS on or off.
+
+        Args:
+            device (models.Device): The device the RTS is connected to
+            rts_id (str): The ID of the RTS
+            following (bool): Whether the RTS follows the target
+        """
+        key = (device_key(device), str(rts_id))
+
+        with self._lock:
+            if following:
+                self._following[key] = device
+            else:
+                self._following.pop(key, None)
+
+            self._aimed.pop(key, None)
+
+        if self.store is not None:
+            self.store.set_following(device, rts_id, following)
+
+        logger.info(
+            "%s following the target with RTS %s",
+            "Started" if following else "Stopped",
+            rts_id,
+        )
+
+        if following:
+            self._ensure_running()
+
+    def is_following(self, device: models.DeviceCreate, rts_id: str) -> bool:
+        key = (device_key(device), str(rts_id))
+
+        if self.store is not None:
+            following = self.store.get_following()
+
+            if following:
+                # The follower of the leader has to run, even if the follow mode
+                # has been turned on in another worker
+                self._ensure_running()
+
+            return key in following
+
+        with self._lock:
+            return key in self._following
+
+    def forget_device(self, device: models.DeviceCreate) -> None:
+        key = device_key(device)
+
+        with self._lock:
+            for rts_key in [k for k in self._following if k[0] == key]:
+                del self._following[rts_key]
+                self._aimed.pop(rts_key, None)
+
+    def _get_following(self) -> dict[tuple[str, str], models.Device]:
+        if self.store is not None:
+            following = self.store.get_following()
+
+            with self._lock:
+                self._following = following
+                for rts_key in [k for k in self._aimed if k not in following]:
+                    del self._aimed[rts_key]
+
+        with self._lock:
+            return dict(self._following)
+
+    def _follow(self) -> None:
+        following = self._get_following()
+
+        for (_, rts_id), device in following.items():
+            # Keep the followed RTS polled, even if no browser displays them
+            self.source.watch(device=device, rts_id=rts_id)
+
+        target = self.source.get_target_position()
+
+        if not self.source.is_leader or not float(target["timestamp"]):
+            return
+
+        position = position_to_array(target)
+        now = time.monotonic()
+
+        for rts_key, device in following.items():
+            status = self.source.get_status(device=device, rts_id=rts_key[1])
+
+            if status is None or not (status.connection or {}).get("connected"):
+                continue
+
+            if status.tracking is not None and status.tracking.get("active"):
+                continue
+
+            with self._lock:
+                aimed = self._aimed.get(rts_key)
+
+            if aimed is not None:
+                aimed_position, aimed_at = aimed
+
+                if now - aimed_at < self.min_interval:
+                    continue
+
+                if np.linalg.norm(position - aimed_position) <= self.min_distance:
+                    continue
+
+            commands.submit(
+                device=device,
+                rts_id=rts_key[1],
+                kind=CommandKind.TURN_TO_TARGET,
+                target=models.Position(
+                    east=position[0], north=position[1], up=position[2]
+                ),
+            )
+
+            with self._lock:
+                self._aimed[rts_key] = (position, now)
+
+    def _run(self) -> None:
+        version = -1
+
+        while True:
+            try:
+                self._follow()
+            except Exception:
+                logger.exception("Following the target failed")
+
+            # Rate-limited RTS are checked again once their interval has elapsed
+            version = self.source.wait_for_change(version, timeout=self.min_interval)
+
+
+follower = Follower()
@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+from app import api, async_api, config, models
+from app.breaker import BreakerState
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+
+class RTTSeries:
+    """
+    Bounded time series of the round-trip times of a single device.
+
+    Failed probes are stored as NaN, so that they show up as gaps in the series
+    but do not distort the statistics.
+    """
+
+    def __init__(self, max_samples: int = config.DEVICE_RTT_SAMPLES) -> None:
+        self._samples: deque[tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def append(self, timestamp: float, rtt: Optional[float]) -> None:
+        with self._lock:
+            self._samples.append((timestamp, np.nan if rtt is None else rtt))
+
+    def values(self) -> np.ndarray:
+        with self._lock:
+            return np.array([rtt for _, rtt in self._samples], dtype=np.float64)
+
+    def stats(self) -> Optional[models.RTTStats]:
+        """
+        This function computes rolling statistics of the stored round-trip times.
+
+        The jitter is the mean absolute difference between consecutive successful
+        probes.
+
+        Returns:
+            Optional[models.RTTStats]: The statistics or None if no probe succeeded
+        """
+        values = self.values()
+        values = values[~np.isnan(values)]
+
+        if not len(values):
+            return None
+
+        p50, p95 = np.percentile(values, [50, 95])
+        return models.RTTStats(
+            p50=float(p50),
+            p95=float(p95),
+            jitter=float(np.abs(np.diff(values)).mean()) if len(values) > 1 else 0.0,
+            count=len(values),
+        )
+
+
+class HealthChecker:
+    """
+    Aggregated reachability checks of all logging devices.
+
+    All devices are probed concurrently in a single pass from a background event
+    loop, so the duration of a pass is bounded by the slowest device instead of
+    growing with the number of devices. The reachability of each device is kept
+    until the next pass, and its round-trip time is appended to a bounded time
+    series per device. Passes requested while the last one
+    is younger than `max_age` seconds, e.g. by several browser tabs, return the
+    stored results, and concurrent requests wait for the pass that is running.
+    Devices whose requests are backing off after repeated connection failures are
+    not probed.
+    """
+
+    def __init__(self, max_age: float = config.DEVICE_STATUS_FAST_INTERVAL / 2) -> None:
+        self.max_age = max_age
+        self._health: dict[str, models.DeviceHealth] = {}
+        self._rtt: dict[str, RTTSeries] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=self._loop.run_forever, name="device-health", daemon=True
+            ).start()
+
+        return self._loop
+
+    async def _check_device(self, device: models.Device) -> models.DeviceHealth:
+        # A half-open breaker lets only its own probe through
+        if api.get_breaker_state(device) in (
+            BreakerState.OPEN,
+            BreakerState.HALF_OPEN,
+        ):
+            return models.DeviceHealth(state="backoff", timestamp=time.time())
+
+        start = time.perf_counter()
+        reachable = await async_api.validate_device_connection(device)
+        rtt = time.perf_counter() - start
+
+        return models.DeviceHealth(
+            state="success" if reachable else "error",
+            rtt=rtt if reachable else None,
+            timestamp=time.time(),
+        )
+
+    async def _check_all(
+        self, devices: list[models.Device]
+    ) -> list[models.DeviceHealth]:
+        return await asyncio.gather(*(self._check_device(device) for device in devices))
+
+    def check(self, devices: list[models.Device]) -> dict[str, models.DeviceHealth]:
+        """
+        This function probes the given devices concurrently, unless they have been
+        probed less than `max_age` seconds ago.
+
+        Args:
+            devices (list[models.Device]): The devices
+
+        Returns:
+            dict[str, models.DeviceHealth]: The health of each device keyed by
+                device key
+        """
+        keys = [device_key(device) for device in devices]
+
+        with self._check_lock:
+            with self._lock:
+                is_fresh = time.monotonic() - self._checked < self.max_age
+                health = {key: self._health.get(key) for key in keys}
+
+            if is_fresh and all(health.values()):
+                return health
+
+            results = asyncio.run_coroutine_threadsafe(
+                self._check_all(devices), self._get_loop()
+            ).result()
+
+            with self._lock:
+                self._health = dict(zip(keys, results))
+                self._checked = time.monotonic()
+                self._rtt = {key: self._rtt.get(key) or RTTSeries() for key in keys}
+
+                for key, result in self._health.items():
+                    # Devices in backoff have not been probed
+                    if result.state != "backoff":
+                        self._rtt[key].append(result.timestamp, result.rtt)
+
+                return dict(self._health)
+
+    def get(self, device: models.DeviceCreate) -> Optional[models.DeviceHealth]:
+        with self._lock:
+            return self._health.get(device_key(device))
+
+    def get_rtt(self, device: models.DeviceCreate) -> Optional[RTTSeries]:
+        with self._lock:
+            return self._rtt.get(device_key(device))
+
+
+health = HealthChecker()
@@ -0,0 +1,245 @@
+import logging
+import threading
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from app import config, models
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+# timestamp, pos_x, pos_y, pos_z
+NUM_FIELDS = 4
+BYTES_PER_POINT = NUM_FIELDS * np.dtype(np.float64).itemsize
+# Points allocated on the first append, the buffer then doubles up to its capacity
+INITIAL_POINTS = 1024
+
+
+class Trajectory(NamedTuple):
+    timestamp: np.ndarray
+    pos_x: np.ndarray
+    pos_y: np.ndarray
+    pos_z: np.ndarray
+
+
+def get_capacity(
+    max_points: int = config.HISTORY_MAX_POINTS,
+    max_megabytes: float = config.HISTORY_MAX_MB,
+) -> int:
+    """
+    This function returns the number of points a position history can hold.
+
+    Args:
+        max_points (int): The maximum number of points
+        max_megabytes (float): The maximum memory per history in MB, ignored if 0
+
+    Returns:
+        int: The capacity of a position history
+    """
+    if max_megabytes > 0:
+        max_points = min(max_points, int(max_megabytes * 1024**2) // BYTES_PER_POINT)
+
+    return max(1, max_points)
+
+
+class PositionHistory:
+    """
+    Fixed-capacity ring buffer of the positions recorded by a single RTS.
+
+    The positions are stored in one NumPy array with a row per field. The array is
+    allocated on the first append and doubled whenever it is full until it reaches
+    the capacity, so RTS that never track do not use memory and appending is O(1)
+    amortized. Once the buffer is full at its capacity, the oldest position is
+    overwritten. Positions are only appended if they are newer than the last one,
+    which keeps the timestamps sorted and allows time windows to be sliced with a
+    binary search.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self._data = np.empty((NUM_FIELDS, 0), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        with self._lock:
+            if not self._size:
+                return None
+
+            return float(self._data[0, self._head - 1])
+
+    def append(self, position: dict) -> bool:
+        """
+        This function appends a position to the history.
+
+        Args:
+            position (dict): The position with timestamp, pos_x, pos_y and pos_z
+
+        Returns:
+            bool: True if the position was appended, False if it was not newer than
+                the last position
+        """
+        timestamp = float(position["timestamp"])
+
+        with self._lock:
+            if self._size and timestamp <= self._data[0, self._head - 1]:
+                return False
+
+            if self._size == self._data.shape[1] < self.capacity:
+                self._grow()
+
+            self._data[:, self._head] = (
+                timestamp,
+                float(position["pos_x"]),
+                float(position["pos_y"]),
+                float(position["pos_z"]),
+            )
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+        return True
+
+    def _grow(self) -> None:
+        # Must be called with the lock held, before the buffer has wrapped around
+        points = min(self.capacity, max(INITIAL_POINTS, 2 * self._data.shape[1]))
+        data = np.empty((NUM_FIELDS, points), dtype=np.float64)
+        data[:, : self._size] = self._data[:, : self._size]
+        self._data = data
+
+    def _segments(self) -> list[tuple[int, int]]:
+        # The ranges of the buffer in chronological order, without copying
+        if self._size < self.capacity:
+            return [(0, self._size)]
+
+        return [(self._head, self.capacity), (0, self._head)]
+
+    def window(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> Trajectory:
+        """
+        This function returns the positions recorded in the given time window in
+        chronological order.
+
+        Each of the at most two chronological segments of the ring buffer is
+        searched with a binary search, and only the positions within the window
+        are copied, so that the cost depends on the size of the window instead of
+        the capacity.
+
+        Args:
+            start (Optional[float]): The first timestamp to include, unbounded if None
+            end (Optional[float]): The last timestamp to include, unbounded if None
+
+        Returns:
+            Trajectory: Copies of the timestamps and coordinates
+        """
+        slices = []
+
+        with self._lock:
+            for begin, stop in self._segments():
+                timestamps = self._data[0, begin:stop]
+                first = (
+                    0
+                    if start is None
+                    else np.searchsorted(timestamps, start, side="left")
+                )
+                last = (
+                    len(timestamps)
+                    if end is None
+                    else np.searchsorted(timestamps, end, side="right")
+                )
+
+                if first < last:
+                    slices.append(self._data[:, begin + first : begin + last])
+
+            if not slices:
+                data = np.empty((NUM_FIELDS, 0), dtype=np.float64)
+            elif len(slices) == 1:
+                data = slices[0].copy()
+            else:
+                data = np.concatenate(slices, axis=1)
+
+        return Trajectory(*data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._head = 0
+            self._size = 0
+
+
+class HistoryStore:
+    """
+    Keeps the position history of each RTS.
+
+    The histories are fed by the background poller and survive the RTS no longer
+    being displayed, so that the trajectory is complete when it is shown again.
+    """
+
+    def __init__(self, capacity: Optional[int] = None) -> None:
+        self.capacity = capacity or get_capacity()
+        self._histories: dict[tuple[str, str], PositionHistory] = {}
+        self._lock = threading.Lock()
+
+    def get(self, device: models.DeviceCreate, rts_id: str) -> PositionHistory:
+        """
+        This function returns the position history of an RTS, creating an empty one
+        if it does not exist yet.
+
+        Args:
+            device (models.DeviceCreate): The device the RTS is connected to
+            rts_id (str): The ID of the RTS
+
+        Returns:
+            PositionHistory: The position history of the RTS
+        """
+        key = (device_key(device), str(rts_id))
+
+        with self._lock:
+            if key not in self._histories:
+                self._histories[key] = PositionHistory(self.capacity)
+
+            return self._histories[key]
+
+    def append(self, device: models.DeviceCreate, rts_id: str, position: dict) -> bool:
+        return self.get(device, rts_id).append(position)
+
+    def window(
+        self,
+        device: models.DeviceCreate,
+        rts_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Trajectory:
+        with self._lock:
+            position_history = self._histories.get((device_key(device), str(rts_id)))
+
+        # Reading the history of an RTS that never tracked does not create one
+        if position_history is None:
+            return Trajectory(*np.empty((NUM_FIELDS, 0), dtype=np.float64))
+
+        return position_history.window(start=start, end=end)
+
+    def forget_device(self, device: models.DeviceCreate) -> None:
+        """
+        This function drops the position histories of all RTS of the given device.
+
+        Args:
+            device (models.DeviceCreate): The device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            for rts_key in [k for k in self._histories if k[0] == key]:
+                del self._histories[rts_key]
+
+
+history = HistoryStore()
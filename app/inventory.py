@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from app import api, config, models
+from app.sessions import device_key
+from app.shared import SharedCache, shared_cache
+
+logger = logging.getLogger("root")
+
+
+class Inventory:
+    """
+    Cache of the RTS connected to each logging device.
+
+    The RTS of a device are fetched at most once per `ttl` seconds. Callbacks that
+    add or remove RTS invalidate the cache of the affected device, so that only
+    mutations trigger a refetch. If the RTS cannot be fetched, the last known RTS
+    of the device are returned and the failed request is not cached.
+
+    If a shared cache is given, the RTS are cached there instead, so that the RTS
+    fetched by one gunicorn worker are reused by all other workers until they
+    expire or are invalidated by any worker.
+    """
+
+    def __init__(
+        self,
+        ttl: float = config.INVENTORY_TTL,
+        store: Optional[SharedCache] = shared_cache,
+    ) -> None:
+        self.ttl = ttl
+        self.store = store
+        self._rts: dict[str, tuple[float, list[models.RTS_API]]] = {}
+        self._lock = threading.Lock()
+
+    def get_rts(self, device: models.Device) -> list[models.RTS_API]:
+        """
+        This function returns the RTS of the given device, either from the cache or
+        from the device if the cached entry is missing or expired.
+
+        Args:
+            device (models.Device): The device
+
+        Returns:
+            list[models.RTS_API]: The RTS of the device
+        """
+        if self.store is not None:
+            return self._get_shared_rts(device)
+
+        key = device_key(device)
+
+        with self._lock:
+            cached = self._rts.get(key)
+
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+
+        rts_list = api.get_rts(device)
+
+        if rts_list is None:
+            # Keep serving the last known RTS until the device responds again
+            return cached[1] if cached is not None else []
+
+        with self._lock:
+            self._rts[key] = (time.monotonic(), rts_list)
+
+        return rts_list
+
+    def _get_shared_rts(self, device: models.Device) -> list[models.RTS_API]:
+        # Not cached in-process, so that invalidations by other workers apply
+        rts_list = self.store.get_rts(device, self.ttl)
+
+        if rts_list is not None:
+            return rts_list
+
+        rts_list = api.get_rts(device)
+
+        if rts_list is None:
+            return self.store.get_rts(device, float("inf")) or []
+
+        self.store.put_rts(device, rts_list)
+        return rts_list
+
+    def invalidate(self, device: models.DeviceCreate) -> None:
+        """
+        This function removes the cached RTS of the given device.
+
+        Args:
+            device (models.DeviceCreate): The device
+        """
+        with self._lock:
+            self._rts.pop(device_key(device), None)
+
+        if self.store is not None:
+            self.store.invalidate_rts(device)
+
+
+inventory = Inventory()
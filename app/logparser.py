@@ -0,0 +1,629 @@
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+import numpy as np
+import requests
+
+from app import api, config, models
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+CHUNK_SIZE = 64 * 1024
+INDEX_CHUNK_SIZE = 4 * 1024 * 1024
+INDEX_WORKERS = 2
+INDEX_STRIDE = 1024
+GAP_FACTOR = 5.0
+
+DELIMITERS = re.compile(rb"[,;\t]")
+DELIMITER_TABLE = bytes.maketrans(b",;\t", b"   ")
+NUMERIC_START = np.frombuffer(b"0123456789+-.", dtype=np.uint8)
+COLUMN_NAMES = {
+    "timestamp": ("timestamp", "time", "t"),
+    "pos_x": ("pos_x", "x", "east", "e"),
+    "pos_y": ("pos_y", "y", "north", "n"),
+    "pos_z": ("pos_z", "z", "up", "u", "height", "h"),
+}
+
+
+class LogData(NamedTuple):
+    timestamp: np.ndarray
+    pos_x: np.ndarray
+    pos_y: np.ndarray
+    pos_z: np.ndarray
+
+
+class LogSummary(NamedTuple):
+    count: int
+    start: float
+    end: float
+    duration: float
+    rate: float
+    gaps: int
+    longest_gap: float
+
+
+def _get_columns(header: bytes) -> tuple[int, int, int, int]:
+    names = [
+        name.strip().lower().decode(errors="replace")
+        for name in DELIMITERS.sub(b" ", header.lstrip(b"#")).split()
+    ]
+    columns = []
+
+    for default, field in enumerate(COLUMN_NAMES.values()):
+        matches = [i for i, name in enumerate(names) if name in field]
+        columns.append(matches[0] if matches else default)
+
+    return tuple(columns)
+
+
+def _parse_rows(data: bytes, columns: tuple[int, int, int, int]) -> np.ndarray:
+    """
+    This function parses delimited numeric rows in a single vectorized pass.
+
+    All delimiters are replaced by whitespace and the whole buffer is converted to
+    floats at once. If the rows contain non-numeric values or do not have the same
+    number of columns, the slower line-based parser of NumPy is used instead.
+
+    Args:
+        data (bytes): The rows without header or comment lines
+        columns (tuple[int, int, int, int]): The columns of timestamp, pos_x,
+            pos_y and pos_z
+
+    Returns:
+        np.ndarray: The parsed values with one row per field
+    """
+    text = data.translate(DELIMITER_TABLE)
+    num_columns = len(text.split(b"\n", 1)[0].split())
+    num_rows = text.count(b"\n") + (not text.endswith(b"\n"))
+
+    try:
+        values = np.fromstring(text, dtype=np.float64, sep=" ")
+    except ValueError:
+        values = np.empty(0)
+
+    if num_columns and values.size == num_rows * num_columns:
+        return values.reshape(-1, num_columns)[:, columns].T
+
+    values = np.genfromtxt(
+        text.splitlines(), usecols=columns, invalid_raise=False, ndmin=2
+    )
+    return values.T if values.size else np.empty((len(columns), 0))
+
+
+def parse_log(
+    data: bytes, header: Optional[bytes] = None
+) -> tuple[LogData, np.ndarray, bytes]:
+    """
+    This function parses a recorded tracking log into columnar arrays.
+
+    Lines starting with "#" and other lines that do not start with a number are
+    skipped. Unless the header is given, the last of these lines before the first
+    row is treated as the header, which is used to find the columns of the
+    timestamp and the coordinates. Without a header, the first four columns are
+    used.
+
+    Args:
+        data (bytes): The content of the log, or a part of it starting at a line
+        header (Optional[bytes]): The header of the log, if `data` is a part of it
+
+    Returns:
+        LogData: The parsed timestamps and coordinates
+        np.ndarray: The byte offset of each parsed row
+        bytes: The header
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    line_starts = np.concatenate(([0], np.flatnonzero(buffer == ord("\n")) + 1))
+    line_starts = line_starts[line_starts < len(buffer)]
+    is_row = np.isin(buffer[line_starts], NUMERIC_START)
+
+    row_starts = line_starts[is_row]
+
+    if not len(row_starts):
+        empty = np.empty(0)
+        return LogData(empty, empty, empty, empty), empty.astype(np.int64), b""
+
+    first_row = row_starts[0]
+
+    if header is None:
+        header_lines = data[:first_row].splitlines()
+        header = header_lines[-1] if header_lines else b""
+
+    columns = _get_columns(header)
+
+    if is_row[np.searchsorted(line_starts, first_row) :].all():
+        rows = data[first_row:]
+    else:
+        line_ends = np.append(line_starts[1:], len(data))
+        rows = b"".join(
+            data[start:end] for start, end in zip(row_starts, line_ends[is_row])
+        )
+
+    values = _parse_rows(rows, columns)
+
+    if values.shape[1] != len(row_starts):
+        # Rows were skipped by the fallback parser, offsets are unknown
+        row_starts = np.empty(0, dtype=np.int64)
+
+    return LogData(*values), row_starts, header
+
+
+def summarize(timestamp: np.ndarray, gap_factor: float = GAP_FACTOR) -> LogSummary:
+    """
+    This function computes summary statistics of the timestamps of a log.
+
+    A gap is an interval between two positions that is more than `gap_factor`
+    times longer than the median interval.
+
+    Args:
+        timestamp (np.ndarray): The timestamps of the log
+        gap_factor (float): The factor of the median interval above which an
+            interval is a gap
+
+    Returns:
+        LogSummary: The summary statistics
+    """
+    count = len(timestamp)
+
+    if count < 2:
+        start = float(timestamp[0]) if count else 0.0
+        return LogSummary(count, start, start, 0.0, 0.0, 0, 0.0)
+
+    intervals = np.diff(timestamp)
+    is_gap = intervals > gap_factor * np.median(intervals)
+    duration = float(timestamp[-1] - timestamp[0])
+
+    return LogSummary(
+        count=count,
+        start=float(timestamp[0]),
+        end=float(timestamp[-1]),
+        duration=duration,
+        rate=(count - 1) / duration if duration > 0 else 0.0,
+        gaps=int(is_gap.sum()),
+        longest_gap=float(intervals[is_gap].max()) if is_gap.any() else 0.0,
+    )
+
+
+class LogIndex(NamedTuple):
+    timestamp: np.ndarray
+    offset: np.ndarray
+    size: int
+    header: bytes
+    summary: LogSummary
+    times: np.ndarray
+    active: bool
+
+
+class LogCache:
+    """
+    Local copies of recorded tracking logs with a sidecar time index.
+
+    Each log is downloaded once and indexed in chunks of `INDEX_CHUNK_SIZE` bytes,
+    so that the memory used does not grow with the size of the log beyond its
+    timestamps. The timestamp and byte offset of every `INDEX_STRIDE`-th row are
+    stored next to the log together with all timestamps and the summary
+    statistics, so that a time range can be read by seeking to the nearest indexed
+    row instead of scanning the whole file. Active logs are still growing, so only
+    their complete lines are indexed and the new bytes are fetched with a Range
+    request each time they are opened.
+
+    Logs can be indexed in the background using `submit_index`. Once the cached
+    logs exceed `max_mb` megabytes, the least recently used logs are removed.
+    """
+
+    def __init__(
+        self,
+        directory: str = config.LOG_CACHE_DIR,
+        max_mb: float = config.LOG_CACHE_MAX_MB,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024**2)
+        self._locks: dict[str, threading.Lock] = {}
+        self._jobs: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=INDEX_WORKERS, thread_name_prefix="log-index"
+        )
+
+    def _path(self, device: models.DeviceCreate, log_id: str) -> str:
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{device_key(device)}_{log_id}")
+        return os.path.join(self.directory, f"{name}.txt")
+
+    def _get_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def _remove(self, path: str) -> None:
+        for suffix in ("", ".part", ".idx.npz"):
+            try:
+                os.remove(f"{path}{suffix}")
+            except FileNotFoundError:
+                pass
+
+    def _download(
+        self, device: models.DeviceCreate, log_id: str, path: str, start: int = 0
+    ) -> Optional[int]:
+        """
+        This function downloads a log, or only its bytes from `start` if the local
+        copy has at least `start` bytes.
+
+        Args:
+            device (models.DeviceCreate): The device the log is stored on
+            log_id (str): The ID of the log
+            path (str): The path of the local copy
+            start (int): The number of bytes of the local copy that are kept
+
+        Returns:
+            Optional[int]: The offset from which the local copy has been replaced,
+                i.e. `start` or 0 if the whole log has been downloaded, or None if
+                the download failed
+        """
+        response = api.stream_log(device=device, log_id=log_id, start=start)
+
+        if response is None:
+            return None
+
+        content_range = response.headers.get("Content-Range", "")
+        size = content_range.rpartition("/")[2]
+        first = content_range.removeprefix("bytes ").partition("-")[0]
+
+        if response.status_code == 416 or (
+            response.status_code == 206 and first != str(start)
+        ):
+            response.close()
+
+            if size.isdigit() and int(size) == start:
+                return start
+
+            # The log has been replaced or truncated on the device
+            return self._download(device, log_id, path)
+
+        append = response.status_code == 206
+        target = path if append else f"{path}.part"
+        os.makedirs(self.directory, exist_ok=True)
+
+        try:
+            with open(target, "r+b" if append else "wb") as file:
+                file.truncate(start if append else 0)
+                file.seek(start if append else 0)
+
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    file.write(chunk)
+        except (requests.RequestException, OSError):
+            logger.exception("Failed to download log %s", log_id)
+
+            if append:
+                # Drop the partially appended bytes, the index ends at `start`
+                with open(path, "r+b") as file:
+                    file.truncate(start)
+            else:
+                self._remove(f"{path}.part")
+
+            return None
+        finally:
+            response.close()
+
+        if not append:
+            os.replace(f"{path}.part", path)
+
+        return start if append else 0
+
+    def _scan(
+        self, path: str, start: int, header: Optional[bytes], count: int, active: bool
+    ) -> tuple[list[np.ndarray], list[np.ndarray], list[np.ndarray], int, bytes]:
+        times, index_timestamp, index_offset = [], [], []
+        offset = start
+        remainder = b""
+
+        with open(path, "rb") as file:
+            file.seek(start)
+
+            while True:
+                chunk = file.read(INDEX_CHUNK_SIZE)
+                data = remainder + chunk
+
+                if chunk:
+                    # Only complete lines, the rest is parsed with the next chunk
+                    cut = data.rfind(b"\n") + 1
+                    data, remainder = data[:cut], data[cut:]
+                elif active:
+                    # The last line of an active log may still be written
+                    break
+
+                if data:
+                    log, offsets, found = parse_log(data, header)
+                    rows = len(log.timestamp)
+
+                    if rows:
+                        header = found if header is None else header
+                        times.append(log.timestamp)
+
+                        if len(offsets) == rows:
+                            selected = (count + np.arange(rows)) % INDEX_STRIDE == 0
+                            index_timestamp.append(log.timestamp[selected])
+                            index_offset.append(offsets[selected] + offset)
+                        else:
+                            # Row offsets are unknown, index the start of the chunk
+                            index_timestamp.append(log.timestamp[:1])
+                            index_offset.append(np.array([offset], dtype=np.int64))
+
+                        count += rows
+
+                    offset += len(data)
+
+                if not chunk:
+                    break
+
+        return times, index_timestamp, index_offset, offset, header or b""
+
+    def _build_index(
+        self,
+        path: str,
+        active: bool,
+        start: int = 0,
+        previous: Optional[LogIndex] = None,
+    ) -> LogIndex:
+        if previous is None:
+            previous = LogIndex(
+                timestamp=np.empty(0),
+                offset=np.empty(0, dtype=np.int64),
+                size=0,
+                header=None,
+                summary=None,
+                times=np.empty(0),
+                active=active,
+            )
+
+        times, index_timestamp, index_offset, size, header = self._scan(
+            path, start, previous.header, len(previous.times), active
+        )
+        times = np.concatenate([previous.times, *times])
+        index = LogIndex(
+            timestamp=np.concatenate([previous.timestamp, *index_timestamp]),
+            offset=np.concatenate([previous.offset, *index_offset]).astype(np.int64),
+            size=size,
+            header=header,
+            summary=summarize(times),
+            times=times,
+            active=active,
+        )
+
+        with open(f"{path}.idx.npz", "wb") as file:
+            np.savez(
+                file,
+                timestamp=index.timestamp,
+                offset=index.offset,
+                size=index.size,
+                header=np.frombuffer(header, dtype=np.uint8),
+                summary=np.array(index.summary, dtype=np.float64),
+                times=index.times,
+                active=index.active,
+            )
+
+        return index
+
+    def _load_index(self, path: str) -> Optional[LogIndex]:
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with np.load(f"{path}.idx.npz") as index:
+                summary = index["summary"]
+                return LogIndex(
+                    timestamp=index["timestamp"],
+                    offset=index["offset"],
+                    size=int(index["size"]),
+                    header=index["header"].tobytes(),
+                    summary=LogSummary(
+                        int(summary[0]), *summary[1:5], int(summary[5]), summary[6]
+                    ),
+                    times=index["times"],
+                    active=bool(index["active"]),
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _evict(self, keep: str) -> None:
+        if self.max_bytes <= 0 or not os.path.isdir(self.directory):
+            return
+
+        logs = []
+
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+
+            if not name.endswith(".txt") or path == keep:
+                continue
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+
+            size = stat.st_size
+
+            if os.path.exists(f"{path}.idx.npz"):
+                size += os.path.getsize(f"{path}.idx.npz")
+
+            logs.append((stat.st_mtime, path, size))
+
+        total = sum(size for _, _, size in logs)
+
+        try:
+            total += os.path.getsize(keep) + os.path.getsize(f"{keep}.idx.npz")
+        except FileNotFoundError:
+            pass
+
+        for _, path, size in sorted(logs):
+            if total <= self.max_bytes:
+                break
+
+            lock = self._get_lock(path)
+
+            # Logs that are being read or indexed are kept
+            if not lock.acquire(blocking=False):
+                continue
+
+            try:
+                self._remove(path)
+                total -= size
+                logger.info("Evicted cached log %s", path)
+            finally:
+                lock.release()
+
+    def get_index(
+        self, device: models.DeviceCreate, log_id: str, active: bool = False
+    ) -> Optional[LogIndex]:
+        """
+        This function returns the time index of a log, downloading and indexing the
+        log if it is not cached yet. The new bytes of active logs, and of logs that
+        were active when they were cached, are fetched and indexed.
+
+        Args:
+            device (models.DeviceCreate): The device the log is stored on
+            log_id (str): The ID of the log
+            active (bool): Whether the log is still being recorded
+
+        Returns:
+            Optional[LogIndex]: The index or None if the log could not be downloaded
+        """
+        path = self._path(device, log_id)
+
+        with self._get_lock(path):
+            index = self._load_index(path)
+
+            if index is not None and not (active or index.active):
+                # The modification time orders the logs for eviction
+                os.utime(path)
+                return index
+
+            start = self._download(
+                device, log_id, path, start=index.size if index is not None else 0
+            )
+
+            if start is None:
+                logger.error("Failed to download log %s", log_id)
+                return index
+
+            if start == 0:
+                index = self._build_index(path, active)
+            else:
+                index = self._build_index(path, active, start=start, previous=index)
+
+        self._evict(keep=path)
+        return index
+
+    def submit_index(
+        self, device: models.DeviceCreate, log_id: str, active: bool = False
+    ) -> Future:
+        """
+        This function indexes a log in the background, unless it is already being
+        indexed.
+
+        Args:
+            device (models.DeviceCreate): The device the log is stored on
+            log_id (str): The ID of the log
+            active (bool): Whether the log is still being recorded
+
+        Returns:
+            Future: The future of the index, see `get_index`
+        """
+        path = self._path(device, log_id)
+
+        with self._lock:
+            job = self._jobs.get(path)
+
+            if job is None or job.done():
+                job = self._executor.submit(self.get_index, device, log_id, active)
+                self._jobs[path] = job
+
+            return job
+
+    def get_job(self, device: models.DeviceCreate, log_id: str) -> Optional[Future]:
+        with self._lock:
+            return self._jobs.get(self._path(device, log_id))
+
+    def invalidate(self, device: models.DeviceCreate, log_id: str) -> None:
+        """
+        This function removes the local copy and the index of a log.
+
+        Args:
+            device (models.DeviceCreate): The device the log is stored on
+            log_id (str): The ID of the log
+        """
+        path = self._path(device, log_id)
+
+        with self._get_lock(path):
+            self._remove(path)
+
+        with self._lock:
+            self._jobs.pop(path, None)
+
+    def read_range(
+        self,
+        device: models.DeviceCreate,
+        log_id: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Optional[LogData]:
+        """
+        This function reads the positions of a cached log within a time range.
+
+        Only the bytes between the indexed rows enclosing the time range are read.
+
+        Args:
+            device (models.DeviceCreate): The device the log is stored on
+            log_id (str): The ID of the log
+            start (Optional[float]): The first timestamp to include, unbounded if None
+            end (Optional[float]): The last timestamp to include, unbounded if None
+
+        Returns:
+            Optional[LogData]: The positions or None if the log could not be read
+        """
+        index = self.get_index(device, log_id)
+
+        if index is None:
+            return None
+
+        if not len(index.offset):
+            empty = np.empty(0)
+            return LogData(empty, empty, empty, empty)
+
+        first = 0
+        if start is not None:
+            first = max(0, np.searchsorted(index.timestamp, start, side="right") - 1)
+
+        last = len(index.offset)
+        if end is not None:
+            last = np.searchsorted(index.timestamp, end, side="right")
+
+        begin = int(index.offset[first])
+        stop = int(index.offset[last]) if last < len(index.offset) else index.size
+
+        path = self._path(device, log_id)
+
+        # The log may have been evicted or invalidated in the meantime
+        with self._get_lock(path):
+            if not os.path.exists(path):
+                return None
+
+            with open(path, "rb") as file:
+                file.seek(begin)
+                data = file.read(stop - begin)
+
+        log, _, _ = parse_log(data, header=index.header)
+        mask = np.ones(len(log.timestamp), dtype=bool)
+
+        if start is not None:
+            mask &= log.timestamp >= start
+        if end is not None:
+            mask &= log.timestamp <= end
+
+        return LogData(*(field[mask] for field in log))
+
+
+log_cache = LogCache()
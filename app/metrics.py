@@ -0,0 +1,191 @@
+import bisect
+import threading
+from typing import Iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def path_template(path: str) -> str:
+    """
+    This function replaces the ID at the end of an RTS Server API path with a
+    placeholder, so that metrics are labeled by endpoint instead of by RTS or log.
+
+    Args:
+        path (str): The path, e.g. /tracking/status/3
+
+    Returns:
+        str: The path template, e.g. /tracking/status/{id}
+    """
+    prefix, _, last = path.rpartition("/")
+
+    if prefix and last:
+        return f"{prefix}/{{id}}"
+
+    return path
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: tuple[str, ...], labels: tuple[str, ...]) -> str:
+    if not labelnames:
+        return ""
+
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)
+    )
+    return f"{{{pairs}}}"
+
+
+class Counter:
+    """
+    Monotonically increasing value per label combination.
+    """
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = dict(self._values)
+
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram:
+    """
+    Distribution of observed values per label combination with cumulative buckets.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[tuple[str, ...], tuple[list[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        bucket = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bucket] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = {
+                key: (list(counts), total)
+                for key, (counts, total) in self._values.items()
+            }
+
+        labelnames = self.labelnames + ("le",)
+
+        for key, (counts, total) in values.items():
+            cumulative = 0
+
+            for upper, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if upper == float("inf") else repr(upper)
+                labels = _format_labels(labelnames, key + (le,))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {total}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics that are exposed in the Prometheus text format.
+
+    The metrics are kept in memory of the current process, so each gunicorn worker
+    reports its own values.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: list = []
+
+    def counter(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = ()
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+API_LABELS = ("device", "method", "path")
+
+api_request_duration = metrics.histogram(
+    "rts_dashboard_api_request_duration_seconds",
+    "Duration of requests to the RTS Server API until the response headers arrived",
+    API_LABELS,
+)
+api_responses = metrics.counter(
+    "rts_dashboard_api_responses_total",
+    "Responses of the RTS Server API by status code",
+    API_LABELS + ("status",),
+)
+api_timeouts = metrics.counter(
+    "rts_dashboard_api_timeouts_total",
+    "Requests to the RTS Server API that timed out",
+    API_LABELS,
+)
+api_connection_errors = metrics.counter(
+    "rts_dashboard_api_connection_errors_total",
+    "Requests to the RTS Server API that failed to connect",
+    API_LABELS,
+)
+api_requests_skipped = metrics.counter(
+    "rts_dashboard_api_requests_skipped_total",
+    "Requests to the RTS Server API that were skipped by the circuit breaker",
+    API_LABELS,
+)
+callback_duration = metrics.histogram(
+    "rts_dashboard_callback_duration_seconds",
+    "Execution time of Dash callbacks",
+    ("callback",),
+)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -39,6 +41,13 @@ class Log(BaseModel):
     name: str
 
 
+class LogChunk(BaseModel):
+    content: bytes
+    start: int
+    end: int
+    total: Optional[int] = None
+
+
 class Position(BaseModel):
     north: float
     east: float
@@ -123,3 +132,71 @@ class TrackingSettings(BaseModel):
             {"label": "Norm", "value": 0},
             {"label": "Point", "value": 1},
         ]
+
+
+class RTSStatus(BaseModel):
+    tracking: Optional[dict] = None
+    connection: Optional[dict] = None
+    position: Optional[dict] = None
+    timestamp: float = 0.0
+
+
+class DeviceHealth(BaseModel):
+    state: str
+    rtt: Optional[float] = None
+    timestamp: float = 0.0
+
+
+class RTTStats(BaseModel):
+    p50: float
+    p95: float
+    jitter: float
+    count: int
+
+
+class Command(BaseModel):
+    id: str
+    kind: str
+    device_id: int
+    rts_id: str
+    target: Optional[Position] = None
+    state: str = "queued"
+    submitted: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    @property
+    def latency(self) -> float:
+        if self.finished is None:
+            return 0.0
+
+        return self.finished - self.submitted
+
+
+class CommandResult(BaseModel):
+    device_id: int
+    device_name: str
+    rts_id: str
+    rts_name: str
+    success: bool
+    latency: float
+    acknowledged: float
+
+
+class BroadcastResult(BaseModel):
+    results: list[CommandResult] = []
+
+    @property
+    def num_success(self) -> int:
+        return sum(result.success for result in self.results)
+
+    @property
+    def spread(self) -> float:
+        acknowledged = [
+            result.acknowledged for result in self.results if result.success
+        ]
+
+        if not acknowledged:
+            return 0.0
+
+        return max(acknowledged) - min(acknowledged)
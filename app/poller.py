@@ -0,0 +1,458 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Optional
+
+from app import async_api, config, models
+from app.history import history
+from app.sessions import device_key
+from app.shared import SharedCache, shared_cache
+from app.utils import DEFAULT_POSITION, get_newest_position
+
+logger = logging.getLogger("root")
+
+
+class Poller:
+    """
+    Server-side background poller for the tracking and connection status of RTS.
+
+    The polling rate adapts to each RTS, independent of the number of connected
+    clients. RTS that are tracking a moving prism are queried every
+    `fast_interval`, RTS that are tracking without new positions every `interval`,
+    and idle or disconnected RTS every `slow_interval`. After a user command, the
+    affected RTS can be re-polled immediately using `poke`. Callbacks register the
+    RTS they display using `watch` and read the latest status from the in-process
+    snapshot using `get_status`. RTS that have not been watched for `watch_timeout`
+    seconds are no longer polled. All devices that are due are polled concurrently
+    from a single event loop, with at most `max_workers` devices at a time.
+
+    Besides the raw status, the snapshot keeps the newest target position of each
+    RTS, and the positions of tracking RTS are appended to their position history.
+    Consumers can block on `wait_for_change` to be woken up whenever the
+    status of a watched RTS changes, or whenever `notify_change` is called.
+
+    If a shared cache is given, the pollers of all gunicorn workers elect a leader
+    through the cache, so that each RTS is polled only once. Watches and pokes are
+    forwarded to the leader through the cache, and the other workers replace their
+    snapshot with the statuses written by the leader whenever they have changed.
+    """
+
+    def __init__(
+        self,
+        interval: float = config.POLL_INTERVAL,
+        fast_interval: float = config.POLL_FAST_INTERVAL,
+        slow_interval: float = config.POLL_SLOW_INTERVAL,
+        watch_timeout: float = config.POLL_WATCH_TIMEOUT,
+        max_workers: int = config.POLL_WORKERS,
+        store: Optional[SharedCache] = shared_cache,
+    ) -> None:
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.slow_interval = slow_interval
+        self.watch_timeout = watch_timeout
+        self.max_workers = max_workers
+        self.store = store
+        self._devices: dict[str, models.Device] = {}
+        self._watched: dict[tuple[str, str], float] = {}
+        self._snapshot: dict[tuple[str, str], models.RTSStatus] = {}
+        self._next_poll: dict[tuple[str, str], float] = {}
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._version = 0
+        self._thread: Optional[threading.Thread] = None
+        self._owner = uuid.uuid4().hex
+        self._is_leader = False
+        self._lease_renewed = 0.0
+        self._store_version: Optional[int] = None
+        self._store_watched: dict[tuple[str, str], float] = {}
+
+    def _ensure_running(self) -> None:
+        # Concurrent callbacks must not start a second poller thread
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self._run, name="rts-status-poller", daemon=True
+            )
+            self._thread.start()
+
+        logger.info(
+            "Started status poller with intervals %.2f / %.2f / %.2f s",
+            self.fast_interval,
+            self.interval,
+            self.slow_interval,
+        )
+
+    @property
+    def is_leader(self) -> bool:
+        """
+        Whether this poller polls the devices, i.e. no shared cache is used or this
+        worker holds the leader lease.
+        """
+        return self.store is None or self._is_leader
+
+    def watch(self, device: models.Device, rts_id: str) -> None:
+        """
+        This function registers an RTS for polling or refreshes its registration.
+
+        Args:
+            device (models.Device): The device the RTS is connected to
+            rts_id (str): The ID of the RTS
+        """
+        key = device_key(device)
+
+        now = time.monotonic()
+
+        with self._lock:
+            self._devices[key] = device
+            is_new = (key, str(rts_id)) not in self._watched
+            self._watched[(key, str(rts_id))] = now
+
+            # Refresh the shared watch well before it expires
+            share = (
+                self.store is not None
+                and now - self._store_watched.get((key, str(rts_id)), -float("inf"))
+                > self.watch_timeout / 4
+            )
+            if share:
+                self._store_watched[(key, str(rts_id))] = now
+
+        if share:
+            self.store.watch(device, rts_id)
+
+        if is_new:
+            self._wake.set()
+
+        self._ensure_running()
+
+    def poke(self, device: models.DeviceCreate, rts_id: Optional[str] = None) -> None:
+        """
+        This function schedules an RTS, or all RTS of a device, to be polled
+        immediately, e.g. after a command has been sent to it.
+
+        Args:
+            device (models.DeviceCreate): The device
+            rts_id (Optional[str]): The ID of the RTS or None for all RTS of the device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            for rts_key in self._watched:
+                if rts_key[0] == key and rts_id in (None, rts_key[1]):
+                    self._next_poll[rts_key] = 0.0
+
+        if self.store is not None and not self._is_leader:
+            self.store.poke(device, rts_id)
+
+        self._wake.set()
+
+    def forget_device(self, device: models.DeviceCreate) -> None:
+        """
+        This function stops polling all RTS of the given device and drops their
+        status from the snapshot.
+
+        Args:
+            device (models.DeviceCreate): The device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            self._devices.pop(key, None)
+            for rts_key in [k for k in self._watched if k[0] == key]:
+                del self._watched[rts_key]
+                self._snapshot.pop(rts_key, None)
+                self._next_poll.pop(rts_key, None)
+                self._store_watched.pop(rts_key, None)
+
+            self._notify()
+
+        if self.store is not None:
+            self.store.forget_device(device)
+
+        history.forget_device(device)
+
+    def get_status(
+        self, device: models.Device, rts_id: str
+    ) -> Optional[models.RTSStatus]:
+        """
+        This function returns the latest polled status of an RTS.
+
+        Args:
+            device (models.Device): The device the RTS is connected to
+            rts_id (str): The ID of the RTS
+
+        Returns:
+            Optional[models.RTSStatus]: The latest status or None if the RTS has
+                not been polled yet
+        """
+        with self._lock:
+            return self._snapshot.get((device_key(device), str(rts_id)))
+
+    def get_target_position(self) -> dict:
+        """
+        This function returns the newest position recorded by any watched RTS.
+
+        Returns:
+            dict: The newest position
+        """
+        with self._lock:
+            positions = [
+                status.position
+                for status in self._snapshot.values()
+                if status.position is not None
+            ]
+
+        return max(
+            positions,
+            key=lambda position: float(position["timestamp"]),
+            default=DEFAULT_POSITION,
+        )
+
+    def wait_for_change(self, version: int, timeout: float) -> int:
+        """
+        This function blocks until the snapshot differs from the given version or
+        the timeout has elapsed.
+
+        Args:
+            version (int): The last version known to the caller
+            timeout (float): The maximum time to wait in seconds
+
+        Returns:
+            int: The current version of the snapshot
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._version != version, timeout=timeout)
+            return self._version
+
+    def notify_change(self) -> None:
+        """
+        This function wakes up the consumers blocked on `wait_for_change`, e.g.
+        after the state of a command sent to an RTS has changed.
+        """
+        with self._lock:
+            self._notify()
+
+    def _notify(self) -> None:
+        # Must be called while holding the lock
+        self._version += 1
+        self._changed.notify_all()
+
+    def _get_due(self) -> tuple[dict[str, list[str]], float]:
+        now = time.monotonic()
+        due: dict[str, list[str]] = {}
+        next_due = now + self.slow_interval
+
+        with self._lock:
+            for rts_key, last_watched in list(self._watched.items()):
+                if now - last_watched > self.watch_timeout:
+                    del self._watched[rts_key]
+                    self._snapshot.pop(rts_key, None)
+                    self._next_poll.pop(rts_key, None)
+                    self._store_watched.pop(rts_key, None)
+                    continue
+
+                poll_at = self._next_poll.get(rts_key, 0.0)
+
+                if poll_at <= now:
+                    due.setdefault(rts_key[0], []).append(rts_key[1])
+                else:
+                    next_due = min(next_due, poll_at)
+
+            watched_devices = {rts_key[0] for rts_key in self._watched}
+            for key in [k for k in self._devices if k not in watched_devices]:
+                del self._devices[key]
+
+        return due, next_due
+
+    def _get_interval(
+        self, previous: Optional[models.RTSStatus], status: models.RTSStatus
+    ) -> float:
+        if status.tracking is None or status.connection is None:
+            return self.slow_interval
+
+        if not status.tracking.get("active"):
+            return self.slow_interval
+
+        if previous is not None and previous.position == status.position:
+            return self.interval
+
+        return self.fast_interval
+
+    async def _poll_device(self, key: str, rts_ids: list[str]) -> None:
+        with self._lock:
+            device = self._devices.get(key)
+
+            # Until the response is processed, unless the RTS is poked in between
+            for rts_id in rts_ids:
+                self._next_poll[(key, rts_id)] = time.monotonic() + self.slow_interval
+
+        if device is None:
+            return
+
+        statuses = await async_api.get_rts_statuses(device=device, rts_ids=rts_ids)
+        now = time.monotonic()
+
+        updated = {}
+
+        with self._lock:
+            changed = False
+
+            for rts_id, status in statuses.items():
+                if (key, rts_id) not in self._watched:
+                    continue
+
+                previous = self._snapshot.get((key, rts_id))
+                status.position = get_newest_position(
+                    status.tracking, previous.position if previous else None
+                )
+                self._snapshot[(key, rts_id)] = status
+                updated[rts_id] = status
+
+                if self._next_poll.get((key, rts_id)) != 0.0:
+                    self._next_poll[(key, rts_id)] = now + self._get_interval(
+                        previous, status
+                    )
+
+                if status.tracking is not None and status.tracking.get("active"):
+                    history.append(device, rts_id, status.position)
+
+                if previous is None or (previous.tracking, previous.connection) != (
+                    status.tracking,
+                    status.connection,
+                ):
+                    changed = True
+
+            if changed:
+                self._notify()
+
+        if self.store is not None and updated:
+            self.store.put_statuses(device, updated, changed)
+
+    def _check_leader(self) -> bool:
+        if self.store is None:
+            return True
+
+        now = time.monotonic()
+
+        # Renew the lease, or try to take it over, well before it expires
+        if now - self._lease_renewed > self.store.lease / 3:
+            is_leader = self.store.acquire_leadership(self._owner)
+            self._lease_renewed = now
+
+            if is_leader != self._is_leader:
+                logger.info(
+                    "Status poller is %s",
+                    "polling as leader" if is_leader else "following the leader",
+                )
+            self._is_leader = is_leader
+
+        return self._is_leader
+
+    def _pull_watched(self, is_leader: bool) -> None:
+        # Rebuilt from the shared table, so RTS no longer watched by any worker are
+        # dropped, also by the workers that do not poll
+        watched, poked = self.store.get_watched(
+            self.watch_timeout, reset_pokes=is_leader
+        )
+        now = time.monotonic()
+
+        with self._lock:
+            self._watched = {
+                rts_key: now - age for rts_key, (_, age) in watched.items()
+            }
+            self._devices = {key: device for (key, _), (device, _) in watched.items()}
+            self._store_watched = {
+                rts_key: watched_at
+                for rts_key, watched_at in self._store_watched.items()
+                if rts_key in self._watched
+            }
+
+            if not is_leader:
+                return
+
+            for rts_key in poked:
+                self._next_poll[rts_key] = 0.0
+
+            for rts_key in [k for k in self._snapshot if k not in self._watched]:
+                del self._snapshot[rts_key]
+                self._next_poll.pop(rts_key, None)
+
+    def _sync(self) -> None:
+        if self.store.get_version() == self._store_version:
+            return
+
+        version, statuses = self.store.get_statuses()
+
+        with self._lock:
+            self._snapshot = {
+                rts_key: status for rts_key, (_, status) in statuses.items()
+            }
+            self._store_version = version
+            self._notify()
+
+        for (_, rts_id), (device, status) in statuses.items():
+            if status.tracking is not None and status.tracking.get("active"):
+                history.append(device, rts_id, status.position)
+
+    async def _poll_due(self, due: dict[str, list[str]]) -> None:
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def poll(key: str, rts_ids: list[str]) -> None:
+            async with semaphore:
+                await self._poll_device(key, rts_ids)
+
+        results = await asyncio.gather(
+            *(poll(key, rts_ids) for key, rts_ids in due.items()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Polling device status failed", exc_info=result)
+
+    async def _run_async(self) -> None:
+        try:
+            while True:
+                self._wake.clear()
+
+                try:
+                    is_leader = self._check_leader()
+
+                    if self.store is not None:
+                        self._pull_watched(is_leader)
+
+                    if not is_leader:
+                        self._sync()
+                except Exception:
+                    logger.exception("Reading the shared status cache failed")
+                    await asyncio.sleep(self.fast_interval)
+                    continue
+
+                if not is_leader:
+                    await asyncio.to_thread(self._wake.wait, self.fast_interval)
+                    continue
+
+                due, next_due = self._get_due()
+
+                if not due:
+                    timeout = next_due - time.monotonic()
+
+                    if self.store is not None:
+                        # Pick up the watches and pokes of the other workers
+                        timeout = min(timeout, self.fast_interval)
+
+                    await asyncio.to_thread(self._wake.wait, max(0.0, timeout))
+                    continue
+
+                await self._poll_due(due)
+        finally:
+            await async_api.close()
+
+    def _run(self) -> None:
+        asyncio.run(self._run_async())
+
+
+poller = Poller()
@@ -0,0 +1,163 @@
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+from app import config, models
+from app.utils import DeviceNotFound
+
+logger = logging.getLogger("root")
+
+
+class DeviceRegistry:
+    """
+    Server-side registry of all logging devices.
+
+    Devices are persisted in a SQLite database, so that they survive browser
+    sessions and are shared between all operators and gunicorn workers. Reads are
+    served from an in-memory index by device ID, which is reloaded whenever
+    another connection has modified the database.
+    """
+
+    def __init__(self, path: str = config.DATABASE_PATH) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._index: dict[int, models.Device] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS devices (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ip TEXT NOT NULL,
+                port INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                UNIQUE (ip, port)
+            )
+            """)
+        connection.commit()
+        self._connection = connection
+        return connection
+
+    def _refresh(self) -> None:
+        connection = self._connect()
+        data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+
+        if data_version == self._data_version:
+            return
+
+        rows = connection.execute("SELECT id, ip, port, name FROM devices ORDER BY id")
+        self._index = {
+            row[0]: models.Device(id=row[0], ip=row[1], port=row[2], name=row[3])
+            for row in rows
+        }
+        self._data_version = data_version
+
+    def all(self) -> list[models.Device]:
+        """
+        This function returns all registered devices ordered by their ID.
+
+        Returns:
+            list[models.Device]: The registered devices
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._index.values())
+
+    def ids(self) -> list[int]:
+        """
+        This function returns the IDs of all registered devices.
+
+        Returns:
+            list[int]: The device IDs
+        """
+        with self._lock:
+            self._refresh()
+            return list(self._index)
+
+    def get(self, device_id: int) -> models.Device:
+        """
+        This function returns the device with the given ID.
+
+        Raises:
+            DeviceNotFound: If there is no device with the given ID
+
+        Args:
+            device_id (int): The ID of the device
+
+        Returns:
+            models.Device: The device with the given ID
+        """
+        with self._lock:
+            self._refresh()
+            device = self._index.get(int(device_id))
+
+        if device is None:
+            raise DeviceNotFound(f"Device with ID {device_id} not found")
+
+        return device
+
+    def add(self, device: models.DeviceCreate) -> models.Device:
+        """
+        This function registers a new device. If a device with the same address is
+        already registered, the existing device is returned.
+
+        Args:
+            device (models.DeviceCreate): The device to register
+
+        Returns:
+            models.Device: The registered device
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR IGNORE INTO devices (ip, port, name) VALUES (?, ?, ?)",
+                    (device.ip, device.port, device.name),
+                )
+            row = connection.execute(
+                "SELECT id, ip, port, name FROM devices WHERE ip = ? AND port = ?",
+                (device.ip, device.port),
+            ).fetchone()
+            self._data_version = None
+
+        logger.info("Registered device %s at %s:%s", row[3], row[1], row[2])
+        return models.Device(id=row[0], ip=row[1], port=row[2], name=row[3])
+
+    def remove(self, device_id: int) -> models.Device:
+        """
+        This function removes the device with the given ID from the registry.
+
+        Raises:
+            DeviceNotFound: If there is no device with the given ID
+
+        Args:
+            device_id (int): The ID of the device
+
+        Returns:
+            models.Device: The removed device
+        """
+        device = self.get(device_id)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM devices WHERE id = ?", (device.id,))
+            self._data_version = None
+
+        logger.info("Removed device %s", device.name)
+        return device
+
+
+registry = DeviceRegistry()
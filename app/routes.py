@@ -0,0 +1,183 @@
+import io
+import logging
+import time
+
+import flask
+import numpy as np
+
+from app import api, app, config, export, metrics, server, stream
+from app.logparser import log_cache
+from app.registry import registry
+from app.utils import DeviceNotFound
+
+logger = logging.getLogger("root")
+
+CHUNK_SIZE = 64 * 1024
+CALLBACK_PATH = "/_dash-update-component"
+
+
+@server.route("/logs/download/<int:device_id>/<log_id>")
+def download_log(device_id: int, log_id: str):
+    """
+    This route proxies the log download of a device to the browser.
+
+    The log is streamed from the device in chunks and forwarded using chunked
+    transfer encoding, so that neither the dashboard nor the browser has to keep
+    the whole log in memory.
+
+    Args:
+        device_id (int): Id of the device
+        log_id (str): Id of the log to download
+
+    Returns:
+        flask.Response: The streamed log
+    """
+    try:
+        device = registry.get(device_id)
+    except DeviceNotFound:
+        flask.abort(404)
+
+    logger.info("Downloading log %s from device %i", log_id, device_id)
+
+    response = api.stream_log(device=device, log_id=log_id)
+
+    if response is None:
+        logger.error("Failed to download log")
+        flask.abort(502)
+
+    download = flask.Response(
+        flask.stream_with_context(response.iter_content(chunk_size=CHUNK_SIZE)),
+        mimetype="text/plain",
+        headers={"Content-Disposition": f"attachment; filename=log_{log_id}.txt"},
+    )
+    # Also runs if the client disconnects before the first chunk has been sent
+    download.call_on_close(response.close)
+    return download
+
+
+@server.route("/logs/range/<int:device_id>/<log_id>")
+def read_log_range(device_id: int, log_id: str):
+    """
+    This route returns the positions of a log within a time range as CSV.
+
+    The range is given by the optional `start` and `end` query parameters in
+    seconds since the epoch. The log is read from the local copy using its time
+    index, so only the rows around the requested range are read from disk.
+
+    Args:
+        device_id (int): Id of the device
+        log_id (str): Id of the log
+
+    Returns:
+        flask.Response: The positions as CSV
+    """
+    start = flask.request.args.get("start", type=float)
+    end = flask.request.args.get("end", type=float)
+
+    try:
+        device = registry.get(device_id)
+    except DeviceNotFound:
+        flask.abort(404)
+
+    log = log_cache.read_range(device=device, log_id=log_id, start=start, end=end)
+
+    if log is None:
+        flask.abort(502)
+
+    output = io.StringIO()
+    np.savetxt(
+        output,
+        np.column_stack(log),
+        fmt="%.6f",
+        delimiter=",",
+        header=",".join(log._fields),
+        comments="",
+    )
+    return flask.Response(output.getvalue(), mimetype="text/csv")
+
+
+@server.route("/logs/export", methods=["POST"])
+def export_logs():
+    """
+    This route streams a ZIP archive of the selected logs to the browser.
+
+    The logs are posted as the `logs` form field, a comma-separated list of
+    "<device_id>:<rts_id>:<log_id>", since a selection of many logs does not fit
+    into a URL. The optional `level` form field sets the compression level from 0
+    (uncompressed) to 9.
+
+    Returns:
+        flask.Response: The streamed archive
+    """
+    values = flask.request.form.get("logs", "")
+    entries = export.get_entries([value for value in values.split(",") if value])
+    level = min(max(flask.request.form.get("level", 6, type=int), 0), 9)
+
+    if not entries:
+        flask.abort(404)
+
+    logger.info("Exporting %i logs with compression level %i", len(entries), level)
+    filename = time.strftime("rts-logs-%Y%m%d-%H%M%S.zip")
+
+    return flask.Response(
+        flask.stream_with_context(export.stream_archive(entries, compresslevel=level)),
+        mimetype="application/zip",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@server.route("/events/status")
+def status_events():
+    """
+    This route pushes the status of all RTS to the browser as Server-Sent Events.
+
+    The values are read from the snapshot of the background poller and only sent
+    when they have changed, so that the number of open dashboards does not affect
+    the number of requests sent to the logging devices.
+
+    Returns:
+        flask.Response: The event stream
+    """
+    if not config.PUSH_UPDATES:
+        return flask.Response(status=204)
+
+    return flask.Response(
+        stream.status_events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@server.route("/metrics")
+def get_metrics():
+    """
+    This route exposes the metrics of the dashboard in the Prometheus text format.
+
+    Returns:
+        flask.Response: The metrics
+    """
+    return flask.Response(
+        metrics.metrics.render(), mimetype="text/plain; version=0.0.4"
+    )
+
+
+@server.before_request
+def start_callback_timer():
+    if flask.request.path.endswith(CALLBACK_PATH):
+        flask.g.callback_start = time.perf_counter()
+
+
+@server.after_request
+def record_callback_duration(response: flask.Response):
+    start = flask.g.pop("callback_start", None)
+
+    if start is None:
+        return response
+
+    output = (flask.request.get_json(silent=True) or {}).get("output", "")
+    callback = app.callback_map.get(output, {}).get("callback")
+    metrics.callback_duration.observe(
+        time.perf_counter() - start,
+        callback=getattr(callback, "__name__", output),
+    )
+    return response
@@ -0,0 +1,197 @@
+import asyncio
+import ipaddress
+import logging
+import threading
+import time
+import uuid
+from typing import Optional
+
+from app import async_api, config, models
+
+logger = logging.getLogger("root")
+
+
+class ScanJob:
+    """
+    State of a network scan that runs in a background thread.
+
+    Hosts running the RTS Server are appended to `found` as soon as their
+    handshake succeeded, so that they can be added to the device list while the
+    scan is still running.
+    """
+
+    def __init__(self, network: str, port: int) -> None:
+        self.network = network
+        self.port = port
+        self.total = ipaddress.ip_network(network, strict=False).num_addresses
+        self.scanned = 0
+        self.found: list[str] = []
+        self.done = False
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def progress(self) -> float:
+        if self.done or not self.total:
+            return 100.0
+
+        return 100.0 * self.scanned / self.total
+
+    def add_scanned(self) -> None:
+        with self._lock:
+            self.scanned += 1
+
+    def add_found(self, host: str) -> None:
+        with self._lock:
+            self.found.append(host)
+
+    def get_found(self) -> list[str]:
+        with self._lock:
+            return list(self.found)
+
+
+async def _probe_port(host: str, port: int, timeout: float) -> bool:
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout=timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
+    return True
+
+
+async def _scan_host(
+    job: ScanJob, host: str, semaphore: asyncio.Semaphore, timeout: float
+) -> None:
+    async with semaphore:
+        try:
+            if not await _probe_port(host, job.port, timeout):
+                return
+
+            device = models.DeviceCreate(ip=host, port=job.port, name=host)
+
+            if await async_api.validate_device_connection(device):
+                logger.info("Found device at %s:%s", host, job.port)
+                job.add_found(host)
+        finally:
+            job.add_scanned()
+
+
+async def scan_network(
+    job: ScanJob,
+    max_concurrency: int = config.SCAN_CONCURRENCY,
+    timeout: float = config.SCAN_TIMEOUT,
+) -> None:
+    """
+    This function probes the port of the job on all hosts of its network
+    concurrently and checks the RTS Server handshake of all hosts that accept a
+    connection.
+
+    Args:
+        job (ScanJob): The scan job
+        max_concurrency (int): The maximum number of hosts probed at the same time
+        timeout (float): The time to wait for a host to accept the connection
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    network = ipaddress.ip_network(job.network, strict=False)
+    # Bounded by the prefix check in Scanner.start
+    hosts = list(network.hosts()) or [network.network_address]
+    job.total = len(hosts)
+
+    try:
+        await asyncio.gather(
+            *(_scan_host(job, str(host), semaphore, timeout) for host in hosts)
+        )
+    finally:
+        await async_api.close()
+
+
+class Scanner:
+    """
+    Runs network scans in background threads and keeps track of their state.
+
+    Finished jobs are kept for `job_ttl` seconds, so that the browser that started a
+    scan can still read its results after it has finished.
+    """
+
+    def __init__(
+        self,
+        min_prefix: int = config.SCAN_MIN_PREFIX,
+        job_ttl: float = config.SCAN_JOB_TTL,
+    ) -> None:
+        self.min_prefix = min_prefix
+        self.job_ttl = job_ttl
+        self._jobs: dict[str, ScanJob] = {}
+        self._lock = threading.Lock()
+
+    def _prune(self) -> None:
+        # Must be called with the lock held
+        expired = time.monotonic() - self.job_ttl
+        self._jobs = {
+            job_id: job
+            for job_id, job in self._jobs.items()
+            if job.finished is None or job.finished > expired
+        }
+
+    def _run(self, job: ScanJob) -> None:
+        try:
+            asyncio.run(scan_network(job))
+        except Exception:
+            logger.exception("Scanning network %s failed", job.network)
+        finally:
+            job.finished = time.monotonic()
+            job.done = True
+            logger.info(
+                "Finished scanning network %s, found %i devices",
+                job.network,
+                len(job.found),
+            )
+
+    def start(self, network: str, port: int) -> str:
+        """
+        This function starts scanning the given network in a background thread.
+
+        Args:
+            network (str): The network to scan, e.g. 192.168.0.0/24
+            port (int): The port of the RTS Server
+
+        Returns:
+            str: The ID of the scan job
+
+        Raises:
+            ValueError: If the network is invalid or wider than allowed
+        """
+        job = ScanJob(network=network, port=port)
+
+        if job.total > 2 ** (32 - self.min_prefix):
+            raise ValueError(
+                f"Network {network} is wider than /{self.min_prefix} and can not be "
+                "scanned"
+            )
+
+        job_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+
+        logger.info("Scanning network %s on port %s", network, port)
+        threading.Thread(
+            target=self._run, args=(job,), name="network-scan", daemon=True
+        ).start()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[ScanJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+
+scanner = Scanner()
@@ -0,0 +1,296 @@
+import asyncio
+import logging
+import threading
+import time
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from app import config, models
+
+logger = logging.getLogger("root")
+
+
+def device_key(device: models.DeviceCreate) -> str:
+    """
+    This function returns the key used to identify a device in server-side caches.
+
+    Devices are identified by their address rather than their ID, since the same
+    logging device can be added with different IDs in different sessions.
+
+    Args:
+        device (models.DeviceCreate): The device
+
+    Returns:
+        str: The key of the device
+    """
+    return f"{device.ip}:{device.port}"
+
+
+class SessionPool:
+    """
+    Pool of keep-alive HTTP sessions, one per logging device.
+
+    Each session owns its own connection pool, so consecutive requests to the
+    same device reuse an open TCP connection instead of opening a new one.
+    Sessions that have not been used for `idle_timeout` seconds are closed, unless
+    they still have requests in flight, e.g. a streamed log download. Requests are
+    tracked from `acquire` until `release`, which also counts as a use.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = config.POOL_SIZE,
+        idle_timeout: float = config.POOL_IDLE_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._sessions: dict[str, requests.Session] = {}
+        self._last_used: dict[str, float] = {}
+        self._in_use: dict[str, int] = {}
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            pool_block=False,
+        )
+        session.mount("http://", adapter)
+        return session
+
+    def _evict_idle(self) -> None:
+        now = time.monotonic()
+        idle_keys = [
+            key
+            for key, last_used in self._last_used.items()
+            if now - last_used > self.idle_timeout and not self._in_use.get(key)
+        ]
+
+        for key in idle_keys:
+            logger.info("Closing idle session for device %s", key)
+            self._sessions.pop(key).close()
+            del self._last_used[key]
+            self._in_use.pop(key, None)
+
+    def _get(self, key: str) -> requests.Session:
+        # Must be called with the lock held
+        self._evict_idle()
+
+        if key not in self._sessions:
+            self._sessions[key] = self._create_session()
+
+        self._last_used[key] = time.monotonic()
+        return self._sessions[key]
+
+    def get(self, device: models.DeviceCreate) -> requests.Session:
+        """
+        This function returns the session for the given device and creates it if
+        necessary.
+
+        Args:
+            device (models.DeviceCreate): The device
+
+        Returns:
+            requests.Session: The session of the device
+        """
+        with self._lock:
+            return self._get(device_key(device))
+
+    def acquire(self, device: models.DeviceCreate) -> requests.Session:
+        """
+        This function returns the session for the given device like `get` and marks
+        it as in use until `release` is called, so that it is not closed while a
+        request is in flight.
+
+        Args:
+            device (models.DeviceCreate): The device
+
+        Returns:
+            requests.Session: The session of the device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            session = self._get(key)
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+            return session
+
+    def release(self, device: models.DeviceCreate) -> None:
+        """
+        This function marks a request acquired with `acquire` as finished.
+
+        Args:
+            device (models.DeviceCreate): The device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            if self._in_use.get(key, 0) > 1:
+                self._in_use[key] -= 1
+            else:
+                self._in_use.pop(key, None)
+
+            if key in self._last_used:
+                self._last_used[key] = time.monotonic()
+
+    def limit(self, device: models.DeviceCreate) -> threading.BoundedSemaphore:
+        """
+        This function returns the semaphore that limits long-running requests to
+        the given device, e.g. log downloads, to the size of its connection pool.
+
+        Args:
+            device (models.DeviceCreate): The device
+
+        Returns:
+            threading.BoundedSemaphore: The semaphore of the device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            if key not in self._semaphores:
+                self._semaphores[key] = threading.BoundedSemaphore(self.pool_size)
+
+            return self._semaphores[key]
+
+    def close(self, device: models.DeviceCreate) -> None:
+        """
+        This function closes the session of the given device, if there is one.
+
+        Args:
+            device (models.DeviceCreate): The device
+        """
+        key = device_key(device)
+
+        with self._lock:
+            session = self._sessions.pop(key, None)
+            self._last_used.pop(key, None)
+            self._in_use.pop(key, None)
+
+        if session is not None:
+            logger.info("Closed session for device %s", key)
+            session.close()
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        This function returns the number of new and reused connections per device.
+
+        Returns:
+            dict[str, dict[str, int]]: The connection counters keyed by device
+        """
+        with self._lock:
+            sessions = list(self._sessions.items())
+
+        stats = {}
+        for key, session in sessions:
+            # Only read the existing pools, creating one would evict the open one
+            pools = session.get_adapter(f"http://{key}/").poolmanager.pools
+            num_requests = num_connections = 0
+
+            for pool_key in pools.keys():
+                connection_pool = pools.get(pool_key)
+
+                if connection_pool is not None:
+                    num_requests += connection_pool.num_requests
+                    num_connections += connection_pool.num_connections
+
+            stats[key] = {
+                "requests": num_requests,
+                "new": num_connections,
+                "reused": num_requests - num_connections,
+            }
+
+        return stats
+
+
+session_pool = SessionPool()
+
+
+class AsyncSessionPool:
+    """
+    Shared async HTTP clients for the requests of `app.async_api`.
+
+    An async client is bound to the event loop it is used in, so one client is
+    kept per running event loop and shared by all devices. Its connections are kept
+    alive and reused, and a semaphore per device limits the number of concurrent
+    requests to each device to `pool_size`, so that hundreds of requests can be
+    gathered without overloading a single device. Clients must be closed with
+    `aclose` before their event loop is closed.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = config.POOL_SIZE,
+        idle_timeout: float = config.POOL_IDLE_TIMEOUT,
+    ) -> None:
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._semaphores: dict[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def get(self) -> httpx.AsyncClient:
+        """
+        This function returns the client of the running event loop and creates it
+        if necessary.
+
+        Returns:
+            httpx.AsyncClient: The client of the running event loop
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            if loop not in self._clients:
+                self._clients[loop] = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=None,
+                        max_keepalive_connections=None,
+                        keepalive_expiry=self.idle_timeout,
+                    )
+                )
+                self._semaphores[loop] = {}
+
+            return self._clients[loop]
+
+    def limit(self, device: models.DeviceCreate) -> asyncio.Semaphore:
+        """
+        This function returns the semaphore that limits the concurrent requests to
+        the given device within the running event loop.
+
+        Args:
+            device (models.DeviceCreate): The device
+
+        Returns:
+            asyncio.Semaphore: The semaphore of the device
+        """
+        loop = asyncio.get_running_loop()
+        key = device_key(device)
+
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+
+            if key not in semaphores:
+                semaphores[key] = asyncio.Semaphore(self.pool_size)
+
+            return semaphores[key]
+
+    async def aclose(self) -> None:
+        """
+        This function closes the client of the running event loop, if there is one.
+        """
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            client = self._clients.pop(loop, None)
+            self._semaphores.pop(loop, None)
+
+        if client is not None:
+            await client.aclose()
+
+
+async_session_pool = AsyncSessionPool()
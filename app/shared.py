@@ -0,0 +1,387 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app import config, models
+from app.sessions import device_key
+
+logger = logging.getLogger("root")
+
+LEADER_NAME = "poller"
+
+
+class SharedCache:
+    """
+    Status and inventory cache shared between the gunicorn workers on one host.
+
+    The cache is a SQLite database in WAL mode, so that all workers can read it
+    concurrently while one of them writes. The workers elect a leader using a
+    lease that the leader renews while it is alive. Only the leader polls the
+    devices and writes the status of each RTS, the other workers register the RTS
+    they display and read the status from the cache. If the leader stops renewing
+    its lease, e.g. because its worker was restarted, another worker takes over
+    once the lease has expired.
+    """
+
+    def __init__(
+        self,
+        path: str = config.SHARED_CACHE_PATH,
+        lease: float = config.LEADER_LEASE,
+    ) -> None:
+        self.path = path
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS leader (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS watched (
+                device TEXT NOT NULL,
+                rts_id TEXT NOT NULL,
+                device_json TEXT NOT NULL,
+                watched_at REAL NOT NULL,
+                poked INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (device, rts_id)
+            );
+            CREATE TABLE IF NOT EXISTS status (
+                device TEXT NOT NULL,
+                rts_id TEXT NOT NULL,
+                device_json TEXT NOT NULL,
+                status_json TEXT NOT NULL,
+                PRIMARY KEY (device, rts_id)
+            );
+            CREATE TABLE IF NOT EXISTS following (
+                device TEXT NOT NULL,
+                rts_id TEXT NOT NULL,
+                device_json TEXT NOT NULL,
+                PRIMARY KEY (device, rts_id)
+            );
+            CREATE TABLE IF NOT EXISTS inventory (
+                device TEXT PRIMARY KEY,
+                fetched REAL NOT NULL,
+                rts_json TEXT NOT NULL
+            );
+            INSERT OR IGNORE INTO meta (name, value) VALUES ('version', 0);
+            """)
+        connection.commit()
+        self._connection = connection
+        return connection
+
+    def _bump_version(self, connection: sqlite3.Connection) -> None:
+        connection.execute("UPDATE meta SET value = value + 1 WHERE name = 'version'")
+
+    def acquire_leadership(self, owner: str) -> bool:
+        """
+        This function acquires or renews the leader lease for the given owner.
+
+        Args:
+            owner (str): The unique ID of the worker
+
+        Returns:
+            bool: Whether the worker holds the lease
+        """
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO leader (name, owner, expires) VALUES (?, ?, ?)
+                    ON CONFLICT (name) DO UPDATE
+                    SET owner = excluded.owner, expires = excluded.expires
+                    WHERE leader.owner = excluded.owner OR leader.expires < ?
+                    """,
+                    (LEADER_NAME, owner, now + self.lease, now),
+                )
+            row = connection.execute(
+                "SELECT owner FROM leader WHERE name = ?", (LEADER_NAME,)
+            ).fetchone()
+
+        return row is not None and row[0] == owner
+
+    def watch(self, device: models.Device, rts_id: str) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """
+                    INSERT INTO watched (device, rts_id, device_json, watched_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT (device, rts_id) DO UPDATE
+                    SET device_json = excluded.device_json,
+                        watched_at = excluded.watched_at
+                    """,
+                    (
+                        device_key(device),
+                        str(rts_id),
+                        device.model_dump_json(),
+                        time.time(),
+                    ),
+                )
+
+    def poke(self, device: models.DeviceCreate, rts_id: Optional[str] = None) -> None:
+        query = "UPDATE watched SET poked = 1 WHERE device = ?"
+        params: tuple = (device_key(device),)
+
+        if rts_id is not None:
+            query += " AND rts_id = ?"
+            params += (str(rts_id),)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(query, params)
+
+    def forget_device(self, device: models.DeviceCreate) -> None:
+        key = device_key(device)
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute("DELETE FROM watched WHERE device = ?", (key,))
+                connection.execute("DELETE FROM status WHERE device = ?", (key,))
+                connection.execute("DELETE FROM inventory WHERE device = ?", (key,))
+                connection.execute("DELETE FROM following WHERE device = ?", (key,))
+                self._bump_version(connection)
+
+    def get_watched(
+        self, watch_timeout: float, reset_pokes: bool = True
+    ) -> tuple[dict[tuple[str, str], tuple[models.Device, float]], set]:
+        """
+        This function returns the RTS watched by any worker and resets their pokes.
+        RTS that have not been watched for `watch_timeout` seconds are removed.
+
+        Args:
+            watch_timeout (float): The time after which an RTS is no longer watched
+            reset_pokes (bool): Whether to reset the pokes and remove the expired
+                RTS, only the leader does so, the other workers only read the RTS
+
+        Returns:
+            dict[tuple[str, str], tuple[models.Device, float]]: The device and the
+                seconds since the RTS was last watched, keyed by device key and
+                RTS ID
+            set: The keys of the RTS that have been poked
+        """
+        now = time.time()
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if reset_pokes:
+                    connection.execute(
+                        "DELETE FROM watched WHERE watched_at < ?",
+                        (now - watch_timeout,),
+                    )
+                rows = connection.execute(
+                    "SELECT device, rts_id, device_json, watched_at, poked FROM watched "
+                    "WHERE watched_at >= ?",
+                    (now - watch_timeout,),
+                ).fetchall()
+                if reset_pokes:
+                    connection.execute("UPDATE watched SET poked = 0 WHERE poked = 1")
+
+        devices: dict[str, models.Device] = {}
+        watched = {}
+        poked = set()
+
+        for key, rts_id, device_json, watched_at, is_poked in rows:
+            if key not in devices:
+                devices[key] = models.Device.model_validate_json(device_json)
+
+            watched[(key, rts_id)] = (devices[key], now - watched_at)
+            if is_poked:
+                poked.add((key, rts_id))
+
+        return watched, poked
+
+    def put_statuses(
+        self,
+        device: models.Device,
+        statuses: dict[str, models.RTSStatus],
+        changed: bool,
+    ) -> None:
+        key = device_key(device)
+        device_json = device.model_dump_json()
+
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(
+                    """
+                    INSERT OR REPLACE INTO status
+                    (device, rts_id, device_json, status_json) VALUES (?, ?, ?, ?)
+                    """,
+                    [
+                        (key, rts_id, device_json, status.model_dump_json())
+                        for rts_id, status in statuses.items()
+                    ],
+                )
+                connection.execute("""
+                    DELETE FROM status WHERE NOT EXISTS (
+                        SELECT 1 FROM watched
+                        WHERE watched.device = status.device
+                        AND watched.rts_id = status.rts_id
+                    )
+                    """)
+
+                if changed:
+                    self._bump_version(connection)
+
+    def get_version(self) -> int:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM meta WHERE name = 'version'")
+                .fetchone()
+            )
+
+        return row[0]
+
+    def get_statuses(
+        self,
+    ) -> tuple[int, dict[tuple[str, str], tuple[models.Device, models.RTSStatus]]]:
+        """
+        This function returns the latest status of all polled RTS.
+
+        Returns:
+            int: The version of the statuses
+            dict[tuple[str, str], tuple[models.Device, models.RTSStatus]]: The device
+                and status keyed by device key and RTS ID
+        """
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                version = connection.execute(
+                    "SELECT value FROM meta WHERE name = 'version'"
+                ).fetchone()[0]
+                rows = connection.execute(
+                    "SELECT device, rts_id, device_json, status_json FROM status"
+                ).fetchall()
+
+        devices: dict[str, models.Device] = {}
+        statuses = {}
+
+        for key, rts_id, device_json, status_json in rows:
+            if key not in devices:
+                devices[key] = models.Device.model_validate_json(device_json)
+
+            statuses[(key, rts_id)] = (
+                devices[key],
+                models.RTSStatus.model_validate_json(status_json),
+            )
+
+        return version, statuses
+
+    def set_following(
+        self, device: models.Device, rts_id: str, following: bool
+    ) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                if following:
+                    connection.execute(
+                        """
+                        INSERT OR REPLACE INTO following (device, rts_id, device_json)
+                        VALUES (?, ?, ?)
+                        """,
+                        (device_key(device), str(rts_id), device.model_dump_json()),
+                    )
+                else:
+                    connection.execute(
+                        "DELETE FROM following WHERE device = ? AND rts_id = ?",
+                        (device_key(device), str(rts_id)),
+                    )
+
+    def get_following(self) -> dict[tuple[str, str], models.Device]:
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute("SELECT device, rts_id, device_json FROM following")
+                .fetchall()
+            )
+
+        return {
+            (key, rts_id): models.Device.model_validate_json(device_json)
+            for key, rts_id, device_json in rows
+        }
+
+    def get_rts(
+        self, device: models.DeviceCreate, ttl: float
+    ) -> Optional[list[models.RTS_API]]:
+        """
+        This function returns the cached RTS of a device, if they have been fetched
+        less than `ttl` seconds ago by any worker.
+
+        Args:
+            device (models.DeviceCreate): The device
+            ttl (float): The maximum age of the cached RTS in seconds
+
+        Returns:
+            Optional[list[models.RTS_API]]: The RTS or None if there is no fresh
+                entry
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT fetched, rts_json FROM inventory WHERE device = ?",
+                    (device_key(device),),
+                )
+                .fetchone()
+            )
+
+        if row is None or time.time() - row[0] >= ttl:
+            return None
+
+        return [models.RTS_API(**rts) for rts in json.loads(row[1])]
+
+    def put_rts(self, device: models.DeviceCreate, rts_list: list[models.RTS_API]):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    """
+                    INSERT OR REPLACE INTO inventory (device, fetched, rts_json)
+                    VALUES (?, ?, ?)
+                    """,
+                    (
+                        device_key(device),
+                        time.time(),
+                        json.dumps([rts.model_dump() for rts in rts_list]),
+                    ),
+                )
+
+    def invalidate_rts(self, device: models.DeviceCreate) -> None:
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "DELETE FROM inventory WHERE device = ?", (device_key(device),)
+                )
+
+
+shared_cache = SharedCache() if config.SHARED_CACHE else None
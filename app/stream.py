@@ -0,0 +1,150 @@
+import json
+import logging
+import time
+from typing import Iterator, Optional
+
+from app import app, config, models
+from app.commands import command_view
+from app.inventory import inventory
+from app.poller import poller
+from app.registry import registry
+
+logger = logging.getLogger("root")
+
+# Well within the watch timeout of the poller
+WATCH_INTERVAL = config.POLL_WATCH_TIMEOUT / 4
+
+STATUS_ICONS = {
+    True: app.get_asset_url("status-success.svg"),
+    False: app.get_asset_url("status-error.svg"),
+    None: app.get_asset_url("status-unknown.svg"),
+}
+
+
+def format_position(position: dict) -> str:
+    return (
+        f"{float(position['pos_x']):.2f}, "
+        f"{float(position['pos_y']):.2f}, "
+        f"{float(position['pos_z']):.2f}"
+    )
+
+
+def rts_view(rts_status: Optional[models.RTSStatus]) -> dict:
+    """
+    This function converts the polled status of an RTS into the values displayed in
+    its list item.
+
+    Args:
+        rts_status (Optional[models.RTSStatus]): The polled status of the RTS or None
+            if it has not been polled yet
+
+    Returns:
+        dict: The serial and tracking status icons, the number of recorded positions
+            and the newest position as a string
+    """
+    if rts_status is None:
+        return {
+            "serial": STATUS_ICONS[None],
+            "tracking": STATUS_ICONS[None],
+            "count": "0",
+            "position": "0.00, 0.00, 0.00",
+        }
+
+    if None in [rts_status.tracking, rts_status.connection]:
+        return {
+            "serial": STATUS_ICONS[False],
+            "tracking": STATUS_ICONS[False],
+            "count": "0",
+            "position": "0.00, 0.00, 0.00",
+        }
+
+    return {
+        "serial": STATUS_ICONS[bool(rts_status.connection["connected"])],
+        "tracking": STATUS_ICONS[bool(rts_status.tracking["active"])],
+        "count": str(rts_status.tracking["positions"]),
+        "position": format_position(rts_status.position),
+    }
+
+
+def target_view(position: dict) -> dict:
+    return {"position": format_position(position), "device": str(position["device"])}
+
+
+def watch_all() -> list[tuple[models.Device, str]]:
+    """
+    This function registers all RTS of all registered devices with the poller.
+
+    Returns:
+        list[tuple[models.Device, str]]: The watched devices and RTS IDs
+    """
+    watched = []
+
+    for device in registry.all():
+        for rts in inventory.get_rts(device):
+            poller.watch(device=device, rts_id=rts.id)
+            watched.append((device, rts.id))
+
+    return watched
+
+
+def status_events(keepalive: float = 5.0, max_duration: float = 300.0) -> Iterator[str]:
+    """
+    This function yields Server-Sent Events with the status changes of all RTS,
+    including the state of the last command sent to each RTS.
+
+    Only the RTS whose displayed values changed since the last event are sent.
+    The RTS of all devices are watched again every `WATCH_INTERVAL` seconds. The
+    stream ends after `max_duration` seconds, after which the browser reconnects
+    automatically. This keeps long-lived connections from piling up in the
+    workers.
+
+    Args:
+        keepalive (float): Seconds after which a comment is sent if nothing changed
+        max_duration (float): Seconds after which the stream ends
+
+    Yields:
+        str: The encoded events
+    """
+    last_views: dict[tuple[int, str], dict] = {}
+    last_target: Optional[dict] = None
+    version = -1
+    start = time.monotonic()
+    watched: list[tuple[models.Device, str]] = []
+    watched_at = -float("inf")
+
+    yield "retry: 2000\n\n"
+
+    while time.monotonic() - start < max_duration:
+        rts_updates = []
+
+        # The inventory and the watches are refreshed on their own timer instead
+        # of on every change
+        if time.monotonic() - watched_at > WATCH_INTERVAL:
+            watched = watch_all()
+            watched_at = time.monotonic()
+
+        for device, rts_id in watched:
+            view = rts_view(poller.get_status(device=device, rts_id=rts_id))
+            view["command"] = command_view(device=device, rts_id=rts_id)
+
+            if last_views.get((device.id, rts_id)) != view:
+                last_views[(device.id, rts_id)] = view
+                rts_updates.append({"device_id": device.id, "rts_id": rts_id, **view})
+
+        target_position = poller.get_target_position()
+        target = target_view(target_position)
+        event: dict = {}
+
+        if rts_updates:
+            event["rts"] = rts_updates
+
+        if target != last_target:
+            last_target = target
+            event["target"] = {**target, "data": target_position}
+
+        if event:
+            yield f"data: {json.dumps(event)}\n\n"
+        else:
+            yield ": keepalive\n\n"
+
+        version = poller.wait_for_change(version, timeout=keepalive)
@@ -0,0 +1,219 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from app import config
+from app.history import Trajectory, history
+from app.inventory import inventory
+from app.registry import registry
+
+logger = logging.getLogger("root")
+
+ALL_RTS = "all"
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    This function selects the points of a line that preserve its visual shape best
+    using the Largest-Triangle-Three-Buckets algorithm.
+
+    The points are split into `threshold - 2` buckets of equal size. From each
+    bucket, the point forming the largest triangle with the previously selected
+    point and the average of the next bucket is selected. The first and last point
+    are always kept.
+
+    Args:
+        x (np.ndarray): The x coordinates of the points
+        y (np.ndarray): The y coordinates of the points
+        threshold (int): The number of points to select
+
+    Returns:
+        np.ndarray: The indices of the selected points in ascending order
+    """
+    num_points = len(x)
+
+    if threshold >= num_points or threshold < 3:
+        return np.arange(num_points)
+
+    edges = np.linspace(1, num_points - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = num_points - 1
+
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else num_points
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+
+        prev_x, prev_y = x[selected[i]], y[selected[i]]
+        areas = np.abs(
+            (prev_x - next_x) * (y[start:end] - prev_y)
+            - (prev_x - x[start:end]) * (next_y - prev_y)
+        )
+        selected[i + 1] = start + int(np.argmax(areas))
+
+    return selected
+
+
+def get_trajectory_keys(selection: Optional[str]) -> list[tuple[int, str, str]]:
+    """
+    This function returns the RTS shown in the trajectory plot for the given
+    selection.
+
+    Args:
+        selection (Optional[str]): Either ALL_RTS or "<device_id>:<rts_id>"
+
+    Returns:
+        list[tuple[int, str, str]]: The device ID, RTS ID and label of each RTS
+    """
+    keys = []
+
+    for device in registry.all():
+        for rts in inventory.get_rts(device):
+            value = f"{device.id}:{rts.id}"
+
+            if selection in (None, ALL_RTS, value):
+                keys.append((device.id, str(rts.id), f"{device.name} / {rts.name}"))
+
+    return keys
+
+
+def get_trajectory_options() -> list[dict]:
+    options = [{"label": "All RTS", "value": ALL_RTS}]
+    options.extend(
+        {"label": label, "value": f"{device_id}:{rts_id}"}
+        for device_id, rts_id, label in get_trajectory_keys(ALL_RTS)
+    )
+    return options
+
+
+def _window(device_id: int, rts_id: str, start: Optional[float] = None) -> Trajectory:
+    device = registry.get(device_id)
+    trajectory = history.window(device, rts_id, start=start)
+
+    if start is None:
+        return trajectory
+
+    # The window includes the start, but only newer points are of interest
+    newer = trajectory.timestamp > start
+    return Trajectory(*(field[newer] for field in trajectory))
+
+
+def create_figure(
+    keys: list[tuple[int, str, str]], max_points: int = config.PLOT_MAX_POINTS
+) -> tuple[go.Figure, dict]:
+    """
+    This function creates the trajectory figure with a plan view and the height
+    over time of the given RTS.
+
+    Long trajectories are downsampled using LTTB to at most `max_points` points
+    per trace, separately for the plan view and the height over time.
+
+    Args:
+        keys (list[tuple[int, str, str]]): The device ID, RTS ID and label of each RTS
+        max_points (int): The maximum number of points per trace
+
+    Returns:
+        go.Figure: The figure
+        dict: The state needed to extend the figure with new positions
+    """
+    figure = make_subplots(
+        rows=1,
+        cols=2,
+        column_widths=[0.5, 0.5],
+        subplot_titles=("Plan", "Height"),
+    )
+    state: dict = {"keys": [], "last": [], "points": 0}
+
+    for device_id, rts_id, label in keys:
+        trajectory = _window(device_id, rts_id)
+        plan = lttb(trajectory.pos_x, trajectory.pos_y, max_points)
+        height = lttb(trajectory.timestamp, trajectory.pos_z, max_points)
+
+        figure.add_trace(
+            go.Scattergl(
+                x=trajectory.pos_x[plan],
+                y=trajectory.pos_y[plan],
+                mode="lines",
+                name=label,
+                legendgroup=label,
+            ),
+            row=1,
+            col=1,
+        )
+        figure.add_trace(
+            go.Scattergl(
+                x=trajectory.timestamp[height] * 1000,
+                y=trajectory.pos_z[height],
+                mode="lines",
+                name=label,
+                legendgroup=label,
+                showlegend=False,
+            ),
+            row=1,
+            col=2,
+        )
+
+        state["keys"].append([device_id, rts_id])
+        state["last"].append(
+            float(trajectory.timestamp[-1]) if len(trajectory.timestamp) else None
+        )
+        state["points"] = max(state["points"], len(plan), len(height))
+
+    figure.update_xaxes(title_text="East [m]", row=1, col=1)
+    figure.update_yaxes(
+        title_text="North [m]", scaleanchor="x", scaleratio=1, row=1, col=1
+    )
+    figure.update_xaxes(type="date", row=1, col=2)
+    figure.update_yaxes(title_text="Up [m]", row=1, col=2)
+    figure.update_layout(
+        margin={"l": 40, "r": 20, "t": 40, "b": 40},
+        uirevision="trajectory",
+        legend={"orientation": "h"},
+    )
+    return figure, state
+
+
+def extend_figure(state: dict) -> tuple[Optional[list], dict]:
+    """
+    This function collects the positions recorded since the figure was created or
+    last extended.
+
+    Args:
+        state (dict): The state returned by `create_figure` or this function
+
+    Returns:
+        Optional[list]: The value for the extendData property of the graph or None
+            if there are no new positions
+        dict: The updated state
+    """
+    plan_x, plan_y, height_x, height_y, indices = [], [], [], [], []
+    last = list(state["last"])
+    new_points = 0
+
+    for i, (device_id, rts_id) in enumerate(state["keys"]):
+        trajectory = _window(device_id, rts_id, start=last[i])
+
+        if not len(trajectory.timestamp):
+            continue
+
+        plan_x.append(trajectory.pos_x.tolist())
+        plan_y.append(trajectory.pos_y.tolist())
+        height_x.append((trajectory.timestamp * 1000).tolist())
+        height_y.append(trajectory.pos_z.tolist())
+        indices.append(2 * i)
+        last[i] = float(trajectory.timestamp[-1])
+        new_points = max(new_points, len(trajectory.timestamp))
+
+    if not indices:
+        return None, state
+
+    extend_data = [
+        {"x": plan_x + height_x, "y": plan_y + height_y},
+        indices + [index + 1 for index in indices],
+    ]
+    return extend_data, {**state, "last": last, "points": state["points"] + new_points}
@@ -4,6 +4,48 @@ from app import models
 
 logger = logging.getLogger("root")
 
+DEFAULT_POSITION = {
+    "timestamp": 0.0,
+    "device": "-",
+    "pos_x": 0.0,
+    "pos_y": 0.0,
+    "pos_z": 0.0,
+}
+
+
+def get_newest_position(tracking_response: dict, rts_target_position: dict) -> dict:
+    """
+    This function returns the newest position from the tracking response and the current
+    stored position.
+
+    Args:
+        tracking_response (dict): The tracking response from the device
+        rts_target_position (dict): The current stored position
+
+    Returns:
+        dict: The newest position
+    """
+    current_position = rts_target_position or DEFAULT_POSITION
+
+    if tracking_response is None:
+        return current_position
+
+    tracking_status = tracking_response["active"]
+
+    if tracking_status:
+        position = {
+            k: v
+            for k, v in tracking_response.items()
+            if k in ["timestamp", "pos_x", "pos_y", "pos_z", "device"]
+        }
+    else:
+        position = DEFAULT_POSITION
+
+    if float(position["timestamp"]) > float(current_position["timestamp"]):
+        current_position = position
+
+    return current_position
+
 
 def logs_to_dropdown_options(log_list: list[models.Log]) -> list[dict]:
     return [
@@ -15,34 +57,12 @@ def logs_to_dropdown_options(log_list: list[models.Log]) -> list[dict]:
     ]
 
 
-def devices_to_dropdown_options(device_storage: dict[str, dict]) -> list[dict]:
-    return [
-        {"label": device["name"], "value": device["id"]}
-        for device in device_storage.values()
-    ]
+def devices_to_dropdown_options(devices: list[models.Device]) -> list[dict]:
+    return [{"label": device.name, "value": device.id} for device in devices]
 
 
 class DeviceNotFound(Exception):
-    """Exception raised when a device is not found in the device storage."""
-
-
-def get_device_from_storage(
-    device_id: int, device_storage: dict[str, dict]
-) -> models.Device:
-    """
-    This function returns the device with the given ID from the device storage.
-
-    Args:
-        device_id (int): The ID of the device
-        device_storage (dict[str, dict]): The current device storage
-
-    Returns:
-        models.Device: The device with the given ID
-    """
-    if str(device_id) not in device_storage:
-        raise DeviceNotFound(f"Device with ID {device_id} not found")
-
-    return models.Device(**device_storage[str(device_id)])
+    """Exception raised when a device is not found in the device registry."""
 
 
 def get_button_index(n_clicks: list[None | int]) -> int:
@@ -0,0 +1,43 @@
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Keep the registry and caches of the tests out of the data directory
+_data = tempfile.mkdtemp(prefix="rts-dashboard-tests-")
+os.environ.setdefault("RTS_DASHBOARD_DATABASE", os.path.join(_data, "registry.db"))
+os.environ.setdefault("RTS_DASHBOARD_LOG_CACHE", os.path.join(_data, "logs"))
+os.environ.setdefault(
+    "RTS_DASHBOARD_SHARED_CACHE_PATH", os.path.join(_data, "shared-cache.db")
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Answers every GET request with an empty JSON list
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps([]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def http_device():
+    # Imported here, so that the environment above is set before the app is loaded
+    from app import models
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield models.Device(id=1, name="device", ip="127.0.0.1", port=server.server_port)
+    server.shutdown()
+    server.server_close()
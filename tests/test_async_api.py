@@ -0,0 +1,24 @@
+import asyncio
+
+from app import async_api
+from app.sessions import async_session_pool
+
+
+def test_streamed_response_holds_the_device_limit(monkeypatch, http_device):
+    monkeypatch.setattr(async_session_pool, "pool_size", 1)
+
+    async def scenario() -> None:
+        try:
+            response = await async_api.stream_log(http_device, 1)
+            second = asyncio.create_task(async_api.get_rts(http_device))
+            await asyncio.sleep(0.2)
+
+            # The only slot is taken until the streamed body is closed
+            assert not second.done()
+
+            await response.aclose()
+            assert await asyncio.wait_for(second, timeout=2) == []
+        finally:
+            await async_api.close()
+
+    asyncio.run(scenario())
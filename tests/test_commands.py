@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app import commands as commands_module
+from app import models
+from app.commands import CommandKind, CommandQueue, CommandState
+
+DEVICE = models.Device(id=1, name="device", ip="127.0.0.1", port=8000)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    # Block the first command, so that the following ones stay queued
+    release = threading.Event()
+    sent = []
+
+    async def execute(self, device, command):
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+        sent.append(command.kind)
+        return True
+
+    monkeypatch.setattr(CommandQueue, "_execute", execute)
+    monkeypatch.setattr(commands_module.poller, "poke", lambda **kwargs: None)
+    monkeypatch.setattr(commands_module.poller, "notify_change", lambda: None)
+    queue = CommandQueue()
+    yield queue, release, sent
+    release.set()
+
+
+def test_stop_cancels_queued_start_and_is_still_sent(queue):
+    queue, release, sent = queue
+    running = queue.submit(DEVICE, "1", CommandKind.TEST)
+    start = queue.submit(DEVICE, "1", CommandKind.START)
+    stop = queue.submit(DEVICE, "1", CommandKind.STOP)
+
+    assert stop is not start
+    assert start.state == CommandState.CANCELLED
+    assert stop.state == CommandState.QUEUED
+
+    release.set()
+    assert queue.schedule(queue.wait(stop)).result(timeout=5) is stop
+    assert stop.state == CommandState.DONE
+    assert running.state == CommandState.DONE
+    assert sent == [CommandKind.TEST, CommandKind.STOP]
+
+
+def _wait_until_running(command) -> None:
+    deadline = time.monotonic() + 5
+
+    while command.state != CommandState.RUNNING and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_same_kind_is_coalesced(queue):
+    queue, release, sent = queue
+    _wait_until_running(queue.submit(DEVICE, "1", CommandKind.TEST))
+    first = queue.submit(
+        DEVICE,
+        "1",
+        CommandKind.TURN_TO_TARGET,
+        target=models.Position(north=1, east=0, up=0),
+    )
+    second = queue.submit(
+        DEVICE,
+        "1",
+        CommandKind.TURN_TO_TARGET,
+        target=models.Position(north=2, east=0, up=0),
+    )
+
+    assert second is first
+    assert first.target.north == 2
+    assert queue.get_pending(DEVICE, "1") == 1
+
+
+def test_commands_to_many_rts_run_concurrently(monkeypatch):
+    # Each command takes 0.2 s, so running them one after another would take 20 s
+    async def execute(self, device, command):
+        await asyncio.sleep(0.2)
+        return True
+
+    monkeypatch.setattr(CommandQueue, "_execute", execute)
+    monkeypatch.setattr(commands_module.poller, "poke", lambda **kwargs: None)
+    monkeypatch.setattr(commands_module.poller, "notify_change", lambda: None)
+    queue = CommandQueue()
+    submitted = [
+        queue.submit(DEVICE, str(rts_id), CommandKind.START) for rts_id in range(100)
+    ]
+
+    async def wait_all():
+        return await asyncio.gather(*(queue.wait(command) for command in submitted))
+
+    finished = queue.schedule(wait_all()).result(timeout=5)
+    assert all(command.state == CommandState.DONE for command in finished)
@@ -0,0 +1,62 @@
+import io
+import random
+import tempfile
+import zipfile
+
+from app import export, models
+
+
+def _entry(log_id: str) -> export.ExportEntry:
+    return export.ExportEntry(
+        device=models.Device(id=1, name="device", ip="127.0.0.1", port=8000),
+        rts=models.RTS_API(
+            id="1",
+            name="rts",
+            baudrate=9600,
+            port="/dev/ttyUSB0",
+            timeout=1,
+            parity="N",
+            stopbits=1,
+            bytesize=8,
+        ),
+        log=models.Log(
+            id=log_id, rts_id="1", path=f"/logs/{log_id}.csv", active=False, name=log_id
+        ),
+    )
+
+
+def _log_content() -> bytes:
+    rng = random.Random(0)
+    lines = [
+        f"{1700000000 + i * 0.1:.1f},{rng.uniform(-50, 50):.4f},"
+        f"{rng.uniform(-50, 50):.4f},{rng.uniform(0, 5):.4f}\n"
+        for i in range(20000)
+    ]
+    return "".join(lines).encode()
+
+
+def _archive(monkeypatch, compresslevel: int) -> bytes:
+    content = _log_content()
+
+    def download(entry):
+        file = tempfile.TemporaryFile()
+        file.write(content)
+        file.seek(0)
+        return file
+
+    monkeypatch.setattr(export, "_download", download)
+    return b"".join(export.stream_archive([_entry("1")], compresslevel=compresslevel))
+
+
+def test_compression_level_changes_archive_size(monkeypatch):
+    sizes = {level: len(_archive(monkeypatch, level)) for level in (0, 1, 9)}
+
+    assert sizes[0] > sizes[1] > sizes[9]
+
+
+def test_archive_contains_logs_and_manifest(monkeypatch):
+    data = _archive(monkeypatch, 6)
+
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.namelist() == ["device/rts/1_1.csv", "manifest.csv"]
+        assert archive.read("device/rts/1_1.csv") == _log_content()
@@ -0,0 +1,45 @@
+import pytest
+
+from app import health as health_module
+from app import models
+from app.breaker import BreakerState
+from app.health import HealthChecker
+
+DEVICE = models.Device(id=1, name="device", ip="127.0.0.1", port=8000)
+
+
+def _check(
+    monkeypatch, state: BreakerState, reachable: bool
+) -> tuple[HealthChecker, list]:
+    probes = []
+
+    async def validate_device_connection(device):
+        probes.append(device)
+        return reachable
+
+    monkeypatch.setattr(health_module.api, "get_breaker_state", lambda device: state)
+    monkeypatch.setattr(
+        health_module.async_api,
+        "validate_device_connection",
+        validate_device_connection,
+    )
+    checker = HealthChecker()
+    checker.check([DEVICE])
+    return checker, probes
+
+
+@pytest.mark.parametrize("state", [BreakerState.OPEN, BreakerState.HALF_OPEN])
+def test_device_in_backoff_is_not_probed(monkeypatch, state):
+    checker, probes = _check(monkeypatch, state, reachable=False)
+
+    assert probes == []
+    assert checker.get(DEVICE).state == "backoff"
+    assert len(checker.get_rtt(DEVICE).values()) == 0
+
+
+def test_reachable_device_records_rtt(monkeypatch):
+    checker, probes = _check(monkeypatch, BreakerState.CLOSED, reachable=True)
+
+    assert probes == [DEVICE]
+    assert checker.get(DEVICE).state == "success"
+    assert len(checker.get_rtt(DEVICE).values()) == 1
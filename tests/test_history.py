@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from app import history as history_module
+from app import models
+from app.history import BYTES_PER_POINT, HistoryStore, PositionHistory
+
+DEVICE = models.Device(id=1, name="device", ip="127.0.0.1", port=8000)
+
+
+def _position(timestamp: float) -> dict:
+    return {"timestamp": timestamp, "pos_x": timestamp, "pos_y": 0.0, "pos_z": 0.0}
+
+
+def test_buffer_is_allocated_on_first_append_and_grows_to_capacity(monkeypatch):
+    monkeypatch.setattr(history_module, "INITIAL_POINTS", 4)
+    position_history = PositionHistory(capacity=10)
+
+    assert position_history.nbytes == 0
+
+    position_history.append(_position(1))
+    assert position_history.nbytes == 4 * BYTES_PER_POINT
+
+    for timestamp in range(2, 6):
+        position_history.append(_position(timestamp))
+    assert position_history.nbytes == 8 * BYTES_PER_POINT
+
+    for timestamp in range(6, 30):
+        position_history.append(_position(timestamp))
+    assert position_history.nbytes == 10 * BYTES_PER_POINT
+
+
+@pytest.mark.parametrize("capacity", [1, 5, 100])
+def test_window_matches_the_last_positions(monkeypatch, capacity):
+    monkeypatch.setattr(history_module, "INITIAL_POINTS", 2)
+    position_history = PositionHistory(capacity=capacity)
+    timestamps = np.arange(1, 51, dtype=np.float64)
+
+    for timestamp in timestamps:
+        position_history.append(_position(timestamp))
+
+    kept = timestamps[-capacity:]
+    assert np.array_equal(position_history.window().timestamp, kept)
+    assert np.array_equal(
+        position_history.window(start=40, end=45).timestamp,
+        kept[(kept >= 40) & (kept <= 45)],
+    )
+    assert position_history.last_timestamp == 50
+
+
+def test_window_of_unknown_rts_does_not_create_a_history():
+    store = HistoryStore(capacity=100)
+
+    assert len(store.window(DEVICE, "1").timestamp) == 0
+    assert store._histories == {}
@@ -0,0 +1,37 @@
+import time
+
+from app import models
+from app.poller import Poller
+from app.shared import SharedCache
+
+FIRST = models.Device(id=1, name="first", ip="127.0.0.1", port=8000)
+SECOND = models.Device(id=2, name="second", ip="127.0.0.2", port=8000)
+
+
+def test_follower_rebuilds_watched_rts_from_shared_cache(tmp_path):
+    store = SharedCache(path=str(tmp_path / "shared-cache.db"))
+    poller = Poller(watch_timeout=0.3, store=store)
+
+    store.watch(FIRST, "1")
+    store.watch(SECOND, "1")
+    poller._pull_watched(is_leader=False)
+    assert set(poller._devices) == {"127.0.0.1:8000", "127.0.0.2:8000"}
+
+    # Only the first device is still watched by any worker
+    time.sleep(0.4)
+    store.watch(FIRST, "1")
+    poller._pull_watched(is_leader=False)
+    assert set(poller._devices) == {"127.0.0.1:8000"}
+    assert set(poller._watched) == {("127.0.0.1:8000", "1")}
+
+
+def test_follower_does_not_reset_pokes(tmp_path):
+    store = SharedCache(path=str(tmp_path / "shared-cache.db"))
+    poller = Poller(store=store)
+
+    store.watch(FIRST, "1")
+    store.poke(FIRST, "1")
+    poller._pull_watched(is_leader=False)
+
+    _, poked = store.get_watched(poller.watch_timeout)
+    assert poked == {("127.0.0.1:8000", "1")}
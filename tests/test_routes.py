@@ -0,0 +1,38 @@
+from app import models, routes, server
+from app.registry import registry
+
+
+class _UpstreamResponse:
+    def __init__(self) -> None:
+        self.closed = False
+
+    def iter_content(self, chunk_size: int):
+        yield b"line 1\n"
+        yield b"line 2\n"
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _download(monkeypatch) -> tuple[_UpstreamResponse, object]:
+    upstream = _UpstreamResponse()
+    monkeypatch.setattr(routes.api, "stream_log", lambda device, log_id: upstream)
+    device = registry.add(models.DeviceCreate(ip="127.0.0.1", port=8000, name="dev"))
+    response = server.test_client().get(f"/logs/download/{device.id}/1", buffered=False)
+    return upstream, response
+
+
+def test_download_closes_upstream_after_streaming(monkeypatch):
+    upstream, response = _download(monkeypatch)
+
+    assert b"".join(response.response) == b"line 1\nline 2\n"
+    response.close()
+    assert upstream.closed
+
+
+def test_download_closes_upstream_if_client_disconnects_early(monkeypatch):
+    upstream, response = _download(monkeypatch)
+
+    # The client goes away before the first chunk has been read
+    response.close()
+    assert upstream.closed
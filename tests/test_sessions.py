@@ -0,0 +1,29 @@
+from app import models
+from app.sessions import SessionPool
+
+
+def test_stats_count_reused_connections_without_closing_them(http_device):
+    pool = SessionPool(pool_size=1)
+    url = f"http://{http_device.ip}:{http_device.port}/rts/"
+
+    for _ in range(5):
+        pool.get(http_device).get(url, timeout=1).raise_for_status()
+
+    key = f"{http_device.ip}:{http_device.port}"
+    assert pool.stats()[key] == {"requests": 5, "new": 1, "reused": 4}
+
+    # Reading the stats must not replace the pool of the open connection
+    pool.get(http_device).get(url, timeout=1).raise_for_status()
+    assert pool.stats()[key] == {"requests": 6, "new": 1, "reused": 5}
+
+
+def test_idle_session_in_use_is_not_evicted(http_device):
+    pool = SessionPool(idle_timeout=0)
+    session = pool.acquire(http_device)
+    pool.get(models.Device(id=2, name="other", ip="127.0.0.2", port=http_device.port))
+
+    assert pool.get(http_device) is session
+
+    pool.release(http_device)
+    pool.get(models.Device(id=2, name="other", ip="127.0.0.2", port=http_device.port))
+    assert pool.get(http_device) is not session
@@ -0,0 +1,292 @@
+"""
+Benchmark of the dashboard callbacks against a fleet of mock RTS Servers.
+
+For each fleet size, a mock fleet is started in a separate process, the devices are
+added to a temporary device registry, and the callbacks are called directly, as
+the Dash server would call them, from a number of concurrent clients. For every
+scenario the throughput, the p50 and p99 latency, and the CPU time spent by the
+dashboard process per call are reported.
+
+Usage:
+    python tools/benchmark.py --sizes 1,10,50,100,200 --clients 4
+"""
+
+import argparse
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMP_DIR = tempfile.mkdtemp(prefix="rts-dashboard-benchmark-")
+
+# Keep the benchmark away from the real device registry and log cache
+os.environ["RTS_DASHBOARD_DATABASE"] = os.path.join(TEMP_DIR, "benchmark.db")
+os.environ["RTS_DASHBOARD_LOG_CACHE"] = os.path.join(TEMP_DIR, "logs")
+sys.path.insert(0, ROOT)
+
+from app import api, models  # noqa: E402
+from app.callbacks.rts import (  # noqa: E402
+    render_rts_list,
+    start_all,
+    stop_all,
+    update_tracking_status,
+)
+from app.callbacks.scan import scan_for_devices  # noqa: E402
+from app.inventory import inventory  # noqa: E402
+from app.poller import poller  # noqa: E402
+from app.registry import registry  # noqa: E402
+from app.scanner import scanner  # noqa: E402
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def get_host(index: int) -> str:
+    # Must match the addresses of tools/mock_rts_server.py
+    return f"127.0.{(index + 1) // 256}.{(index + 1) % 256}"
+
+
+def start_fleet(args: argparse.Namespace, devices: int, rts: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(ROOT, "tools", "mock_rts_server.py"),
+            f"--devices={devices}",
+            f"--rts={rts}",
+            f"--port={args.port}",
+            f"--latency={args.latency}",
+            f"--jitter={args.jitter}",
+            f"--failure-rate={args.failure_rate}",
+            f"--log-points={args.log_points}",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 10.0
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((get_host(devices - 1), args.port), 0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+
+    process.kill()
+    raise RuntimeError("Mock fleet did not start")
+
+
+def clear_registry() -> None:
+    for device in registry.all():
+        registry.remove(device.id)
+        poller.forget_device(device)
+        inventory.invalidate(device)
+        api.close_session(device)
+
+
+def measure(
+    name: str, func: Callable[[int], None], calls: int, clients: int
+) -> dict[str, float]:
+    """
+    This function calls `func` `calls` times from `clients` concurrent threads and
+    returns the throughput, latency percentiles and CPU time per call.
+    """
+    latencies: list[float] = []
+
+    def timed_call(i: int) -> None:
+        start = time.perf_counter()
+        func(i)
+        latencies.append(time.perf_counter() - start)
+
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(timed_call, range(calls)))
+
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+
+    return {
+        "scenario": name,
+        "calls": calls,
+        "throughput": calls / elapsed,
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p99_ms": 1000 * percentile(latencies, 99),
+        "cpu_ms": 1000 * cpu / calls,
+    }
+
+
+def run_size(args: argparse.Namespace, size: int) -> list[dict]:
+    rts_per_device = min(size, args.rts_per_device)
+    num_devices = math.ceil(size / rts_per_device)
+    process = start_fleet(args, num_devices, rts_per_device)
+
+    try:
+        clear_registry()
+        devices = [
+            registry.add(
+                models.DeviceCreate(ip=get_host(i), port=args.port, name=f"Mock {i}")
+            )
+            for i in range(num_devices)
+        ]
+        all_rts = [
+            {"device_id": device.id, "rts_id": rts.id}
+            for device in devices
+            for rts in inventory.get_rts(device)
+        ]
+        results = []
+
+        def render_cold(_: int) -> None:
+            for device in devices:
+                inventory.invalidate(device)
+            render_rts_list()
+
+        results.append(
+            measure("render_rts_list (cold)", render_cold, args.calls, args.clients)
+        )
+        results.append(
+            measure(
+                "render_rts_list (cached)",
+                lambda _: render_rts_list(),
+                args.calls,
+                args.clients,
+            )
+        )
+
+        def track(i: int) -> None:
+            trigger = all_rts[i % len(all_rts)]
+            update_tracking_status(
+                0, {"type": "rts-tracking-status-interval", **trigger}
+            )
+
+        # Let the poller fill its snapshot for all watched RTS first
+        for i in range(len(all_rts)):
+            track(i)
+        time.sleep(args.warmup)
+
+        results.append(
+            measure(
+                "update_tracking_status",
+                track,
+                args.calls * len(all_rts),
+                args.clients,
+            )
+        )
+
+        def start_stop(i: int) -> None:
+            (start_all if i % 2 == 0 else stop_all)(1)
+
+        results.append(measure("start_all / stop_all", start_stop, args.broadcasts, 1))
+
+        def scan(_: int) -> None:
+            job_id, *_ = scan_for_devices(1, args.network, args.port)
+            while not scanner.get(job_id).done:
+                time.sleep(0.01)
+
+        results.append(measure("scan_for_devices", scan, args.scans, 1))
+
+        for result in results:
+            result["rts"] = len(all_rts)
+            result["devices"] = num_devices
+
+        return results
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def print_table(results: list[dict]) -> None:
+    header = (
+        f"{'RTS':>5} {'Devices':>7}  {'Scenario':<26} {'Calls':>6} "
+        f"{'Calls/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'CPU ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    for result in results:
+        print(
+            f"{result['rts']:>5} {result['devices']:>7}  {result['scenario']:<26} "
+            f"{result['calls']:>6} {result['throughput']:>9.1f} "
+            f"{result['p50_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+            f"{result['cpu_ms']:>8.2f}"
+        )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes",
+        default="1,10,50,100,200",
+        help="Comma-separated numbers of RTS in the fleet",
+    )
+    parser.add_argument(
+        "--rts-per-device", type=int, default=10, help="Number of RTS per device"
+    )
+    parser.add_argument("--port", type=int, default=18000, help="Port of the mocks")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Mean response latency in s"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.002, help="Standard deviation of latency"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 503",
+    )
+    parser.add_argument(
+        "--log-points", type=int, default=1000, help="Number of positions per log"
+    )
+    parser.add_argument(
+        "--clients", type=int, default=4, help="Number of concurrent clients"
+    )
+    parser.add_argument(
+        "--calls", type=int, default=20, help="Number of calls per scenario"
+    )
+    parser.add_argument(
+        "--broadcasts", type=int, default=4, help="Number of Start/Stop All calls"
+    )
+    parser.add_argument("--scans", type=int, default=1, help="Number of scans")
+    parser.add_argument(
+        "--network", default="127.0.0.0/24", help="Network scanned for the mocks"
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=1.0,
+        help="Time given to the poller before the status is benchmarked",
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    return parser
+
+
+def main() -> None:
+    args = get_parser().parse_args()
+    results = []
+
+    for size in (int(size) for size in args.sizes.split(",")):
+        results.extend(run_size(args, size))
+
+    clear_registry()
+    print_table(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+"""
+Mock RTS Server for benchmarking the dashboard without hardware.
+
+Emulates a fleet of logging devices running the RTS Server, each with a number of
+RTS. Every device listens on its own loopback address (127.0.0.1, 127.0.0.2, ...)
+on the same port, so that the fleet can also be found by a network scan. Tracking
+RTS move along a circle and report synthetic positions, and each RTS has recorded
+logs with synthetic positions that support Range requests.
+
+Usage:
+    python tools/mock_rts_server.py --devices 10 --rts 10 --latency 0.01
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+logger = logging.getLogger("mock-rts-server")
+
+DEFAULT_SETTINGS = {
+    "tmc_measurement_mode": 1,
+    "tmc_inclination_mode": 1,
+    "edm_measurement_mode": 9,
+    "prism_type": 3,
+    "fine_adjust_position_mode": 1,
+    "fine_adjust_horizontal_search_range": 0.0872,
+    "fine_adjust_vertical_search_range": 0.0872,
+    "power_search_area_dcenterhz": 0.0,
+    "power_search_area_dcenterv": 1.5708,
+    "power_search_area_drangehz": 6.283,
+    "power_search_area_drangev": 0.6,
+    "power_search_area_enabled": 1,
+    "power_search_min_range": 1,
+    "power_search_max_range": 50,
+    "power_search": True,
+}
+
+
+class MockRTS:
+    """
+    State of a single emulated RTS.
+    """
+
+    def __init__(self, rts_id: int, name: str, rate: float) -> None:
+        self.id = str(rts_id)
+        self.name = name
+        self.rate = rate
+        self.active = False
+        self.started = 0.0
+        self.positions = 0
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.phase = random.uniform(0, 2 * math.pi)
+
+    def position(self, timestamp: float) -> dict:
+        angle = self.phase + 0.1 * timestamp
+        return {
+            "pos_x": 10.0 * math.cos(angle),
+            "pos_y": 10.0 * math.sin(angle),
+            "pos_z": 100.0 + 0.5 * math.sin(0.5 * angle),
+        }
+
+    def tracking_status(self, device_name: str) -> dict:
+        now = time.time()
+
+        if not self.active:
+            return {
+                "active": False,
+                "positions": self.positions,
+                "timestamp": 0.0,
+                "device": device_name,
+                "pos_x": 0.0,
+                "pos_y": 0.0,
+                "pos_z": 0.0,
+            }
+
+        # Positions are measured at the tracking rate since tracking was started
+        measured = int((now - self.started) * self.rate)
+        timestamp = self.started + measured / self.rate
+        return {
+            "active": True,
+            "positions": self.positions + measured,
+            "timestamp": timestamp,
+            "device": device_name,
+            **self.position(timestamp),
+        }
+
+    def start(self) -> None:
+        if not self.active:
+            self.active = True
+            self.started = time.time()
+
+    def stop(self) -> None:
+        if self.active:
+            self.positions += int((time.time() - self.started) * self.rate)
+            self.active = False
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "baudrate": 115200,
+            "port": f"/dev/ttyUSB{self.id}",
+            "timeout": 30,
+            "parity": "N",
+            "stopbits": 1,
+            "bytesize": 8,
+        }
+
+
+class MockDevice:
+    """
+    State of a single emulated logging device with its RTS and logs.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        num_rts: int,
+        rate: float,
+        logs_per_rts: int,
+        log_points: int,
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.log_points = log_points
+        self.lock = threading.Lock()
+        self.rts: dict[str, MockRTS] = {}
+        self.logs: dict[str, dict] = {}
+        self._log_content: dict[str, bytes] = {}
+        self._next_rts_id = 1
+        self._next_log_id = 1
+
+        for _ in range(num_rts):
+            rts = self.add_rts(f"RTS {self._next_rts_id}")
+
+            for _ in range(logs_per_rts):
+                self.add_log(rts)
+
+    def add_rts(self, name: str) -> MockRTS:
+        rts = MockRTS(self._next_rts_id, name, self.rate)
+        self.rts[rts.id] = rts
+        self._next_rts_id += 1
+        return rts
+
+    def add_log(self, rts: MockRTS) -> dict:
+        log_id = str(self._next_log_id)
+        self._next_log_id += 1
+        self.logs[log_id] = {
+            "id": log_id,
+            "rts_id": rts.id,
+            "path": f"/logs/{rts.name.replace(' ', '_')}_{log_id}.csv",
+            "active": False,
+            "name": f"{rts.name} {log_id}",
+        }
+        return self.logs[log_id]
+
+    def log_content(self, log_id: str) -> bytes:
+        if log_id not in self._log_content:
+            rts = self.rts.get(self.logs[log_id]["rts_id"])
+            start = time.time() - self.log_points / self.rate
+            lines = ["timestamp,pos_x,pos_y,pos_z"]
+
+            for i in range(self.log_points):
+                timestamp = start + i / self.rate
+                position = rts.position(timestamp) if rts else {}
+                lines.append(
+                    f"{timestamp:.3f},{position.get('pos_x', 0.0):.4f},"
+                    f"{position.get('pos_y', 0.0):.4f},{position.get('pos_z', 0.0):.4f}"
+                )
+
+            self._log_content[log_id] = ("\n".join(lines) + "\n").encode()
+
+        return self._log_content[log_id]
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug(format, *args)
+
+    def _send_json(self, data, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_bytes(self, body: bytes, status: int = 200, headers=None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Optional[dict]:
+        length = int(self.headers.get("Content-Length") or 0)
+
+        if not length:
+            return None
+
+        return json.loads(self.rfile.read(length))
+
+    def _handle(self, method: str) -> None:
+        options = self.server.options
+        time.sleep(max(0.0, random.gauss(options.latency, options.jitter)))
+
+        if random.random() < options.failure_rate:
+            self._send_json({"detail": "Injected failure"}, status=503)
+            return
+
+        body = self._read_json() if method in ("POST", "PUT") else None
+
+        for route_method, pattern, handler in ROUTES:
+            match = re.fullmatch(pattern, self.path)
+
+            if route_method == method and match:
+                with self.server.device.lock:
+                    handler(self, body, *match.groups())
+                return
+
+        self._send_json({"detail": "Not Found"}, status=404)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_PUT(self) -> None:
+        self._handle("PUT")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+
+def _get_rts(handler: MockHandler, rts_id: str) -> Optional[MockRTS]:
+    rts = handler.server.device.rts.get(rts_id)
+
+    if rts is None:
+        handler._send_json({"detail": "RTS not found"}, status=404)
+
+    return rts
+
+
+def handle_root(handler: MockHandler, _) -> None:
+    handler._send_json({"message": "Server is running"})
+
+
+def handle_list_rts(handler: MockHandler, _) -> None:
+    handler._send_json([rts.to_dict() for rts in handler.server.device.rts.values()])
+
+
+def handle_add_rts(handler: MockHandler, body: dict) -> None:
+    rts = handler.server.device.add_rts(body.get("name", "RTS"))
+    handler._send_json(rts.to_dict())
+
+
+def handle_delete_rts(handler: MockHandler, _, rts_id: str) -> None:
+    if handler.server.device.rts.pop(rts_id, None) is None:
+        handler._send_json({"detail": "RTS not found"}, status=404)
+        return
+
+    handler._send_json({"message": "RTS deleted"})
+
+
+def handle_ok(handler: MockHandler, _, rts_id: str) -> None:
+    if _get_rts(handler, rts_id):
+        handler._send_json({"message": "OK"})
+
+
+def handle_connection_status(handler: MockHandler, _, rts_id: str) -> None:
+    if _get_rts(handler, rts_id):
+        handler._send_json({"connected": True})
+
+
+def handle_all_status(handler: MockHandler, _) -> None:
+    device = handler.server.device
+
+    if not handler.server.options.batch_status:
+        handler._send_json({"detail": "Not Found"}, status=404)
+        return
+
+    handler._send_json(
+        [
+            {
+                "id": rts.id,
+                "tracking": rts.tracking_status(device.name),
+                "connection": {"connected": True},
+            }
+            for rts in device.rts.values()
+        ]
+    )
+
+
+def handle_tracking_status(handler: MockHandler, _, rts_id: str) -> None:
+    if rts := _get_rts(handler, rts_id):
+        handler._send_json(rts.tracking_status(handler.server.device.name))
+
+
+def handle_start(handler: MockHandler, _, rts_id: str) -> None:
+    if rts := _get_rts(handler, rts_id):
+        rts.start()
+        handler._send_json({"message": "Tracking started"})
+
+
+def handle_stop(handler: MockHandler, _, rts_id: str) -> None:
+    if rts := _get_rts(handler, rts_id):
+        rts.stop()
+        handler._send_json({"message": "Tracking stopped"})
+
+
+def handle_get_settings(handler: MockHandler, _, rts_id: str) -> None:
+    if rts := _get_rts(handler, rts_id):
+        handler._send_json(rts.settings)
+
+
+def handle_put_settings(handler: MockHandler, body: dict, rts_id: str) -> None:
+    if rts := _get_rts(handler, rts_id):
+        rts.settings.update(body or {})
+        handler._send_json(rts.settings)
+
+
+def handle_list_logs(handler: MockHandler, _, rts_id: str) -> None:
+    device = handler.server.device
+    logs = []
+
+    for log in device.logs.values():
+        if log["rts_id"] == rts_id:
+            rts = device.rts.get(rts_id)
+            logs.append({**log, "active": bool(rts and rts.active)})
+
+    handler._send_json(logs)
+
+
+def handle_download_log(handler: MockHandler, _, log_id: str) -> None:
+    device = handler.server.device
+
+    if log_id not in device.logs:
+        handler._send_json({"detail": "Log not found"}, status=404)
+        return
+
+    content = device.log_content(log_id)
+    byte_range = re.fullmatch(r"bytes=(\d*)-(\d*)", handler.headers.get("Range", ""))
+
+    if byte_range is None:
+        handler._send_bytes(content)
+        return
+
+    first, last = byte_range.groups()
+    size = len(content)
+
+    if not first:
+        start, end = max(0, size - int(last or 0)), size - 1
+    else:
+        start, end = int(first), min(int(last) if last else size - 1, size - 1)
+
+    if start >= size:
+        handler._send_bytes(b"", 416, {"Content-Range": f"bytes */{size}"})
+        return
+
+    handler._send_bytes(
+        content[start : end + 1],
+        206,
+        {"Content-Range": f"bytes {start}-{end}/{size}"},
+    )
+
+
+def handle_delete_log(handler: MockHandler, _, log_id: str) -> None:
+    if handler.server.device.logs.pop(log_id, None) is None:
+        handler._send_json({"detail": "Log not found"}, status=404)
+        return
+
+    handler._send_json({"message": "Log deleted"})
+
+
+ROUTES = [
+    ("GET", r"/", handle_root),
+    ("GET", r"/rts/", handle_list_rts),
+    ("POST", r"/rts/", handle_add_rts),
+    ("GET", r"/rts/status/", handle_all_status),
+    ("GET", r"/rts/status/(\w+)", handle_connection_status),
+    ("GET", r"/rts/test/(\w+)", handle_ok),
+    ("GET", r"/rts/ping/(\w+)", handle_ok),
+    ("PUT", r"/rts/turnto/(\w+)", handle_ok),
+    ("DELETE", r"/rts/(\w+)", handle_delete_rts),
+    ("GET", r"/tracking/status/(\w+)", handle_tracking_status),
+    ("POST", r"/tracking/start/(\w+)", handle_start),
+    ("POST", r"/tracking/start/dummy/(\w+)", handle_start),
+    ("POST", r"/tracking/stop/(\w+)", handle_stop),
+    ("POST", r"/tracking/change_face/(\w+)", handle_ok),
+    ("GET", r"/tracking/settings/(\w+)", handle_get_settings),
+    ("PUT", r"/tracking/settings/(\w+)", handle_put_settings),
+    ("GET", r"/logs/rts/(\w+)", handle_list_logs),
+    ("GET", r"/logs/download/(\w+)", handle_download_log),
+    ("DELETE", r"/logs/(\w+)", handle_delete_log),
+]
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], device: MockDevice, options):
+        super().__init__(address, MockHandler)
+        self.device = device
+        self.options = options
+
+
+class MockFleet:
+    """
+    Runs one mock RTS Server per emulated logging device in background threads.
+    """
+
+    def __init__(self, options: argparse.Namespace) -> None:
+        self.options = options
+        self.servers: list[MockServer] = []
+
+    @property
+    def addresses(self) -> list[tuple[str, int]]:
+        return [server.server_address[:2] for server in self.servers]
+
+    def start(self) -> None:
+        for i in range(self.options.devices):
+            host = f"127.0.{(i + 1) // 256}.{(i + 1) % 256}"
+            device = MockDevice(
+                name=f"Device {i + 1}",
+                num_rts=self.options.rts,
+                rate=self.options.rate,
+                logs_per_rts=self.options.logs,
+                log_points=self.options.log_points,
+            )
+            server = MockServer((host, self.options.port), device, self.options)
+            threading.Thread(
+                target=server.serve_forever, name=f"mock-{host}", daemon=True
+            ).start()
+            self.servers.append(server)
+
+        logger.info(
+            "Started %i mock devices with %i RTS each on port %i",
+            self.options.devices,
+            self.options.rts,
+            self.options.port,
+        )
+
+    def stop(self) -> None:
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--devices", type=int, default=1, help="Number of devices")
+    parser.add_argument("--rts", type=int, default=1, help="Number of RTS per device")
+    parser.add_argument("--port", type=int, default=8000, help="Port of all devices")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="Mean response latency in s"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.002, help="Standard deviation of latency"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests answered with 503",
+    )
+    parser.add_argument("--rate", type=float, default=20.0, help="Tracking rate in Hz")
+    parser.add_argument("--logs", type=int, default=2, help="Number of logs per RTS")
+    parser.add_argument(
+        "--log-points", type=int, default=10000, help="Number of positions per log"
+    )
+    parser.add_argument(
+        "--no-batch-status",
+        dest="batch_status",
+        action="store_false",
+        help="Emulate RTS Servers without the batched status endpoint",
+    )
+    return parser
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    fleet = MockFleet(get_parser().parse_args())
+    fleet.start()
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fleet.stop()
+
+
+if __name__ == "__main__":
+    main()